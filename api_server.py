@@ -0,0 +1,327 @@
+# HTTP API SmartBooking для многих одновременных клиентов: поиск, доступность и CRUD броней.
+# Сервер на asyncio без сторонних зависимостей (HTTP/1.1, keep-alive, JSON). Логика - BookingService,
+# как и в окнах приложения. Асинхронный пул соединений: каждый запрос к БД ждет свободное соединение
+# без блокировки цикла событий и выполняется в потоке исполнителя, за которым закреплено соединение
+# ConnectionPool; число потоков равно размеру пула, поэтому соединение всегда найдется.
+# Запуск: python api_server.py [--host 127.0.0.1] [--port 8080] [--connections 20]
+#
+# Маршруты:
+#   GET    /health
+#   GET    /properties?q=&category=&amenity=&active=&from=&to=&after_title=&after_id=&limit=
+#   GET    /properties/{id}/availability?from=ГГГГ-ММ-ДД&to=ГГГГ-ММ-ДД
+#   GET    /properties/{id}/bookings
+#   POST   /properties/{id}/bookings   {"user_email", "start_date", "end_date", "status"}
+#   GET    /bookings/{id}
+#   PUT    /bookings/{id}              {"user_email", "start_date", "end_date", "status", "version"}
+#   DELETE /bookings/{id}
+import re
+import sys
+import json
+import asyncio
+import decimal
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from database import (
+    DatabaseManager, ConnectionLostError, QueryCancelledError, IntegrityViolationError,
+    BookingOverlapError, PROPERTY_PAGE_SIZE,
+)
+from booking_service import BookingService, ValidationError, NotFoundError, BookingConflictError, ACTIVE_STATUS
+
+# Число соединений с БД (и потоков исполнителя) по умолчанию
+API_CONNECTIONS = 20
+# Сверх этого числа ожидающих запросов к БД сервер отвечает 503, а не копит очередь
+MAX_PENDING_QUERIES = 1000
+MAX_BODY_BYTES = 64 * 1024
+# Простой keep-alive соединения клиента, с
+KEEPALIVE_TIMEOUT = 30
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 428: "Precondition Required", 500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def error_status(error: Exception) -> int:
+    # Исключение сервиса или базы -> код ответа HTTP
+    if isinstance(error, HttpError):
+        return error.status
+    if isinstance(error, ValidationError):
+        return 400
+    if isinstance(error, NotFoundError):
+        return 404
+    if isinstance(error, (BookingOverlapError, IntegrityViolationError, BookingConflictError)):
+        return 409
+    if isinstance(error, ConnectionLostError):
+        return 503
+    if isinstance(error, QueryCancelledError):
+        return 504
+    return 500
+
+
+def json_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def int_param(value, name: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Параметр {name} должен быть целым числом")
+
+
+def bool_param(value, name: str):
+    if value is None:
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValidationError(f"Параметр {name} должен быть true или false")
+
+
+class AsyncServicePool:
+    # Асинхронный доступ к BookingService поверх пула соединений DatabaseManager
+    def __init__(self, db: DatabaseManager, connections: int):
+        self.db = db
+        self.service = BookingService(db)
+        self.executor = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="api-db")
+        self.pending = 0
+
+    async def call(self, label: str, method: str, *args, **kwargs):
+        if self.pending >= MAX_PENDING_QUERIES:
+            raise HttpError(503, "Сервер перегружен, повторите запрос позже")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._run, label, getattr(self.service, method), args, kwargs
+            )
+        finally:
+            self.pending -= 1
+
+    def _run(self, label, fn, args, kwargs):
+        # Запросы вызова идут через одно соединение пула, в статистике - под меткой маршрута
+        with self.db.bind_connection(), self.db.query_label(label):
+            return fn(*args, **kwargs)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.db.close()
+
+
+class BookingApi:
+    def __init__(self, pool: AsyncServicePool):
+        self.pool = pool
+        # (метод, шаблон пути, обработчик); группы шаблона передаются обработчику аргументами
+        self.routes = [
+            ("GET", re.compile(r"/health"), self.health),
+            ("GET", re.compile(r"/properties"), self.search),
+            ("GET", re.compile(r"/properties/(\d+)/availability"), self.availability),
+            ("GET", re.compile(r"/properties/(\d+)/bookings"), self.list_bookings),
+            ("POST", re.compile(r"/properties/(\d+)/bookings"), self.create_booking),
+            ("GET", re.compile(r"/bookings/(\d+)"), self.get_booking),
+            ("PUT", re.compile(r"/bookings/(\d+)"), self.update_booking),
+            ("DELETE", re.compile(r"/bookings/(\d+)"), self.delete_booking),
+        ]
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple:
+        # Возвращает (код ответа, данные для JSON)
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if match is None:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                payload = None
+            if not isinstance(payload, dict):
+                return 400, {'error': "Тело запроса должно быть объектом JSON"}
+            try:
+                return await handler(query, payload, *(int(group) for group in match.groups()))
+            except Exception as e:
+                status = error_status(e)
+                if status == 500:
+                    print(f"Ошибка обработки {method} {url.path}: {e}")
+                return status, {'error': str(e) if status != 500 else "Внутренняя ошибка сервера"}
+        if allowed:
+            return 405, {'error': "Метод не поддерживается"}
+        return 404, {'error': "Маршрут не найден"}
+
+    async def health(self, query, payload):
+        return 200, {'status': "ok", 'pending_queries': self.pool.pending}
+
+    async def search(self, query, payload):
+        def first(name):
+            return query.get(name, [None])[0]
+        after = None
+        if first('after_id') is not None:
+            after = (first('after_title') or "", int_param(first('after_id'), 'after_id'))
+        limit = int_param(first('limit') or PROPERTY_PAGE_SIZE, 'limit')
+        items = await self.pool.call(
+            "api:search", 'search',
+            search_query=first('q'),
+            categories=query.get('category'),
+            amenities=query.get('amenity'),
+            has_active_booking=bool_param(first('active'), 'active'),
+            available_from=first('from'),
+            available_to=first('to'),
+            after=after,
+            limit=limit,
+        )
+        # Ключ следующей страницы (keyset-пагинация); null - страниц больше нет
+        next_page = None
+        if len(items) == limit:
+            next_page = {'after_title': items[-1]['title'], 'after_id': items[-1]['property_id']}
+        return 200, {'items': items, 'next': next_page}
+
+    async def availability(self, query, payload, property_id):
+        return 200, await self.pool.call(
+            "api:availability", 'availability',
+            property_id, query.get('from', [None])[0], query.get('to', [None])[0]
+        )
+
+    async def list_bookings(self, query, payload, property_id):
+        return 200, {'items': await self.pool.call("api:list_bookings", 'list_bookings', property_id)}
+
+    async def create_booking(self, query, payload, property_id):
+        return 201, await self.pool.call(
+            "api:create_booking", 'create_booking',
+            property_id, payload.get('user_email'), payload.get('start_date'), payload.get('end_date'),
+            payload.get('status', ACTIVE_STATUS)
+        )
+
+    async def get_booking(self, query, payload, booking_id):
+        return 200, await self.pool.call("api:get_booking", 'get_booking', booking_id)
+
+    async def update_booking(self, query, payload, booking_id):
+        # Изменение без версии из GET перезаписало бы чужие правки - такой запрос отклоняется
+        if payload.get('version') is None:
+            raise HttpError(428, "Укажите version из последнего чтения брони")
+        return 200, await self.pool.call(
+            "api:update_booking", 'update_booking',
+            booking_id, payload.get('user_email'), payload.get('start_date'), payload.get('end_date'),
+            payload.get('status', ACTIVE_STATUS), payload.get('version')
+        )
+
+    async def delete_booking(self, query, payload, booking_id):
+        return 200, await self.pool.call("api:delete_booking", 'delete_booking', booking_id)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Соединение клиента обслуживает запросы последовательно, пока клиент его не закроет
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {'error': "Некорректная строка запроса"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # HTTP/1.1 держит соединение по умолчанию, HTTP/1.0 - только по явной просьбе
+                connection_header = headers.get('connection', "").lower()
+                keep_alive = connection_header == "keep-alive" or (version == "HTTP/1.1" and connection_header != "close")
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, 400, {'error': "Некорректный заголовок Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {'error': "Слишком большое тело запроса"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, data = await self.dispatch(method.upper(), target, body)
+                await self.respond(writer, status, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status: int, data, keep_alive: bool):
+        body = json.dumps(data, ensure_ascii=False, default=json_value).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, pool: AsyncServicePool):
+    api = BookingApi(pool)
+    server = await asyncio.start_server(api.handle_client, host, port, backlog=1024)
+    print(f"SmartBooking API: http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API SmartBooking")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=API_CONNECTIONS, help="размер пула соединений с БД")
+    parser.add_argument("--db-host")
+    parser.add_argument("--db-port")
+    parser.add_argument("--db-user")
+    parser.add_argument("--db-password")
+    parser.add_argument("--db-name")
+    args = parser.parse_args()
+
+    db = DatabaseManager(max_connections=args.connections)
+    if any((args.db_host, args.db_port, args.db_user, args.db_password, args.db_name)):
+        config = db.get_config()
+        if not db.set_config(args.db_user or config['user'], args.db_password or config['password'],
+                             args.db_host or config['host'], args.db_port or config['port'],
+                             args.db_name or config['database']):
+            sys.exit("Не удалось подключиться к базе данных")
+    if not db.is_connected():
+        sys.exit("Не удалось подключиться к базе данных")
+
+    pool = AsyncServicePool(db, args.connections)
+    try:
+        asyncio.run(serve(args.host, args.port, pool))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
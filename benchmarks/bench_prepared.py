@@ -0,0 +1,71 @@
+# Сравнение задержки одного вызова: обычный запрос (разбор и планирование на каждом вызове)
+# и EXECUTE подготовленного запроса из реестра DatabaseManager.
+# Запуск: python benchmarks/bench_prepared.py [--iterations 2000]
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager, PROPERTY_PAGE_SIZE
+
+# Те же запросы в виде для execute_query
+PLAIN_QUERIES = {
+    'properties_first_page': """
+        SELECT * FROM get_filtered_properties(%s, %s, %s, %s, %s, %s) AS p
+        ORDER BY p.title COLLATE "C", p.property_id
+        LIMIT %s
+    """,
+    'property_bookings': """
+        SELECT booking_id, user_email, start_date, end_date, status, created_at
+        FROM booking
+        WHERE property_id = %s
+        ORDER BY start_date DESC
+    """,
+    'amenity_names': "SELECT name FROM amenity ORDER BY name",
+}
+
+
+def measure(call, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка подготовленных запросов DatabaseManager")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    if not db.is_connected():
+        sys.exit("Не удалось подключиться к базе данных")
+
+    sample = db.execute_query("SELECT property_id FROM property LIMIT 1", fetch=True)
+    property_id = sample[0]['property_id'] if sample else 0
+    params = {
+        'properties_first_page': DatabaseManager.property_filter_params() + (PROPERTY_PAGE_SIZE,),
+        'property_bookings': (property_id,),
+        'amenity_names': (),
+    }
+
+    # Все вызовы идут через одно соединение, как в фоновой задаче
+    with db.bind_connection():
+        print(f"{'запрос':<24}{'обычный, мс':>14}{'prepared, мс':>14}{'экономия, мс':>14}")
+        for name, query in PLAIN_QUERIES.items():
+            plain = measure(lambda: db.execute_query(query, params[name] or None, fetch=True), args.iterations)
+            prepared = measure(lambda: db.execute_prepared(name, params[name], fetch=True), args.iterations)
+            plain_median = statistics.median(plain)
+            prepared_median = statistics.median(prepared)
+            print(f"{name:<24}{plain_median:>14.3f}{prepared_median:>14.3f}{plain_median - prepared_median:>14.3f}")
+
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# Сравнение двух прогонов run_suite.py: медианы по каждому измерению и изменение в процентах
+# Запуск: python benchmarks/compare.py old.json new.json [--threshold 10]
+import sys
+import json
+import argparse
+
+
+def flatten(report: dict) -> dict:
+    result = {}
+    for scale, sections in report['scales'].items():
+        for section in ('database', 'rendering'):
+            for name, values in sections.get(section, {}).items():
+                result[(int(scale), f"{section}.{name}")] = values['median_ms']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарков")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="порог регрессии, %%")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as file:
+        old = flatten(json.load(file))
+    with open(args.new, encoding="utf-8") as file:
+        new = flatten(json.load(file))
+
+    regressions = 0
+    print(f"{'масштаб':>8}  {'измерение':<44}{'было, мс':>12}{'стало, мс':>12}{'изменение':>12}")
+    for key in sorted(old.keys() & new.keys()):
+        scale, name = key
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        mark = ""
+        if change > args.threshold:
+            regressions += 1
+            mark = "  <- регрессия"
+        print(f"{scale:>8}  {name:<44}{old[key]:>12.2f}{new[key]:>12.2f}{change:>+11.1f}%{mark}")
+    # Ненулевой код возврата позволяет использовать сравнение в CI
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Заполнение локальной базы синтетическими данными для нагрузочных тестов.
+# ВНИМАНИЕ: таблицы объектов, удобств и броней очищаются.
+# Запуск: python benchmarks/generate_data.py --properties 100000 --bookings 10000000 --yes
+import os
+import sys
+import time
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор синтетических данных SmartBooking")
+    parser.add_argument("--properties", type=int, default=100000)
+    parser.add_argument("--bookings", type=int, default=10000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="число процессов загрузки (по умолчанию - число ядер)")
+    parser.add_argument("--anchor-date", type=datetime.date.fromisoformat,
+                        help="опорная дата ГГГГ-ММ-ДД (по умолчанию сегодня): с ней данные полностью воспроизводимы")
+    parser.add_argument("--host")
+    parser.add_argument("--port")
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    parser.add_argument("--database")
+    parser.add_argument("--yes", action="store_true", help="подтверждение очистки таблиц")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("данные будут удалены - добавьте --yes")
+
+    # Параметры подключения по умолчанию - как в DatabaseManager.set_default_bg
+    config = {
+        "user": "postgres",
+        "password": "S123456s",
+        "host": "127.0.0.1",
+        "port": "5432",
+        "database": "SmartBooking",
+    }
+    for key in config:
+        if getattr(args, key):
+            config[key] = getattr(args, key)
+
+    started = time.perf_counter()
+    sizes = generate(config, args.properties, args.bookings, args.seed, args.workers, args.anchor_date)
+    print(f"Готово за {time.perf_counter() - started:.1f} с: объектов {sizes['properties']}, броней {sizes['bookings']}")
+
+
+if __name__ == '__main__':
+    main()
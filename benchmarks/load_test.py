@@ -0,0 +1,251 @@
+# Нагрузочный тест HTTP API (api_server.py): много одновременных клиентов с keep-alive соединениями
+# выполняют смесь поиска, проверки доступности, чтения и создания/удаления броней.
+# По умолчанию поднимает временный PostgreSQL с синтетическими данными и сервер API в отдельном процессе;
+# с --url нагружает уже запущенный сервер (идентификаторы объектов 1..--properties).
+# Запуск: python benchmarks/load_test.py [--clients 100] [--duration 30] [--properties 10000]
+# Цель пропускной способности - THROUGHPUT_TARGET запросов/с (см. README); ниже цели - код выхода 1
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import datetime
+import subprocess
+from urllib.parse import urlsplit, urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from query_metrics import percentile
+
+THROUGHPUT_TARGET = 1000
+# Доли операций в смеси запросов
+OPERATION_WEIGHTS = {
+    'search': 50,
+    'availability': 25,
+    'list_bookings': 10,
+    'create_delete_booking': 15,
+}
+SEARCH_TERMS = [None, "студия", "квартира", "лофт", "Уютная"]
+CATEGORIES = ["квартира", "дом", "комната", "апартаменты"]
+SERVER_START_TIMEOUT = 30
+
+
+class HttpClient:
+    # Одно keep-alive соединение с сервером; запросы выполняются последовательно
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, payload=None) -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        close = False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+            elif name.lower() == "connection" and value.strip().lower() == "close":
+                close = True
+        data = json.loads(await self.reader.readexactly(length)) if length else None
+        if close:
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class LoadTest:
+    def __init__(self, host: str, port: int, properties: int, seed: int):
+        self.host = host
+        self.port = port
+        self.properties = properties
+        self.rng = random.Random(seed)
+        self.operations = list(OPERATION_WEIGHTS)
+        self.weights = list(OPERATION_WEIGHTS.values())
+        self.latencies = {name: [] for name in self.operations}
+        self.statuses = {}
+        self.requests = 0
+
+    def random_period(self):
+        start = datetime.date.today() + datetime.timedelta(days=self.rng.randrange(0, 365))
+        return start, start + datetime.timedelta(days=self.rng.randrange(1, 14))
+
+    async def search(self, client):
+        params = {'limit': 50}
+        term = self.rng.choice(SEARCH_TERMS)
+        if term:
+            params['q'] = term
+        if self.rng.random() < 0.3:
+            params['category'] = self.rng.choice(CATEGORIES)
+        if self.rng.random() < 0.3:
+            start, end = self.random_period()
+            params['from'], params['to'] = start.isoformat(), end.isoformat()
+        return [await client.request("GET", "/properties?" + urlencode(params))]
+
+    async def availability(self, client):
+        start, end = self.random_period()
+        property_id = self.rng.randrange(1, self.properties + 1)
+        return [await client.request(
+            "GET", f"/properties/{property_id}/availability?from={start.isoformat()}&to={end.isoformat()}"
+        )]
+
+    async def list_bookings(self, client):
+        return [await client.request("GET", f"/properties/{self.rng.randrange(1, self.properties + 1)}/bookings")]
+
+    async def create_delete_booking(self, client):
+        # Созданная бронь сразу удаляется, чтобы объем данных не рос; пересечение (409) - штатный исход
+        start, end = self.random_period()
+        created = await client.request("POST", f"/properties/{self.rng.randrange(1, self.properties + 1)}/bookings", {
+            'user_email': f"load{self.rng.randrange(100000)}@example.com",
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+        })
+        if created[0] != 201:
+            return [created]
+        return [created, await client.request("DELETE", f"/bookings/{created[1]['booking_id']}")]
+
+    async def client_loop(self, deadline: float):
+        client = HttpClient(self.host, self.port)
+        try:
+            while time.perf_counter() < deadline:
+                operation = self.rng.choices(self.operations, weights=self.weights)[0]
+                started = time.perf_counter()
+                responses = await getattr(self, operation)(client)
+                self.latencies[operation].append((time.perf_counter() - started) * 1000)
+                for status, _ in responses:
+                    self.requests += 1
+                    self.statuses[status] = self.statuses.get(status, 0) + 1
+        finally:
+            client.close()
+
+    async def run(self, clients: int, duration: float) -> dict:
+        started = time.perf_counter()
+        await asyncio.gather(*(self.client_loop(started + duration) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        report = {
+            'clients': clients,
+            'duration_s': elapsed,
+            'requests': self.requests,
+            'requests_per_s': self.requests / elapsed,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'operations': {},
+        }
+        for name, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            report['operations'][name] = {
+                'count': len(ordered),
+                'p50_ms': percentile(ordered, 50),
+                'p95_ms': percentile(ordered, 95),
+                'p99_ms': percentile(ordered, 99),
+            }
+        return report
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(host: str, port: int, process):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit("Сервер API завершился при запуске")
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit("Сервер API не запустился")
+
+
+def run_load(args, host: str, port: int) -> dict:
+    test = LoadTest(host, port, args.properties, args.seed)
+    return asyncio.run(test.run(args.clients, args.duration))
+
+
+def run_with_throwaway_server(args) -> dict:
+    from database import DatabaseManager
+    from throwaway_postgres import throwaway_postgres
+    from synthetic_data import load_dataset
+
+    with throwaway_postgres() as config:
+        db = DatabaseManager()
+        if not db.set_config(config['user'], config['password'], config['host'], config['port'], config['database']):
+            sys.exit("Не удалось подключиться к временному серверу")
+        db.migrate()
+        print(f"Загрузка данных: {args.properties} объектов...")
+        load_dataset(db, args.properties, args.bookings_per_property, args.seed)
+        db.close()
+
+        port = free_port()
+        server = subprocess.Popen([
+            sys.executable, os.path.join(ROOT, "api_server.py"), "--port", str(port),
+            "--connections", str(args.connections),
+            "--db-host", config['host'], "--db-port", config['port'], "--db-user", config['user'],
+            "--db-password", config['password'] or "", "--db-name", config['database'],
+        ])
+        try:
+            wait_for_server("127.0.0.1", port, server)
+            print(f"Нагрузка: {args.clients} клиентов, {args.duration} с...")
+            return run_load(args, "127.0.0.1", port)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP API SmartBooking")
+    parser.add_argument("--url", help="адрес запущенного сервера, например http://127.0.0.1:8080")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--properties", type=int, default=10000)
+    parser.add_argument("--bookings-per-property", type=int, default=5)
+    parser.add_argument("--connections", type=int, default=20, help="размер пула соединений сервера API")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target", type=float, default=THROUGHPUT_TARGET, help="цель, запросов/с")
+    parser.add_argument("--output", help="файл результатов JSON")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        report = run_load(args, url.hostname, url.port or 80)
+    else:
+        report = run_with_throwaway_server(args)
+    report['target_requests_per_s'] = args.target
+
+    print(f"Запросов: {report['requests']} за {report['duration_s']:.1f} с - {report['requests_per_s']:.0f} запросов/с "
+          f"(цель {args.target:.0f})")
+    print(f"Коды ответов: {report['statuses']}")
+    for name, values in report['operations'].items():
+        print(f"  {name:<24}{values['count']:>8}  p50 {values['p50_ms']:.1f} мс  p95 {values['p95_ms']:.1f} мс  "
+              f"p99 {values['p99_ms']:.1f} мс")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if report['requests_per_s'] < args.target:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
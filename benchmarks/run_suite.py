@@ -0,0 +1,239 @@
+# Набор бенчмарков SmartBooking на синтетических данных нескольких масштабов:
+# задержка вызовов DatabaseManager, время от поиска до отрисованного списка (Qt offscreen)
+# и пиковая память. Сервер PostgreSQL поднимается временный (см. throwaway_postgres.py).
+# Запуск: python benchmarks/run_suite.py [--scales 1000,10000,100000] [--locale ru_RU.UTF-8] [--output results.json]
+# Сравнение прогонов: python benchmarks/compare.py old.json new.json
+import os
+import sys
+import json
+import time
+import datetime
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+from database import DatabaseManager, PROPERTY_PAGE_SIZE, BOOKING_PAGE_SIZE, BOOKING_SORT_COLUMNS
+from property_list import PropertyListModel, PropertyCardDelegate, PropertyListView
+from throwaway_postgres import throwaway_postgres
+from synthetic_data import load_dataset, AMENITIES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def summarize(timings: list) -> dict:
+    ordered = sorted(timings)
+    return {
+        'iterations': len(ordered),
+        'median_ms': statistics.median(ordered),
+        'p95_ms': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'min_ms': ordered[0],
+    }
+
+
+def measure(call, iterations: int) -> dict:
+    # Время в мс и пиковый прирост памяти Python (tracemalloc) за серию вызовов
+    timings = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = summarize(timings)
+    result['peak_python_kb'] = peak // 1024
+    return result
+
+
+def filter_cases() -> dict:
+    # Фильтры главного окна, на которых измеряется поиск
+    today = datetime.date.today()
+    return {
+        'all': {},
+        'search': {'search_query': "студия"},
+        'category_amenities': {'categories': ["квартира", "дом"], 'amenities': AMENITIES[:2]},
+        'active_booking': {'has_active_booking': True},
+        'available_period': {'available_from': today + datetime.timedelta(days=10),
+                             'available_to': today + datetime.timedelta(days=17)},
+    }
+
+
+def check_page_order(db, pages: int = 20):
+    # Модели списков ставят измененные строки на место, сравнивая ключи страниц в Python;
+    # ключи последовательных страниц сервера должны возрастать в том же порядке при любой локали базы
+    for name, filters in filter_cases().items():
+        after, previous = None, None
+        for _ in range(pages):
+            rows = db.get_properties_page(after=after, **filters)
+            for row in rows:
+                key = db.property_page_key(row)
+                if previous is not None and not previous < key:
+                    sys.exit(f"Порядок страниц объектов ({name}) расходится с порядком клиента: {previous} -> {key}")
+                previous = key
+            if len(rows) < PROPERTY_PAGE_SIZE:
+                break
+            after = previous
+
+    # Таблица броней объекта с наибольшим числом броней - по каждому столбцу в обе стороны
+    property_id = db.execute_query(
+        "SELECT property_id FROM booking GROUP BY property_id ORDER BY count(*) DESC LIMIT 1", fetch=True
+    )[0]['property_id']
+    for column in BOOKING_SORT_COLUMNS:
+        for descending in (False, True):
+            after, previous = None, None
+            for _ in range(pages):
+                rows = db.get_bookings_page(property_id, column, descending, after, BOOKING_PAGE_SIZE // 10)
+                for row in rows:
+                    key = (row[column], row['booking_id'])
+                    if previous is not None and not (key < previous if descending else previous < key):
+                        sys.exit(f"Порядок страниц броней ({column}) расходится с порядком клиента: {previous} -> {key}")
+                    previous = key
+                if len(rows) < BOOKING_PAGE_SIZE // 10:
+                    break
+                after = previous
+
+
+def bench_database(db, iterations: int) -> dict:
+    results = {}
+    for name, filters in filter_cases().items():
+        results[f"get_properties_page.{name}"] = measure(lambda: db.get_properties_page(**filters), iterations)
+    first_page = db.get_properties_page()
+    property_ids = [row['property_id'] for row in first_page]
+    results['get_properties_by_ids'] = measure(lambda: db.get_properties_by_ids(property_ids), iterations)
+    # Загрузка броней объекта (BookingManagementWindow.load_bookings)
+    results['load_bookings'] = measure(
+        lambda: db.execute_prepared('property_bookings', (property_ids[0],), fetch=True), iterations
+    )
+    # Первая страница таблицы броней (BookingTableModel) с сортировкой на сервере
+    results['get_bookings_page'] = measure(lambda: db.get_bookings_page(property_ids[0]), iterations)
+    results['get_amenities'] = measure(db.load_amenities, iterations)
+    return results
+
+
+def bench_rendering(app, db, iterations: int) -> dict:
+    # Путь главного окна: фильтр -> первая страница -> отрисованный список (grab рисует в буфер)
+    model = PropertyListModel()
+    delegate = PropertyCardDelegate()
+    view = PropertyListView()
+    view.setModel(model)
+    view.setItemDelegate(delegate)
+    view.resize(900, 700)
+    view.show()
+
+    def search_to_painted(filters):
+        def fetch_page(after, generation):
+            model.append_page(db.get_properties_page(after=after, **filters), generation)
+        model.set_fetcher(fetch_page, db.property_page_key, PROPERTY_PAGE_SIZE)
+        app.processEvents()
+        view.grab()
+
+    def scroll_to_end():
+        # Прокрутка до конца списка с догрузкой страниц (не больше 20 страниц)
+        search_to_painted({})
+        for _ in range(20):
+            if model.is_complete():
+                break
+            view.scrollToBottom()
+            app.processEvents()
+            view.grab()
+
+    results = {}
+    for name, filters in filter_cases().items():
+        results[f"search_to_painted.{name}"] = measure(lambda: search_to_painted(filters), iterations)
+    results['scroll_20_pages'] = measure(scroll_to_end, max(1, iterations // 10))
+    # Полный результат без пагинации (scroll_list_property / set_properties)
+    rows = db.get_properties()
+
+    def full_list():
+        model.set_properties(rows)
+        app.processEvents()
+        view.grab()
+    results['scroll_list_property.full'] = measure(full_list, iterations)
+    results['scroll_list_property.full']['rows'] = len(rows)
+    view.close()
+    return results
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    # ru_maxrss: килобайты в Linux, байты в macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки SmartBooking на синтетических данных")
+    parser.add_argument("--scales", default="1000,10000,100000", help="числа объектов через запятую")
+    parser.add_argument("--bookings-per-property", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--locale", default="C", help="локаль временного кластера, например ru_RU.UTF-8")
+    parser.add_argument("--output", help="файл результатов JSON (по умолчанию benchmarks/results/<время>.json)")
+    args = parser.parse_args()
+    scales = [int(value) for value in args.scales.split(",")]
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    report = {
+        'started_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': args.iterations,
+        'seed': args.seed,
+        'locale': args.locale,
+        'scales': {},
+    }
+
+    with throwaway_postgres(args.locale) as config:
+        # Пул по умолчанию может не подключиться - рабочим будет пул временного сервера
+        db = DatabaseManager()
+        if not db.set_config(config['user'], config['password'], config['host'], config['port'], config['database']):
+            sys.exit("Не удалось подключиться к временному серверу")
+        db.migrate()
+        report['postgres'] = db.execute_query("SHOW server_version", fetch=True)[0]['server_version']
+
+        for scale in scales:
+            print(f"Масштаб {scale}: загрузка данных...")
+            started = time.perf_counter()
+            sizes = load_dataset(db, scale, args.bookings_per_property, args.seed)
+            load_seconds = time.perf_counter() - started
+            check_page_order(db)
+            print(f"Масштаб {scale}: измерения...")
+            report['scales'][str(scale)] = {
+                'dataset': dict(sizes, load_seconds=load_seconds),
+                'database': bench_database(db, args.iterations),
+                'rendering': bench_rendering(app, db, args.iterations),
+                'peak_rss_kb': peak_rss_kb(),
+            }
+        db.close()
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2, default=str)
+    print(f"Результаты сохранены: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+# Воспроизводимый генератор синтетических данных схемы SmartBooking для нагрузочных тестов
+# и бенчмарков. Одинаковые seed, масштаб и опорная дата дают одинаковые данные независимо
+# от числа процессов: каждая порция объектов генерируется своим генератором случайных чисел,
+# а диапазоны идентификаторов порций вычисляются заранее.
+#
+# Особенности данных:
+# - объекты всех значений property_category с неравномерными долями;
+# - удобства назначаются по закону Ципфа: популярные встречаются гораздо чаще редких;
+# - число броней на объект распределено экспоненциально (мало очень популярных объектов);
+# - даты заезда с сезонностью (лето, новогодние праздники, заезды в пятницу и субботу);
+# - заявки, пересекающиеся с принятой бронью, получают статус "отменен", поэтому активные
+#   брони не пересекаются (ограничение booking_active_no_overlap соблюдается).
+#
+# Загрузка идет через COPY FROM STDIN параллельно несколькими процессами. На время загрузки
+# отключаются пользовательские триггеры (уведомления), а вторичные индексы и ограничение-исключение
+# удаляются и создаются заново после загрузки - построить индекс разом быстрее, чем обновлять его
+# на каждой строке.
+import io
+import random
+import datetime
+import multiprocessing
+
+import psycopg2
+
+AMENITIES = [
+    "Wi-Fi", "Парковка", "Кондиционер", "Кухня", "Стиральная машина", "Телевизор",
+    "Балкон", "Лифт", "Бассейн", "Сауна", "Завтрак", "Трансфер", "Можно с животными",
+    "Детская кроватка", "Рабочее место",
+]
+ZIPF_EXPONENT = 1.1
+MAX_AMENITIES_PER_PROPERTY = 8
+# Доли категорий; значения enum, которых здесь нет, получают вес по умолчанию
+CATEGORY_WEIGHTS = {'квартира': 40, 'апартаменты': 15, 'комната': 15, 'дом': 12, 'гостиница': 10, 'хостел': 8}
+DEFAULT_CATEGORY_WEIGHT = 5
+CITIES = {
+    "Москва": 30, "Санкт-Петербург": 20, "Сочи": 12, "Казань": 8, "Калининград": 6,
+    "Екатеринбург": 6, "Новосибирск": 5, "Владивосток": 4, "Ярославль": 3, "Суздаль": 2,
+}
+TITLE_ADJECTIVES = ["Уютная", "Светлая", "Просторная", "Тихая", "Современная", "Видовая", "Семейная", "Солнечная"]
+TITLE_NOUNS = ["студия", "квартира", "мансарда", "комната", "дача", "усадьба", "лофт", "резиденция"]
+STREETS = ["Ленина", "Мира", "Садовая", "Набережная", "Центральная", "Лесная", "Советская", "Морская"]
+# Сезонность заездов по месяцам (январь..декабрь)
+MONTH_WEIGHTS = [1.4, 0.7, 0.8, 0.8, 1.1, 1.6, 2.0, 2.0, 1.2, 0.8, 0.7, 1.3]
+WEEKEND_START_WEIGHT = 1.4
+HISTORY_DAYS = 730
+FUTURE_DAYS = 365
+MEAN_STAY_NIGHTS = 4
+CANCEL_RATE = 0.08
+# Брони одного гостя: в среднем столько броней на адрес
+BOOKINGS_PER_GUEST = 3
+
+CHUNK_PROPERTIES = 2000
+COPY_BUFFER_ROWS = 50000
+LOADED_TABLES = ("property", "property_amenity", "booking")
+
+PROPERTY_COLUMNS = ["property_id", "title", "description", "address", "price_per_night", "property_type"]
+BOOKING_COLUMNS = ["booking_id", "property_id", "user_email", "start_date", "end_date", "status", "created_at"]
+
+
+def chunk_rng(seed, chunk, stream) -> random.Random:
+    # Строковое зерно детерминировано (не зависит от PYTHONHASHSEED)
+    return random.Random(f"{seed}:{chunk}:{stream}")
+
+
+def cumulative(weights) -> list:
+    total = 0
+    result = []
+    for weight in weights:
+        total += weight
+        result.append(total)
+    return result
+
+
+def stay_days(anchor):
+    # Дни возможных заездов и накопленные веса сезонности
+    days = [anchor + datetime.timedelta(days=offset) for offset in range(-HISTORY_DAYS, FUTURE_DAYS)]
+    weights = [
+        MONTH_WEIGHTS[day.month - 1] * (WEEKEND_START_WEIGHT if day.weekday() in (4, 5) else 1.0)
+        for day in days
+    ]
+    return days, cumulative(weights)
+
+
+def booking_counts(seed, chunk, count, mean) -> list:
+    rng = chunk_rng(seed, chunk, "counts")
+    return [int(rng.expovariate(1 / mean)) if mean > 0 else 0 for _ in range(count)]
+
+
+def property_rows(rng, property_ids, categories):
+    category_weights = cumulative(CATEGORY_WEIGHTS.get(name, DEFAULT_CATEGORY_WEIGHT) for name in categories)
+    cities = list(CITIES)
+    city_weights = cumulative(CITIES.values())
+    for property_id in property_ids:
+        category = rng.choices(categories, cum_weights=category_weights)[0]
+        city = rng.choices(cities, cum_weights=city_weights)[0]
+        title = f"{rng.choice(TITLE_ADJECTIVES)} {rng.choice(TITLE_NOUNS)} №{property_id}"
+        address = f"{city}, ул. {rng.choice(STREETS)}, {rng.randrange(1, 200)}"
+        description = f"{category.capitalize()} в городе {city}. Объект {property_id}."
+        price = rng.randrange(800, 25000, 100) * (3 if category in ('дом', 'гостиница') else 1)
+        yield (property_id, title, description, address, price, category)
+
+
+def amenity_rows(rng, property_ids, amenity_count):
+    ids = list(range(1, amenity_count + 1))
+    zipf_weights = cumulative(1 / rank ** ZIPF_EXPONENT for rank in ids)
+    for property_id in property_ids:
+        picked = set(rng.choices(ids, cum_weights=zipf_weights, k=rng.randrange(0, MAX_AMENITIES_PER_PROPERTY + 1)))
+        for amenity_id in sorted(picked):
+            yield (property_id, amenity_id)
+
+
+def booking_rows(rng, property_ids, counts, first_booking_id, anchor, guests):
+    days, day_weights = stay_days(anchor)
+    booking_id = first_booking_id
+    for property_id, count in zip(property_ids, counts):
+        busy_until = None  # конец последней принятой брони объекта
+        for start in sorted(rng.choices(days, cum_weights=day_weights, k=count)):
+            end = start + datetime.timedelta(days=1 + int(rng.expovariate(1 / (MEAN_STAY_NIGHTS - 1))))
+            if busy_until is not None and start < busy_until:
+                # Заявка на занятые даты
+                status = "отменен"
+            elif rng.random() < CANCEL_RATE:
+                status = "отменен"
+            else:
+                status = "завершен" if end <= anchor else "активен"
+                busy_until = end
+            created_at = datetime.datetime.combine(start, datetime.time()) - datetime.timedelta(
+                days=rng.randrange(1, 120), seconds=rng.randrange(86400)
+            )
+            yield (booking_id, property_id, f"guest{rng.randrange(guests)}@example.com", start, end, status, created_at)
+            booking_id += 1
+
+
+def copy_value(value) -> str:
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def copy_rows(cursor, table, columns, rows) -> int:
+    # Строки отправляются порциями, чтобы в памяти был только текущий буфер
+    buffer = io.StringIO()
+    count = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        buffer.write("\t".join(copy_value(value) for value in row) + "\n")
+        count += 1
+        if count % COPY_BUFFER_ROWS == 0:
+            flush()
+    if count % COPY_BUFFER_ROWS:
+        flush()
+    return count
+
+
+def load_chunk(task) -> tuple:
+    # Выполняется в отдельном процессе: своя порция объектов, их удобств и броней, свое соединение
+    config, seed, chunk, first_property_id, count, first_booking_id, mean_bookings, categories, amenity_count, \
+        anchor, guests = task
+    rng = chunk_rng(seed, chunk, "data")
+    property_ids = range(first_property_id, first_property_id + count)
+    counts = booking_counts(seed, chunk, count, mean_bookings)
+    connection = psycopg2.connect(**config)
+    try:
+        with connection.cursor() as cursor:
+            copy_rows(cursor, "property", PROPERTY_COLUMNS, property_rows(rng, property_ids, categories))
+            copy_rows(cursor, "property_amenity", ["property_id", "amenity_id"],
+                      amenity_rows(rng, property_ids, amenity_count))
+            bookings = copy_rows(cursor, "booking", BOOKING_COLUMNS,
+                                 booking_rows(rng, property_ids, counts, first_booking_id, anchor, guests))
+        connection.commit()
+    finally:
+        connection.close()
+    return count, bookings
+
+
+def drop_rebuildable_objects(cursor) -> list:
+    # Вторичные индексы и ограничения-исключения загружаемых таблиц; возвращает команды их пересоздания
+    cursor.execute("""
+        SELECT i.indexdef, format('DROP INDEX %%I.%%I', i.schemaname, i.indexname)
+        FROM pg_indexes i
+        WHERE i.schemaname = current_schema()
+          AND i.tablename = ANY(%s)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+        UNION ALL
+        SELECT format('ALTER TABLE %%s ADD CONSTRAINT %%I %%s', c.conrelid::regclass, c.conname, pg_get_constraintdef(c.oid)),
+               format('ALTER TABLE %%s DROP CONSTRAINT %%I', c.conrelid::regclass, c.conname)
+        FROM pg_constraint c
+        WHERE c.contype = 'x' AND c.conrelid::regclass::text = ANY(%s)
+    """, (list(LOADED_TABLES), list(LOADED_TABLES)))
+    statements = cursor.fetchall()
+    for _, drop in statements:
+        cursor.execute(drop)
+    return [create for create, _ in statements]
+
+
+def generate(config: dict, properties: int, bookings: int, seed: int = 42, workers: int = None,
+             anchor: datetime.date = None, progress=print) -> dict:
+    # Очищает таблицы данных и заполняет их заново; возвращает фактические размеры набора
+    anchor = anchor or datetime.date.today()
+    workers = workers or multiprocessing.cpu_count()
+    mean_bookings = bookings / properties if properties else 0
+    guests = max(1, bookings // BOOKINGS_PER_GUEST)
+
+    connection = psycopg2.connect(**config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE booking, property_amenity, property, amenity RESTART IDENTITY CASCADE")
+            cursor.execute("SELECT unnest(enum_range(NULL::property_category))::text")
+            categories = [row[0] for row in cursor.fetchall()]
+            copy_rows(cursor, "amenity", ["amenity_id", "name"], enumerate(AMENITIES, start=1))
+            for table in LOADED_TABLES:
+                cursor.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+            rebuild = drop_rebuildable_objects(cursor)
+        connection.commit()
+
+        # Диапазоны идентификаторов порций известны заранее - результат не зависит от порядка загрузки
+        tasks = []
+        first_booking_id = 1
+        for chunk, first_property_id in enumerate(range(1, properties + 1, CHUNK_PROPERTIES)):
+            count = min(CHUNK_PROPERTIES, properties + 1 - first_property_id)
+            tasks.append((config, seed, chunk, first_property_id, count, first_booking_id, mean_bookings,
+                          categories, len(AMENITIES), anchor, guests))
+            first_booking_id += sum(booking_counts(seed, chunk, count, mean_bookings))
+
+        loaded_properties = loaded_bookings = 0
+        try:
+            # spawn: дочерние процессы не наследуют состояние родителя (соединения, Qt)
+            with multiprocessing.get_context("spawn").Pool(workers) as pool:
+                for chunk_properties, chunk_bookings in pool.imap_unordered(load_chunk, tasks):
+                    loaded_properties += chunk_properties
+                    loaded_bookings += chunk_bookings
+                    if progress is not None:
+                        progress(f"Загружено объектов: {loaded_properties}/{properties}, броней: {loaded_bookings}")
+        finally:
+            with connection.cursor() as cursor:
+                if progress is not None:
+                    progress("Построение индексов...")
+                for statement in rebuild:
+                    cursor.execute(statement)
+                for table in LOADED_TABLES:
+                    cursor.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+                for table, column in (("amenity", "amenity_id"), ("property", "property_id"), ("booking", "booking_id")):
+                    cursor.execute(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                        f"coalesce((SELECT max({column}) FROM {table}), 0) + 1, false)"
+                    )
+            connection.commit()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    finally:
+        connection.close()
+    return {'properties': loaded_properties, 'bookings': loaded_bookings}
+
+
+def load_dataset(db, properties: int, bookings_per_property: int = 5, seed: int = 42, workers: int = None) -> dict:
+    # Загрузка в базу DatabaseManager (используется набором бенчмарков)
+    sizes = generate(db.get_config(), properties, properties * bookings_per_property, seed, workers, progress=None)
+    db.invalidate_reference_data()
+    return sizes
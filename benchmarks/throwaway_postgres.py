@@ -0,0 +1,72 @@
+# Временный локальный сервер PostgreSQL для бенчмарков: кластер создается initdb во временном
+# каталоге, слушает только 127.0.0.1 на свободном порту и удаляется после работы.
+# Нужны initdb и pg_ctl (PATH или каталог из pg_config --bindir); initdb не запускается от root
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+import psycopg2
+
+BENCH_DATABASE = "SmartBooking_bench"
+# Надежность записи бенчмаркам не нужна - отключаем синхронизацию с диском
+SERVER_OPTIONS = "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+
+
+def find_binary(name: str) -> str:
+    path = shutil.which(name)
+    if path:
+        return path
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        bindir = subprocess.run([pg_config, "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+        path = os.path.join(bindir, name)
+        if os.path.exists(path):
+            return path
+    raise RuntimeError(f"Не найден {name}: установите PostgreSQL или добавьте его bin в PATH")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def throwaway_postgres(locale: str = "C"):
+    # Возвращает параметры подключения в формате DatabaseManager.config.
+    # locale - сортировка (collation) кластера; порядок страниц не должен от нее зависеть,
+    # поэтому прогоны стоит повторять и с не-C локалью (например, ru_RU.UTF-8)
+    initdb = find_binary("initdb")
+    pg_ctl = find_binary("pg_ctl")
+    data_dir = tempfile.mkdtemp(prefix="smartbooking_bench_")
+    port = free_port()
+    try:
+        subprocess.run(
+            [initdb, "-D", data_dir, "-U", "postgres", "-A", "trust", "-E", "UTF8", f"--locale={locale}", "--no-sync"],
+            check=True, capture_output=True
+        )
+        subprocess.run(
+            [pg_ctl, "-D", data_dir, "-l", os.path.join(data_dir, "server.log"), "-w",
+             "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 {SERVER_OPTIONS}", "start"],
+            check=True, capture_output=True
+        )
+        try:
+            connection = psycopg2.connect(host="127.0.0.1", port=port, user="postgres", dbname="postgres")
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'CREATE DATABASE "{BENCH_DATABASE}"')
+            connection.close()
+            yield {
+                "user": "postgres",
+                "password": "",
+                "host": "127.0.0.1",
+                "port": str(port),
+                "database": BENCH_DATABASE,
+            }
+        finally:
+            subprocess.run([pg_ctl, "-D", data_dir, "-m", "immediate", "-w", "stop"], capture_output=True)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
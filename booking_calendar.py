@@ -0,0 +1,349 @@
+import math
+import datetime
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QWidget, QToolTip, QVBoxLayout, QLabel, QMessageBox
+from PyQt6.QtCore import Qt, QPointF, QRectF, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen, QTransform, QFontMetrics, QIcon
+
+from interval_tree import IntervalTree
+from booking_service import ACTIVE_STATUS
+
+# Геометрия календаря: по горизонтали 1 единица сцены = 1 день, по вертикали - пиксели
+ROW_HEIGHT = 26
+BAR_MARGIN = 4
+HEADER_HEIGHT = 22
+LABEL_WIDTH = 180
+# Масштаб, пикселей на день
+MIN_DAY_PX = 0.5
+MAX_DAY_PX = 60.0
+DEFAULT_DAY_PX = 8.0
+ZOOM_STEP = 1.25
+# Подписи шкалы дат не чаще чем через столько пикселей
+TICK_MIN_PX = 50
+TICK_STEPS = [1, 2, 7, 14, 30, 61, 91, 182, 365]
+# Окно календаря всех видимых объектов относительно сегодняшнего дня
+CALENDAR_PAST_DAYS = 365
+CALENDAR_FUTURE_DAYS = 365
+# Канал фоновой загрузки календаря главного окна
+CALENDAR_CHANNEL = "calendar"
+
+STATUS_COLORS = {
+    "активен": QColor(52, 152, 219),
+    "завершен": QColor(149, 165, 166),
+    "отменен": QColor(231, 76, 60, 120),
+}
+
+
+class BookingTimeline:
+    # Брони строк календаря в памяти: по дереву интервалов на объект. Отрисовка и проверка
+    # пересечений запрашивают только нужный период, сколько бы броней ни было у объекта
+    def __init__(self):
+        self.rows = []
+        self.trees = {}
+        today = datetime.date.today()
+        self.origin = today - datetime.timedelta(days=CALENDAR_PAST_DAYS)
+        self.end = today + datetime.timedelta(days=CALENDAR_FUTURE_DAYS)
+
+    def set_rows(self, rows: list):
+        # rows - [(property_id, название)] в порядке отображения
+        self.rows = list(rows)
+
+    def load(self, bookings: list):
+        self.trees = {}
+        for booking in bookings:
+            self.put_booking(booking)
+
+    def put_booking(self, booking):
+        tree = self.trees.get(booking['property_id'])
+        if tree is None:
+            tree = self.trees[booking['property_id']] = IntervalTree()
+        tree.add(booking['start_date'], booking['end_date'], booking['booking_id'], booking)
+        # Шкала расширяется, чтобы бронь была видна целиком
+        self.origin = min(self.origin, booking['start_date'])
+        self.end = max(self.end, booking['end_date'])
+
+    def remove_booking(self, property_id, booking_id):
+        tree = self.trees.get(property_id)
+        if tree is not None:
+            tree.remove(booking_id)
+
+    def visible(self, property_id, start_date, end_date) -> list:
+        tree = self.trees.get(property_id)
+        if tree is None:
+            return []
+        return tree.overlapping(start_date, end_date)
+
+    def conflicts(self, property_id, start_date, end_date, exclude_booking_id=None) -> list:
+        # Активные брони объекта, пересекающиеся с периодом (кроме изменяемой брони)
+        return [
+            booking for booking in self.visible(property_id, start_date, end_date)
+            if booking['status'] == ACTIVE_STATUS and booking['booking_id'] != exclude_booking_id
+        ]
+
+    def days(self) -> int:
+        return (self.end - self.origin).days + 1
+
+
+class TimelineHeader(QWidget):
+    # Шкала дат над календарем (в поле viewport margins)
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+        view = self.view
+        origin = view.timeline.origin
+        step = next((days for days in TICK_STEPS if days * view.day_px >= TICK_MIN_PX), TICK_STEPS[-1])
+        left = view.mapToScene(0, 0).x()
+        right = view.mapToScene(view.viewport().width(), 0).x()
+        first = int(math.floor(left / step)) * step
+        painter.setPen(self.palette().windowText().color())
+        for day in range(first, int(math.ceil(right)) + step, step):
+            x = view.mapFromScene(QPointF(day, 0)).x()
+            date = origin + datetime.timedelta(days=day)
+            painter.drawLine(x, self.height() - 4, x, self.height())
+            painter.drawText(x + 3, self.height() - 6, date.strftime("%d.%m.%y" if step < 30 else "%m.%Y"))
+        painter.end()
+
+
+class TimelineLabels(QWidget):
+    # Названия объектов слева от календаря
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+        view = self.view
+        top = view.mapToScene(0, 0).y()
+        metrics = QFontMetrics(painter.font())
+        first = max(0, int(top // ROW_HEIGHT))
+        last = min(len(view.timeline.rows) - 1, int((top + self.height()) // ROW_HEIGHT))
+        painter.setPen(self.palette().windowText().color())
+        for row in range(first, last + 1):
+            y = view.mapFromScene(QPointF(0, row * ROW_HEIGHT)).y()
+            title = metrics.elidedText(str(view.timeline.rows[row][1]), Qt.TextElideMode.ElideRight, self.width() - 8)
+            painter.drawText(QRect(4, y, self.width() - 8, ROW_HEIGHT),
+                             Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, title)
+        painter.end()
+
+
+class BookingCalendarView(QGraphicsView):
+    # Диаграмма Ганта броней: строки - объекты, полосы - брони. Элементы сцены не создаются:
+    # drawBackground рисует только попавший в область перерисовки период и строки,
+    # запрашивая брони у деревьев интервалов, поэтому прокрутка и масштаб не зависят от числа броней
+    bookingActivated = pyqtSignal(object)
+
+    def __init__(self, timeline: BookingTimeline, parent=None):
+        super().__init__(parent)
+        self.timeline = timeline
+        self.day_px = DEFAULT_DAY_PX
+        self.setScene(QGraphicsScene(self))
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.setMouseTracking(True)
+        self.setViewportMargins(LABEL_WIDTH, HEADER_HEIGHT, 0, 0)
+        self.header = TimelineHeader(self)
+        self.labels = TimelineLabels(self)
+        self.setTransform(QTransform.fromScale(self.day_px, 1))
+        self.timeline_changed()
+
+    def timeline_changed(self, center_today: bool = False):
+        # Строки или брони изменились: новые границы сцены и перерисовка
+        self.setSceneRect(QRectF(0, 0, self.timeline.days(), max(1, len(self.timeline.rows)) * ROW_HEIGHT))
+        if center_today:
+            self.scroll_to_date(datetime.date.today())
+        self.viewport().update()
+        self.header.update()
+        self.labels.update()
+
+    def scroll_to_date(self, date):
+        x = (date - self.timeline.origin).days
+        self.centerOn(x, self.mapToScene(self.viewport().rect().center()).y())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        rect = self.contentsRect()
+        self.header.setGeometry(rect.left() + LABEL_WIDTH, rect.top(), rect.width() - LABEL_WIDTH, HEADER_HEIGHT)
+        self.labels.setGeometry(rect.left(), rect.top() + HEADER_HEIGHT, LABEL_WIDTH, rect.height() - HEADER_HEIGHT)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        if dx:
+            self.header.update()
+        if dy:
+            self.labels.update()
+
+    def wheelEvent(self, event):
+        # Ctrl + колесо - масштаб по времени относительно точки под курсором
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            super().wheelEvent(event)
+            return
+        factor = ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+        day_px = min(MAX_DAY_PX, max(MIN_DAY_PX, self.day_px * factor))
+        if day_px != self.day_px:
+            self.scale(day_px / self.day_px, 1)
+            self.day_px = day_px
+            self.header.update()
+        event.accept()
+
+    def booking_at(self, position):
+        point = self.mapToScene(position)
+        row = int(point.y() // ROW_HEIGHT)
+        if point.y() < 0 or row >= len(self.timeline.rows):
+            return None
+        day = self.timeline.origin + datetime.timedelta(days=int(math.floor(point.x())))
+        bookings = self.timeline.visible(self.timeline.rows[row][0], day, day + datetime.timedelta(days=1))
+        return bookings[-1] if bookings else None
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        booking = self.booking_at(event.position().toPoint())
+        if booking is None:
+            QToolTip.hideText()
+            return
+        QToolTip.showText(
+            event.globalPosition().toPoint(),
+            f"Бронь №{booking['booking_id']}: {booking['user_email']}\n"
+            f"{booking['start_date'].strftime('%d.%m.%Y')} - {booking['end_date'].strftime('%d.%m.%Y')}, "
+            f"{booking['status']}",
+            self
+        )
+
+    def mouseDoubleClickEvent(self, event):
+        booking = self.booking_at(event.position().toPoint())
+        if booking is not None:
+            self.bookingActivated.emit(booking)
+        else:
+            super().mouseDoubleClickEvent(event)
+
+    def drawBackground(self, painter, rect):
+        timeline = self.timeline
+        painter.fillRect(rect, self.palette().base())
+        first_day = max(0, int(math.floor(rect.left())))
+        last_day = min(timeline.days(), int(math.ceil(rect.right())) + 1)
+        first_row = max(0, int(rect.top() // ROW_HEIGHT))
+        last_row = min(len(timeline.rows) - 1, int(rect.bottom() // ROW_HEIGHT))
+        grid = QPen(self.palette().mid().color(), 0)
+
+        # Выходные и границы месяцев - только в видимом периоде
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.palette().alternateBase())
+        if self.day_px >= 4:
+            painter.drawRects([
+                QRectF(day, rect.top(), 1, rect.height()) for day in range(first_day, last_day)
+                if (timeline.origin + datetime.timedelta(days=day)).weekday() >= 5
+            ])
+        painter.setPen(grid)
+        for day in range(first_day, last_day):
+            if (timeline.origin + datetime.timedelta(days=day)).day == 1:
+                painter.drawLine(QPointF(day, rect.top()), QPointF(day, rect.bottom()))
+        for row in range(first_row, last_row + 2):
+            painter.drawLine(QPointF(rect.left(), row * ROW_HEIGHT), QPointF(rect.right(), row * ROW_HEIGHT))
+
+        # Полосы броней, сгруппированные по цвету статуса: одна команда рисования на статус
+        start_date = timeline.origin + datetime.timedelta(days=first_day)
+        end_date = timeline.origin + datetime.timedelta(days=last_day)
+        bars = {status: [] for status in STATUS_COLORS}
+        for row in range(first_row, last_row + 1):
+            top = row * ROW_HEIGHT + BAR_MARGIN
+            for booking in timeline.visible(timeline.rows[row][0], start_date, end_date):
+                left = (booking['start_date'] - timeline.origin).days
+                width = (booking['end_date'] - booking['start_date']).days
+                bars.setdefault(booking['status'], []).append(QRectF(left, top, width, ROW_HEIGHT - 2 * BAR_MARGIN))
+        painter.setPen(Qt.PenStyle.NoPen)
+        for status, rects in bars.items():
+            if rects:
+                painter.setBrush(STATUS_COLORS.get(status, QColor(127, 127, 127)))
+                painter.drawRects(rects)
+
+        today = (datetime.date.today() - timeline.origin).days
+        if first_day <= today <= last_day:
+            painter.setPen(QPen(QColor(192, 57, 43), 0))
+            painter.drawLine(QPointF(today, rect.top()), QPointF(today, rect.bottom()))
+
+
+class CalendarWindow(QWidget):
+    # Календарь броней всех объектов, загруженных в список главного окна
+    windowClosed = pyqtSignal()
+
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.WindowCloseButtonHint | Qt.WindowType.WindowTitleHint
+                            | Qt.WindowType.WindowMaximizeButtonHint)
+        self.setMinimumSize(900, 500)
+        self.main_window = main_window
+        self.timeline = BookingTimeline()
+        self.main_window.runner.channelBusy.connect(self.set_channel_busy)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle("Календарь броней")
+        self.setWindowIcon(QIcon(self.main_window.set_logo()))
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self.hint_label = QLabel(
+            "Ctrl + колесо мыши - масштаб, перетаскивание - прокрутка, двойной щелчок по брони - изменение"
+        )
+        self.loading_label = QLabel("Загрузка...")
+        self.loading_label.hide()
+        self.view = BookingCalendarView(self.timeline, self)
+        self.view.bookingActivated.connect(self.open_booking)
+        layout.addWidget(self.hint_label)
+        layout.addWidget(self.loading_label)
+        layout.addWidget(self.view)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_bookings()
+
+    def closeEvent(self, event):
+        self.main_window.runner.cancel(CALENDAR_CHANNEL)
+        self.windowClosed.emit()
+        self.main_window.setEnabled(True)
+        event.accept()
+
+    def load_bookings(self):
+        properties = self.main_window.property_model.properties
+        self.timeline.set_rows([(prop['property_id'], prop['title']) for prop in properties])
+        self.timeline.load([])
+        self.view.timeline_changed()
+        today = datetime.date.today()
+        self.main_window.runner.submit(
+            CALENDAR_CHANNEL,
+            self.main_window.service.calendar_bookings,
+            [prop['property_id'] for prop in properties],
+            today - datetime.timedelta(days=CALENDAR_PAST_DAYS),
+            today + datetime.timedelta(days=CALENDAR_FUTURE_DAYS),
+            on_result=self.show_bookings,
+            on_error=self.bookings_load_failed
+        )
+
+    def show_bookings(self, bookings):
+        self.timeline.load(bookings)
+        self.view.timeline_changed(center_today=True)
+
+    def bookings_load_failed(self, error):
+        print(str(error))
+        QMessageBox.critical(self, "Ошибка", "Не удалось загрузить брони для календаря")
+
+    def open_booking(self, booking):
+        # Двойной щелчок по брони: окно управления бронированием ее объекта с диалогом изменения.
+        # Строка календаря несет версию брони, поэтому диалог открывается без запроса
+        model = self.main_window.property_model
+        row = model.row_of(booking['property_id'])
+        if row is None:
+            return
+        self.close()
+        self.main_window.rent_property(model.properties[row])
+        self.main_window.booking_management.show_edit_dialog(booking)
+
+    def set_channel_busy(self, channel, busy):
+        if channel == CALENDAR_CHANNEL:
+            self.loading_label.setVisible(busy)
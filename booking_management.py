@@ -1,11 +1,23 @@
-import re
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QMessageBox, QComboBox, QLabel, QVBoxLayout, QDialog, QDialogButtonBox,
-    QPushButton, QGroupBox, QLineEdit, QFormLayout, QTableWidget, QDateEdit, QTableWidgetItem
+    QPushButton, QGroupBox, QLineEdit, QFormLayout, QTableView, QDateEdit, QCheckBox, QTabWidget,
+    QInputDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDate
+from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTimer
 from PyQt6.QtGui import QIcon
 
+from database import BookingOverlapError, BOOKING_PAGE_SIZE
+from booking_service import (
+    BOOKING_STATUSES, ACTIVE_STATUS, MAX_SHIFT_DAYS, ValidationError, BookingConflictError, validate_email
+)
+from booking_table import BookingTableModel, DEFAULT_SORT_COLUMN, DEFAULT_SORT_ORDER
+from booking_calendar import BookingTimeline, BookingCalendarView
+
+# Окно дат по умолчанию: текущий месяц и столько месяцев до и после него
+BOOKING_WINDOW_MONTHS = 3
+# Задержка фильтра при вводе email, мс
+EMAIL_FILTER_DEBOUNCE_MS = 300
+
 class BookingManagementWindow(QWidget):
     windowClosed = pyqtSignal()
     
@@ -15,7 +27,19 @@ class BookingManagementWindow(QWidget):
         self.setMinimumSize(700, 500)
         self.main_window = main_window
         self.property_data = property_data
-        self.status_list = ["активен", "отменен", "завершен"]
+        self.status_list = BOOKING_STATUSES
+        # Канал фоновой загрузки броней этого объекта
+        self.channel = f"bookings:{self.property_data['property_id']}"
+        self.counts_channel = f"booking_counts:{self.property_data['property_id']}"
+        self.calendar_channel = f"booking_calendar:{self.property_data['property_id']}"
+        # Все брони объекта в дереве интервалов: календарь и предупреждения о пересечении в диалогах
+        self.timeline = BookingTimeline()
+        self.timeline.set_rows([(self.property_data['property_id'], self.property_data['title'])])
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(EMAIL_FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.filters_changed)
+        self.main_window.runner.channelBusy.connect(self.set_channel_busy)
         self.initUI()
         
     def initUI(self):
@@ -24,6 +48,10 @@ class BookingManagementWindow(QWidget):
         self.create_ui()
 
     def closeEvent(self, event):
+        self.main_window.runner.cancel(self.channel)
+        self.main_window.runner.cancel(self.counts_channel)
+        self.main_window.runner.cancel(self.calendar_channel)
+        self.main_window.runner.channelBusy.disconnect(self.set_channel_busy)
         self.windowClosed.emit()
         self.main_window.setEnabled(True)
         event.accept()
@@ -39,73 +67,226 @@ class BookingManagementWindow(QWidget):
         info_layout.addWidget(property_type)
         info_group.setLayout(info_layout)
         
-        self.bookings_table = QTableWidget()
-        self.bookings_table.setColumnCount(6)
-        self.bookings_table.setHorizontalHeaderLabels([
-            "ID", "Email", "Начало", "Конец", "Статус", "Дата создания"
-        ])
-        self.bookings_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.bookings_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.bookings_table.setSortingEnabled(True)
+        filters_group = QGroupBox("Фильтры")
+        filters_group.setLayout(self.create_filters())
+
+        # Брони загружаются страницами при прокрутке; щелчок по заголовку перезапрашивает
+        # первую страницу в новом порядке (сортировка на сервере)
+        self.bookings_model = BookingTableModel(self)
+        self.bookings_model.sortRequested.connect(self.load_bookings)
+        self.bookings_table = QTableView()
+        self.bookings_table.setModel(self.bookings_model)
+        self.bookings_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.bookings_table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.bookings_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.bookings_table.horizontalHeader().setStretchLastSection(True)
+        self.bookings_table.horizontalHeader().setSortIndicator(DEFAULT_SORT_COLUMN, DEFAULT_SORT_ORDER)
         
         btn_layout = QHBoxLayout()
         self.add_btn = QPushButton("Добавить бронь", clicked=self.add_booking)
         self.edit_btn = QPushButton("Изменить", clicked=self.edit_booking)
         self.delete_btn = QPushButton("Удалить", clicked=self.delete_booking)
+        # Групповые операции над выбранными строками (Ctrl/Shift + щелчок)
+        self.cancel_btn = QPushButton("Отменить выбранные", clicked=self.cancel_bookings)
+        self.status_btn = QPushButton("Изменить статус", clicked=self.change_bookings_status)
+        self.shift_btn = QPushButton("Сдвинуть даты", clicked=self.shift_bookings)
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.edit_btn)
         btn_layout.addWidget(self.delete_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        btn_layout.addWidget(self.status_btn)
+        btn_layout.addWidget(self.shift_btn)
         
+        self.loading_label = QLabel("Загрузка...")
+        self.loading_label.hide()
+
+        list_tab = QWidget()
+        list_layout = QVBoxLayout()
+        list_layout.addWidget(filters_group)
+        list_layout.addWidget(QLabel("Список бронирований:"))
+        list_layout.addWidget(self.loading_label)
+        list_layout.addWidget(self.bookings_table)
+        list_tab.setLayout(list_layout)
+
+        # Календарь: Ctrl + колесо - масштаб, двойной щелчок по брони - редактирование
+        self.calendar_view = BookingCalendarView(self.timeline)
+        self.calendar_view.bookingActivated.connect(self.show_edit_dialog)
+
+        tabs = QTabWidget()
+        tabs.addTab(list_tab, "Список")
+        tabs.addTab(self.calendar_view, "Календарь")
+
         main_layout.addWidget(info_group)
-        main_layout.addWidget(QLabel("Список бронирований:"))
-        main_layout.addWidget(self.bookings_table)
+        main_layout.addWidget(tabs)
         main_layout.addLayout(btn_layout)
         
         self.setLayout(main_layout)
+        # Включение сортировки вызывает sort() модели - загружается первая страница
+        self.bookings_table.setSortingEnabled(True)
+        self.load_counts()
+        self.load_calendar()
+
+    def load_calendar(self):
+        self.main_window.runner.submit(
+            self.calendar_channel,
+            self.main_window.service.calendar_bookings,
+            [self.property_data['property_id']],
+            on_result=self.show_calendar,
+            on_error=lambda error: print(str(error))
+        )
+
+    def show_calendar(self, bookings):
+        self.timeline.load(bookings)
+        self.calendar_view.timeline_changed(center_today=True)
+
+    def attach_overlap_warning(self, form, start_edit, end_edit, status_combo, booking_id=None):
+        # Предупреждение о пересечении с активными бронями по мере изменения дат в диалоге;
+        # проверка по дереву интервалов в памяти, окончательно пересечение отклоняет база
+        warning = QLabel()
+        warning.setStyleSheet("color: #c0392b;")
+        warning.setWordWrap(True)
+        warning.hide()
+
+        def check():
+            start_date = start_edit.date().toPyDate()
+            end_date = end_edit.date().toPyDate()
+            conflicts = []
+            if status_combo.currentText() == ACTIVE_STATUS and start_date < end_date:
+                conflicts = self.timeline.conflicts(self.property_data['property_id'], start_date, end_date, booking_id)
+            warning.setText("Пересекается с активными бронями: " + ", ".join(
+                f"№{booking['booking_id']} ({booking['start_date'].strftime('%d.%m.%Y')} - "
+                f"{booking['end_date'].strftime('%d.%m.%Y')})" for booking in conflicts[:3]
+            ) + (" и др." if len(conflicts) > 3 else ""))
+            warning.setVisible(bool(conflicts))
+
+        start_edit.dateChanged.connect(check)
+        end_edit.dateChanged.connect(check)
+        status_combo.currentTextChanged.connect(check)
+        form.addRow(warning)
+        check()
+
+    def create_filters(self):
+        layout = QHBoxLayout()
+        # Флажки статусов; в тексте - число броней со статусом (см. show_counts)
+        self.status_checkboxes = {}
+        for status in self.status_list:
+            cb = QCheckBox(status)
+            cb.setChecked(True)
+            cb.toggled.connect(self.filters_changed)
+            self.status_checkboxes[status] = cb
+            layout.addWidget(cb)
+
+        month = QDate(QDate.currentDate().year(), QDate.currentDate().month(), 1)
+        self.window_checkbox = QCheckBox("Период")
+        self.window_checkbox.setChecked(True)
+        self.window_from_edit = QDateEdit(calendarPopup=True, date=month.addMonths(-BOOKING_WINDOW_MONTHS))
+        self.window_to_edit = QDateEdit(calendarPopup=True, date=month.addMonths(BOOKING_WINDOW_MONTHS + 1).addDays(-1))
+        self.window_checkbox.toggled.connect(self.filters_changed)
+        self.window_from_edit.dateChanged.connect(self.filters_changed)
+        self.window_to_edit.dateChanged.connect(self.filters_changed)
+        layout.addWidget(self.window_checkbox)
+        layout.addWidget(self.window_from_edit)
+        layout.addWidget(QLabel("по"))
+        layout.addWidget(self.window_to_edit)
+
+        self.email_filter = QLineEdit()
+        self.email_filter.setPlaceholderText("Начало email")
+        self.email_filter.textChanged.connect(lambda text: self.filter_timer.start())
+        layout.addWidget(self.email_filter)
+        return layout
+
+    def current_filters(self) -> dict:
+        # Фильтры для BookingService.bookings_page; окно дат [window_from, window_to) с включенной датой "по"
+        window_from = window_to = None
+        if self.window_checkbox.isChecked():
+            window_from = self.window_from_edit.date().toPyDate()
+            window_to = self.window_to_edit.date().addDays(1).toPyDate()
+        return {
+            'statuses': [status for status, cb in self.status_checkboxes.items() if cb.isChecked()],
+            'window_from': window_from,
+            'window_to': window_to,
+            'email_prefix': self.email_filter.text().strip() or None,
+        }
+
+    def booking_matches(self, booking) -> bool:
+        # Проходит ли бронь текущие фильтры (для точечного обновления таблицы)
+        filters = self.current_filters()
+        if booking['status'] not in filters['statuses']:
+            return False
+        if filters['window_from'] is not None and not (
+                booking['start_date'] < filters['window_to'] and booking['end_date'] > filters['window_from']):
+            return False
+        prefix = filters['email_prefix']
+        return prefix is None or booking['user_email'].lower().startswith(prefix.lower())
+
+    def filters_changed(self):
+        self.filter_timer.stop()
+        if self.window_checkbox.isChecked() and self.window_from_edit.date() > self.window_to_edit.date():
+            return
         self.load_bookings()
+        self.load_counts()
+
+    def load_counts(self):
+        filters = self.current_filters()
+        self.main_window.runner.submit(
+            self.counts_channel,
+            self.main_window.service.booking_status_counts,
+            self.property_data['property_id'],
+            filters['window_from'],
+            filters['window_to'],
+            filters['email_prefix'],
+            on_result=self.show_counts,
+            on_error=lambda error: print(str(error))
+        )
+
+    def show_counts(self, counts):
+        for status, cb in self.status_checkboxes.items():
+            cb.setText(f"{status} ({counts.get(status, 0)})")
 
     def load_bookings(self):
-        try:
-            query = """
-                SELECT booking_id, user_email, start_date, end_date, status, created_at 
-                FROM booking 
-                WHERE property_id = %s
-                ORDER BY start_date DESC
-            """
-            result = self.main_window.db.execute_query(
-                query, 
-                (self.property_data['property_id'],),
-                fetch=True
+        model = self.bookings_model
+        sort_column = model.sort_field()
+        descending = model.is_descending()
+        filters = self.current_filters()
+
+        def fetch_page(after, generation):
+            self.main_window.runner.submit(
+                self.channel,
+                self.main_window.service.bookings_page,
+                self.property_data['property_id'],
+                sort_column,
+                descending,
+                after,
+                **filters,
+                on_result=lambda rows: model.append_page(rows, generation),
+                on_error=lambda error: self.bookings_load_failed(error, generation)
             )
-            
-            if result is None:
-                result = []
-                
-            self.bookings_table.setRowCount(len(result))
-            
-            for row_idx, row in enumerate(result):
-                values = [
-                    row['booking_id'],
-                    row['user_email'],
-                    row['start_date'].strftime("%d.%m.%Y"),
-                    row['end_date'].strftime("%d.%m.%Y"),
-                    row['status'],
-                    row['created_at'].strftime("%d.%m.%Y %H:%M")
-                ]
-                for col_idx, value in enumerate(values):
-                    item = QTableWidgetItem(str(value))
-                    self.bookings_table.setItem(row_idx, col_idx, item)
-                    
-        except Exception as e:
-            print(str(e))
-            QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки брони из базы данных")
-            self.bookings_table.setRowCount(0)
+
+        model.set_fetcher(fetch_page, BOOKING_PAGE_SIZE)
+
+    def bookings_load_failed(self, error, generation):
+        print(str(error))
+        self.bookings_model.page_failed(generation)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки брони из базы данных")
+
+    def selected_bookings(self) -> list:
+        rows = sorted(index.row() for index in self.bookings_table.selectionModel().selectedRows())
+        return [self.bookings_model.booking_at(row) for row in rows]
+
+    def selected_booking(self):
+        index = self.bookings_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.bookings_model.booking_at(index.row())
+
+    def set_channel_busy(self, channel, busy):
+        if channel == self.channel:
+            self.loading_label.setVisible(busy)
 
     def add_booking(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Создание брони")
-        dialog.setFixedHeight(150)
+        dialog.setMinimumHeight(150)
         
         form = QFormLayout()
         email_new = QLineEdit()
@@ -119,6 +300,7 @@ class BookingManagementWindow(QWidget):
         form.addRow("Дата начала:", start_edit)
         form.addRow("Дата окончания:", end_edit)
         form.addRow("Статус:", status_combo)
+        self.attach_overlap_warning(form, start_edit, end_edit, status_combo)
         
         btn_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok| QDialogButtonBox.StandardButton.Cancel)
 
@@ -135,49 +317,37 @@ class BookingManagementWindow(QWidget):
         dialog.setLayout(form)    
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            email = email_new.text().strip()
-            if start_edit.date().toPyDate() >= end_edit.date().toPyDate():
-                QMessageBox.warning(self, "Ошибка", "Выбранный период дат неверен")
-                return
-            elif not self.validate_email(email):
-                QMessageBox.warning(self, "Ошибка", "Некорректный email")
+            try:
+                email, start_date, end_date, status = self.main_window.service.validate_booking(
+                    email_new.text(), start_edit.date().toPyDate(), end_edit.date().toPyDate(),
+                    status_combo.currentText()
+                )
+            except ValidationError as e:
+                QMessageBox.warning(self, "Ошибка", str(e))
                 return
-            else:
-                query = """
-                    INSERT INTO booking 
-                    (property_id, user_email, start_date, end_date, status)
-                    VALUES (%s, %s, %s, %s, %s)
-                """
-                try:
-                    self.main_window.db.execute_query(query, (
-                        self.property_data['property_id'],
-                        email,
-                        start_edit.date().toPyDate(),
-                        end_edit.date().toPyDate(),
-                        status_combo.currentText()
-                    ))
-                    QMessageBox.information(self, "Успех", "Бронь успешно добавлена!")
-                    self.load_bookings()
-                except Exception as e:
-                    print(str(e))
-                    QMessageBox.critical(self, "Ошибка", "Ошибка при добавлении брони")
+            self.main_window.runner.submit(
+                None,
+                self.main_window.service.create_booking,
+                self.property_data['property_id'],
+                email,
+                start_date,
+                end_date,
+                status,
+                on_result=lambda booking: self.booking_saved("Бронь успешно добавлена!", new=booking),
+                on_error=lambda error: self.booking_save_failed(error, "Ошибка при добавлении брони")
+            )
 
     def edit_booking(self):
-        selected = self.bookings_table.currentRow()
-        if selected == -1:
+        selected = self.selected_booking()
+        if selected is None:
             QMessageBox.warning(self, "Ошибка", "Выберите бронь для редактирования")
             return
         
-        booking_id = self.bookings_table.item(selected, 0).text()
-        
-        query = "SELECT * FROM booking WHERE booking_id = %s"
-        result = self.main_window.db.execute_query(query, (booking_id,), fetch=True)
-        
-        if not result:
-            QMessageBox.critical(self, "Ошибка", "Данные не найдены")
-            return
-        data = result[0]
-        
+        self.show_edit_dialog(selected)
+
+    def show_edit_dialog(self, data):
+        # data - строка брони из таблицы или календаря вместе с версией: диалог открывается без запроса,
+        # а изменение сохраняется, только если бронь никто не изменил с момента загрузки
         dialog = QDialog(self)
         dialog.setWindowTitle("Редактирование брони")
         layout = QFormLayout()
@@ -193,6 +363,7 @@ class BookingManagementWindow(QWidget):
         layout.addRow("Начало:", start_edit)
         layout.addRow("Конец:", end_edit)
         layout.addRow("Статус:", status_combo)
+        self.attach_overlap_warning(layout, start_edit, end_edit, status_combo, data['booking_id'])
         
         btn_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
 
@@ -209,46 +380,145 @@ class BookingManagementWindow(QWidget):
         dialog.setLayout(layout)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            email = email_edit.text().strip()
-            if not self.validate_email(email):
-                QMessageBox.warning(self, "Ошибка", "Некорректный email")
+            try:
+                email, start_date, end_date, status = self.main_window.service.validate_booking(
+                    email_edit.text(), start_edit.date().toPyDate(), end_edit.date().toPyDate(),
+                    status_combo.currentText()
+                )
+            except ValidationError as e:
+                QMessageBox.warning(self, "Ошибка", str(e))
                 return
-            else:
-                update_query = """
-                    UPDATE booking SET
-                        user_email = %s,
-                        start_date = %s,
-                        end_date = %s,
-                        status = %s
-                    WHERE booking_id = %s
-                """
-                try:
-                    self.main_window.db.execute_query(
-                        update_query,
-                        (
-                            email,
-                            start_edit.date().toPyDate(),
-                            end_edit.date().toPyDate(),
-                            status_combo.currentText(),
-                            booking_id
-                        )
-                    )
-                    QMessageBox.information(self, "Успех", "Бронь успешно изменена!")
-                    self.load_bookings()
-                except Exception as e:
-                    print(str(e))
-                    QMessageBox.critical(self, "Ошибка", "Ошибка при сохранении изменений")
+            self.main_window.runner.submit(
+                None,
+                self.main_window.service.update_booking,
+                data['booking_id'],
+                email,
+                start_date,
+                end_date,
+                status,
+                data['version'],
+                on_result=lambda booking: self.booking_saved("Бронь успешно изменена!", old=data, new=booking),
+                on_error=lambda error: self.booking_update_failed(error, data)
+            )
+
+    def booking_update_failed(self, error, data):
+        # Бронь изменили с другого рабочего места: строка обновляется текущими данными,
+        # изменения пользователя не применяются
+        if isinstance(error, BookingConflictError):
+            self.bookings_changed(data, error.current)
+            QMessageBox.warning(
+                self, "Ошибка",
+                "Бронь изменена другим пользователем. Данные обновлены, повторите изменение"
+            )
+        else:
+            self.booking_save_failed(error, "Ошибка при сохранении изменений")
 
     def delete_booking(self):
-        selected = self.bookings_table.currentRow()
-        if selected == -1:
+        selected = self.selected_bookings()
+        if not selected:
             QMessageBox.warning(self, "Ошибка", "Выберите бронь для удаления")
             return
         
+        text = "Удалить выбранную бронь?" if len(selected) == 1 else f"Удалить выбранные брони ({len(selected)})?"
+        if self.confirm(text):
+            self.run_bulk(
+                self.main_window.service.bulk_delete,
+                [booking['booking_id'] for booking in selected],
+                message="Удалено броней: {}",
+                error_text="Ошибка при удалении брони",
+                deleted=True
+            )
+
+    def cancel_bookings(self):
+        selected = self.selected_bookings()
+        if not selected:
+            QMessageBox.warning(self, "Ошибка", "Выберите брони для отмены")
+            return
+        if self.confirm(f"Отменить выбранные брони ({len(selected)})?"):
+            self.run_bulk(
+                self.main_window.service.bulk_cancel,
+                [booking['booking_id'] for booking in selected],
+                message="Отменено броней: {}",
+                error_text="Ошибка при отмене броней"
+            )
+
+    def change_bookings_status(self):
+        selected = self.selected_bookings()
+        if not selected:
+            QMessageBox.warning(self, "Ошибка", "Выберите брони для изменения статуса")
+            return
+        status, accepted = QInputDialog.getItem(
+            self, "Изменение статуса", f"Новый статус для броней ({len(selected)}):", self.status_list, 0, False
+        )
+        if accepted:
+            self.run_bulk(
+                self.main_window.service.bulk_set_status,
+                [booking['booking_id'] for booking in selected],
+                status,
+                message="Изменен статус броней: {}",
+                error_text="Ошибка при изменении статуса"
+            )
+
+    def shift_bookings(self):
+        selected = self.selected_bookings()
+        if not selected:
+            QMessageBox.warning(self, "Ошибка", "Выберите брони для сдвига дат")
+            return
+        days, accepted = QInputDialog.getInt(
+            self, "Сдвиг дат", f"Сдвинуть брони ({len(selected)}) на дней (назад - с минусом):",
+            7, -MAX_SHIFT_DAYS, MAX_SHIFT_DAYS
+        )
+        if accepted and days:
+            self.run_bulk(
+                self.main_window.service.bulk_shift_dates,
+                [booking['booking_id'] for booking in selected],
+                days,
+                message="Сдвинуто броней: {}",
+                error_text="Ошибка при сдвиге дат"
+            )
+
+    def run_bulk(self, action, booking_ids, *args, message, error_text, deleted=False):
+        # Групповая операция - одна команда в одной транзакции для всех выбранных броней
+        self.set_buttons_enabled(False)
+        self.main_window.runner.submit(
+            None,
+            action,
+            self.property_data['property_id'],
+            booking_ids,
+            *args,
+            on_result=lambda rows: self.bookings_bulk_changed(rows, message, deleted),
+            on_error=lambda error: self.bulk_failed(error, error_text)
+        )
+
+    def bulk_failed(self, error, error_text):
+        self.set_buttons_enabled(True)
+        self.booking_save_failed(error, error_text)
+
+    def bookings_bulk_changed(self, rows, message, deleted=False):
+        # Календарь и индекс занятости правятся по строкам результата, таблица и счетчики
+        # перезагружаются один раз
+        property_id = self.property_data['property_id']
+        for row in rows:
+            if deleted:
+                old, new = self.booking_period(row), None
+            else:
+                old, new = (row['old_start_date'], row['old_end_date'], row['old_status']), self.booking_period(row)
+            self.timeline.remove_booking(property_id, row['booking_id'])
+            if not deleted:
+                self.timeline.put_booking(row)
+            self.main_window.occupancy_booking_changed(property_id, old, new)
+        self.calendar_view.timeline_changed()
+        self.load_bookings()
+        self.load_counts()
+        self.main_window.refresh_property_rows([property_id])
+        self.set_buttons_enabled(True)
+        QMessageBox.information(self, "Успех", message.format(len(rows)))
+
+    def confirm(self, text) -> bool:
         msg_box = QMessageBox(
             QMessageBox.Icon.Question,
             "Подтверждение",
-            "Удалить выбранную бронь?",
+            text,
             buttons=QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             parent=self
         )
@@ -259,18 +529,45 @@ class BookingManagementWindow(QWidget):
         no_button = msg_box.button(QMessageBox.StandardButton.No)
         no_button.setText("Нет")
 
-        booking_id = self.bookings_table.item(selected, 0).text()
-        
-        if msg_box.exec() == QMessageBox.StandardButton.Yes:
-            try:
-                self.main_window.db.execute_query(
-                    "DELETE FROM booking WHERE booking_id = %s",
-                    (booking_id,)
-                )
-                self.load_bookings()
-            except Exception as e:
-                print(str(e))
-                QMessageBox.critical(self, "Ошибка", "Ошибка при удалении брони")
+        return msg_box.exec() == QMessageBox.StandardButton.Yes
+
+    def set_buttons_enabled(self, enabled):
+        for button in (self.add_btn, self.edit_btn, self.delete_btn, self.cancel_btn, self.status_btn, self.shift_btn):
+            button.setEnabled(enabled)
+
+    def booking_saved(self, message, old=None, new=None):
+        QMessageBox.information(self, "Успех", message)
+        self.bookings_changed(old, new)
+
+    def booking_save_failed(self, error, message):
+        # Пересечение активных броней отклоняет ограничение booking_active_no_overlap
+        if isinstance(error, BookingOverlapError):
+            QMessageBox.warning(self, "Ошибка", "Период пересекается с другой активной бронью этого объекта")
+        else:
+            QMessageBox.critical(self, "Ошибка", message)
+
+    def bookings_changed(self, old=None, new=None):
+        # old/new - строки брони до и после изменения. Таблица правится точечно, без перезагрузки;
+        # наличие активных броней влияет на фильтр списка недвижимости и на индекс занятости
+        if old is not None:
+            self.bookings_model.remove_booking(old['booking_id'])
+            self.timeline.remove_booking(self.property_data['property_id'], old['booking_id'])
+        if new is not None:
+            if self.booking_matches(new):
+                self.bookings_model.put_booking(new)
+            self.timeline.put_booking(new)
+        self.calendar_view.timeline_changed()
+        self.load_counts()
+        self.main_window.occupancy_booking_changed(
+            self.property_data['property_id'], self.booking_period(old), self.booking_period(new)
+        )
+        self.main_window.refresh_property_rows([self.property_data['property_id']])
+
+    @staticmethod
+    def booking_period(booking):
+        if booking is None:
+            return None
+        return (booking['start_date'], booking['end_date'], booking['status'])
 
     def save_booking(self):
         email = email.text().strip()
@@ -297,5 +594,4 @@ class BookingManagementWindow(QWidget):
             QMessageBox.critical(self, "Ошибка", "Ошибка при сохранении брони")
 
     def validate_email(self, email: str) -> bool:
-        pattern = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        return re.fullmatch(pattern, email) is not None
\ No newline at end of file
+        return validate_email(email)
\ No newline at end of file
@@ -0,0 +1,201 @@
+# Бизнес-логика поиска и бронирования без зависимости от Qt: используется окнами приложения
+# и HTTP API (api_server.py). Методы синхронные и выполняются в рабочих потоках
+# (TaskRunner или исполнитель API); ошибки базы приходят типизированными (DatabaseError)
+import re
+import datetime
+
+from database import PROPERTY_PAGE_SIZE, BOOKING_PAGE_SIZE, BOOKING_SORT_COLUMNS
+
+BOOKING_STATUSES = ["активен", "отменен", "завершен"]
+ACTIVE_STATUS = "активен"
+CANCELLED_STATUS = "отменен"
+# Наибольший групповой сдвиг дат броней, дней
+MAX_SHIFT_DAYS = 3650
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+EMAIL_MAX_LENGTH = 50
+# Наибольший размер страницы поиска, который может запросить клиент
+MAX_PAGE_SIZE = 500
+
+
+class ValidationError(ValueError):
+    # Некорректные входные данные; текст пригоден для показа пользователю
+    pass
+
+
+class NotFoundError(LookupError):
+    # Запрошенная запись не существует
+    pass
+
+
+class BookingConflictError(Exception):
+    # Бронь изменена другим пользователем после чтения; current - ее текущая строка
+    def __init__(self, current: dict):
+        super().__init__("Бронь изменена другим пользователем")
+        self.current = current
+
+
+def validate_email(email: str) -> bool:
+    return len(email) <= EMAIL_MAX_LENGTH and EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def validate_period(start_date, end_date):
+    if start_date is None or end_date is None or start_date >= end_date:
+        raise ValidationError("Выбранный период дат неверен")
+
+
+def parse_date(value):
+    # Дата из ГГГГ-ММ-ДД (HTTP API) или уже готовый datetime.date
+    if value is None or isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Некорректная дата: {value}")
+
+
+class BookingService:
+    def __init__(self, db):
+        self.db = db
+
+    def search(self, search_query=None, categories=None, amenities=None, has_active_booking=None,
+               available_from=None, available_to=None, after=None, limit=PROPERTY_PAGE_SIZE) -> list:
+        # Страница результата поиска; after - ключ (title, property_id) последней строки предыдущей страницы
+        available_from, available_to = parse_date(available_from), parse_date(available_to)
+        if available_from is not None or available_to is not None:
+            validate_period(available_from, available_to)
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            raise ValidationError(f"Размер страницы должен быть от 1 до {MAX_PAGE_SIZE}")
+        return self.db.get_properties_page(
+            after=after,
+            limit=limit,
+            search_query=search_query or None,
+            categories=categories or None,
+            amenities=amenities or None,
+            has_active_booking=has_active_booking,
+            available_from=available_from,
+            available_to=available_to,
+        )
+
+    def availability(self, property_id: int, start_date, end_date) -> dict:
+        # Свободен ли объект в период [start_date, end_date) и какие активные брони мешают
+        start_date, end_date = parse_date(start_date), parse_date(end_date)
+        validate_period(start_date, end_date)
+        conflicts = self.db.execute_prepared('booking_conflicts', (property_id, start_date, end_date), fetch=True)
+        return {'property_id': property_id, 'available': not conflicts, 'conflicts': conflicts}
+
+    def list_bookings(self, property_id: int) -> list:
+        return self.db.execute_prepared('property_bookings', (property_id,), fetch=True)
+
+    def bookings_page(self, property_id: int, sort_column: str = 'start_date', descending: bool = True,
+                      after=None, limit=BOOKING_PAGE_SIZE, statuses=None, window_from=None, window_to=None,
+                      email_prefix=None) -> list:
+        # Страница броней объекта в порядке сортировки таблицы; сортировка и фильтры выполняются на сервере
+        if sort_column not in BOOKING_SORT_COLUMNS:
+            raise ValidationError(f"Недопустимый столбец сортировки: {sort_column}")
+        window_from, window_to, email_prefix = self.validate_booking_filters(
+            statuses, window_from, window_to, email_prefix
+        )
+        return self.db.get_bookings_page(
+            property_id, sort_column, descending, after, limit, statuses, window_from, window_to, email_prefix
+        )
+
+    def booking_status_counts(self, property_id: int, window_from=None, window_to=None, email_prefix=None) -> dict:
+        # Число броней по каждому статусу (отсутствующие статусы - 0)
+        window_from, window_to, email_prefix = self.validate_booking_filters(
+            None, window_from, window_to, email_prefix
+        )
+        counts = self.db.count_bookings_by_status(property_id, window_from, window_to, email_prefix)
+        return {status: counts.get(status, 0) for status in BOOKING_STATUSES}
+
+    def calendar_bookings(self, property_ids: list, window_from=None, window_to=None) -> list:
+        # Брони объектов для календаря (все статусы), пересекающиеся с окном дат
+        window_from, window_to = parse_date(window_from), parse_date(window_to)
+        if window_from is not None and window_to is not None:
+            validate_period(window_from, window_to)
+        if not property_ids:
+            return []
+        return self.db.get_bookings_in_window(property_ids, window_from, window_to)
+
+    @staticmethod
+    def validate_booking_filters(statuses, window_from, window_to, email_prefix) -> tuple:
+        if statuses is not None and any(status not in BOOKING_STATUSES for status in statuses):
+            raise ValidationError("Недопустимый статус в фильтре")
+        window_from, window_to = parse_date(window_from), parse_date(window_to)
+        if window_from is not None and window_to is not None:
+            validate_period(window_from, window_to)
+        return window_from, window_to, (email_prefix or "").strip() or None
+
+    def get_booking(self, booking_id: int) -> dict:
+        result = self.db.execute_prepared('booking_by_id', (booking_id,), fetch=True)
+        if not result:
+            raise NotFoundError("Бронь не найдена")
+        return result[0]
+
+    def validate_booking(self, email: str, start_date, end_date, status: str) -> tuple:
+        email = (email or "").strip()
+        start_date, end_date = parse_date(start_date), parse_date(end_date)
+        validate_period(start_date, end_date)
+        if not validate_email(email):
+            raise ValidationError("Некорректный email")
+        if status not in BOOKING_STATUSES:
+            raise ValidationError(f"Недопустимый статус: {status}")
+        return email, start_date, end_date, status
+
+    def create_booking(self, property_id: int, email: str, start_date, end_date, status: str = ACTIVE_STATUS) -> dict:
+        # Пересечение с активной бронью отклоняет база (BookingOverlapError)
+        email, start_date, end_date, status = self.validate_booking(email, start_date, end_date, status)
+        return self.db.execute_prepared(
+            'booking_insert', (property_id, email, start_date, end_date, status), fetch=True
+        )[0]
+
+    def update_booking(self, booking_id: int, email: str, start_date, end_date, status: str, version) -> dict:
+        # version - версия строки из ранее прочитанной брони (поле version): при ее несовпадении
+        # изменение не выполняется (BookingConflictError). Безусловной перезаписи нет
+        email, start_date, end_date, status = self.validate_booking(email, start_date, end_date, status)
+        if version is None:
+            raise ValidationError("Не указана версия брони")
+        if isinstance(version, bool) or not isinstance(version, int) or version < 0:
+            raise ValidationError("Некорректная версия брони")
+        result = self.db.execute_prepared(
+            'booking_update', (email, start_date, end_date, status, booking_id, str(version)), fetch=True
+        )
+        if not result:
+            # Бронь удалена (get_booking - NotFoundError) или изменена после чтения
+            raise BookingConflictError(self.get_booking(booking_id))
+        return result[0]
+
+    def bulk_set_status(self, property_id: int, booking_ids: list, status: str) -> list:
+        # Смена статуса выбранных броней одной командой; пересечение активных броней
+        # отклоняет всю операцию (BookingOverlapError)
+        if status not in BOOKING_STATUSES:
+            raise ValidationError(f"Недопустимый статус: {status}")
+        with self.db.transaction():
+            return self.db.execute_prepared(
+                'bookings_set_status', (status, list(booking_ids), property_id), fetch=True
+            )
+
+    def bulk_cancel(self, property_id: int, booking_ids: list) -> list:
+        return self.bulk_set_status(property_id, booking_ids, CANCELLED_STATUS)
+
+    def bulk_shift_dates(self, property_id: int, booking_ids: list, days: int) -> list:
+        # Сдвиг периодов выбранных броней на days дней (назад - отрицательное число).
+        # Ограничение на пересечение проверяется при фиксации: промежуточные пересечения
+        # соседних броней во время построчного обновления не считаются ошибкой
+        if not days or abs(days) > MAX_SHIFT_DAYS:
+            raise ValidationError(f"Сдвиг должен быть от 1 до {MAX_SHIFT_DAYS} дней в любую сторону")
+        with self.db.transaction():
+            self.db.execute_query("SET CONSTRAINTS booking_active_no_overlap DEFERRED")
+            return self.db.execute_prepared(
+                'bookings_shift_dates', (days, list(booking_ids), property_id), fetch=True
+            )
+
+    def bulk_delete(self, property_id: int, booking_ids: list) -> list:
+        with self.db.transaction():
+            return self.db.execute_prepared('bookings_delete', (list(booking_ids), property_id), fetch=True)
+
+    def delete_booking(self, booking_id: int) -> dict:
+        # Возвращает удаленную бронь (нужна, например, для обновления индекса занятости)
+        result = self.db.execute_prepared('booking_delete', (booking_id,), fetch=True)
+        if not result:
+            raise NotFoundError("Бронь не найдена")
+        return result[0]
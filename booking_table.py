@@ -0,0 +1,160 @@
+import bisect
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+# Столбцы таблицы броней: (поле строки, заголовок); поля совпадают с BOOKING_SORT_COLUMNS в database.py
+BOOKING_COLUMNS = [
+    ('booking_id', "ID"),
+    ('user_email', "Email"),
+    ('start_date', "Начало"),
+    ('end_date', "Конец"),
+    ('status', "Статус"),
+    ('created_at', "Дата создания"),
+]
+DEFAULT_SORT_COLUMN = 2
+DEFAULT_SORT_ORDER = Qt.SortOrder.DescendingOrder
+
+
+class BookingTableModel(QAbstractTableModel):
+    # Брони объекта, загружаемые страницами по мере прокрутки; сортирует сервер (ORDER BY по индексу),
+    # модель только запоминает столбец и направление и просит окно перезапросить данные
+    sortRequested = pyqtSignal()
+    BookingRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bookings = []
+        self.sort_column = DEFAULT_SORT_COLUMN
+        self.sort_order = DEFAULT_SORT_ORDER
+        self.fetch_page = None
+        self.page_after = None
+        self.page_size = 0
+        self.has_more = False
+        self.loading = False
+        self.generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.bookings)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(BOOKING_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return BOOKING_COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.bookings):
+            return None
+        booking = self.bookings[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            field = BOOKING_COLUMNS[index.column()][0]
+            value = booking[field]
+            if field in ('start_date', 'end_date'):
+                return value.strftime("%d.%m.%Y")
+            if field == 'created_at':
+                return value.strftime("%d.%m.%Y %H:%M")
+            return str(value)
+        if role == self.BookingRole:
+            return booking
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # Вызывается представлением при щелчке по заголовку
+        if column < 0:
+            column, order = DEFAULT_SORT_COLUMN, DEFAULT_SORT_ORDER
+        self.sort_column = column
+        self.sort_order = order
+        self.sortRequested.emit()
+
+    def sort_field(self) -> str:
+        return BOOKING_COLUMNS[self.sort_column][0]
+
+    def is_descending(self) -> bool:
+        return self.sort_order == Qt.SortOrder.DescendingOrder
+
+    def page_key(self, booking) -> tuple:
+        # Ключ keyset-пагинации: значение столбца сортировки и booking_id для однозначного порядка.
+        # Текстовые столбцы сервер сортирует в COLLATE "C", поэтому сравнение ключей в Python
+        # совпадает с порядком страниц при любой сортировке базы
+        return (booking[self.sort_field()], booking['booking_id'])
+
+    def set_fetcher(self, fetch_page, page_size):
+        # fetch_page(after, generation) запрашивает следующую страницу в фоне и передает ее в append_page
+        self.beginResetModel()
+        self.bookings = []
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.page_after = None
+        self.has_more = True
+        self.loading = False
+        self.generation += 1
+        self.endResetModel()
+        self.fetchMore()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetch_page is not None and self.has_more and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self.loading = True
+        self.fetch_page(self.page_after, self.generation)
+
+    def append_page(self, rows: list, generation: int):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.has_more = len(rows) >= self.page_size
+        if not rows:
+            return
+        first = len(self.bookings)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.bookings.extend(rows)
+        self.endInsertRows()
+        self.page_after = self.page_key(rows[-1])
+
+    def page_failed(self, generation: int):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.has_more = False
+
+    def booking_at(self, row: int):
+        if 0 <= row < len(self.bookings):
+            return self.bookings[row]
+        return None
+
+    def row_of(self, booking_id):
+        for row, booking in enumerate(self.bookings):
+            if booking['booking_id'] == booking_id:
+                return row
+        return None
+
+    def remove_booking(self, booking_id):
+        row = self.row_of(booking_id)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.bookings[row]
+            self.endRemoveRows()
+
+    def put_booking(self, booking):
+        # Добавленная или измененная бронь ставится на свое место в порядке сортировки
+        # без перезагрузки; за пределами загруженной части она придет со следующей страницей
+        self.remove_booking(booking['booking_id'])
+        key = self.page_key(booking)
+        descending = self.is_descending()
+        if self.has_more and (self.page_after is None or (key < self.page_after if descending else key > self.page_after)):
+            return
+        keys = [self.page_key(b) for b in self.bookings]
+        if descending:
+            position = len(keys) - bisect.bisect_right(keys[::-1], key)
+        else:
+            position = bisect.bisect_left(keys, key)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.bookings.insert(position, booking)
+        self.endInsertRows()
@@ -0,0 +1,223 @@
+import os
+import csv
+import datetime
+import tempfile
+
+from booking_service import BOOKING_STATUSES, ACTIVE_STATUS, validate_email
+
+# Разделитель удобств в колонке amenities
+AMENITY_SEPARATOR = ";"
+# Объем промежуточного буфера COPY в памяти; больший объем сбрасывается во временный файл
+STAGE_BUFFER_SIZE = 8 * 1024 * 1024
+# Наибольшее значение integer PostgreSQL (price_per_night)
+INT4_MAX = 2 ** 31 - 1
+# Брони ссылаются на объекты по ref из того же импорта, поэтому без файла объектов не импортируются
+BOOKINGS_WITHOUT_PROPERTIES = "Брони импортируются только вместе с файлом объектов: property_ref ссылается на его ref"
+
+# Колонки CSV-файлов: ref - идентификатор объекта внутри импорта, на него ссылаются брони
+PROPERTY_COLUMNS = ("ref", "title", "description", "address", "price_per_night", "property_type", "amenities")
+BOOKING_COLUMNS = ("property_ref", "user_email", "start_date", "end_date", "status")
+
+class ImportReport:
+    def __init__(self):
+        self.property_ids = []
+        self.bookings_imported = 0
+        # (файл, номер строки, описание ошибки)
+        self.errors = []
+
+    def add_error(self, file_name, line, message):
+        self.errors.append((file_name, line, message))
+
+    def summary(self) -> str:
+        lines = [
+            f"Импортировано объектов: {len(self.property_ids)}",
+            f"Импортировано броней: {self.bookings_imported}",
+            f"Отклонено строк: {len(self.errors)}",
+        ]
+        lines += [f"{file_name}, строка {line}: {message}" for file_name, line, message in self.errors]
+        return "\n".join(lines)
+
+
+class BulkImporter:
+    # Массовый импорт объектов и броней из CSV. Строки проверяются по мере чтения файла,
+    # корректные пишутся в буфер и одним COPY FROM STDIN загружаются во временные таблицы,
+    # откуда переносятся в рабочие таблицы set-операциями в одной транзакции.
+    # Ошибочные строки попадают в отчет и не прерывают импорт остальных
+    def __init__(self, db):
+        self.db = db
+
+    def run(self, properties_path=None, bookings_path=None) -> ImportReport:
+        if bookings_path and not properties_path:
+            raise ValueError(BOOKINGS_WITHOUT_PROPERTIES)
+        report = ImportReport()
+        categories = set(self.db.get_property_categories())
+        amenities = set(self.db.get_amenities())
+        refs = set()
+        with tempfile.SpooledTemporaryFile(STAGE_BUFFER_SIZE, mode="w+", encoding="utf-8", newline="") as properties_buffer, \
+             tempfile.SpooledTemporaryFile(STAGE_BUFFER_SIZE, mode="w+", encoding="utf-8", newline="") as bookings_buffer:
+            if properties_path:
+                self.stage_file(properties_path, PROPERTY_COLUMNS, properties_buffer, report,
+                                lambda row: self.property_record(row, refs, categories, amenities))
+            if bookings_path:
+                self.stage_file(bookings_path, BOOKING_COLUMNS, bookings_buffer, report,
+                                lambda row: self.booking_record(row, refs))
+            properties_buffer.seek(0)
+            bookings_buffer.seek(0)
+            self.merge(properties_buffer, bookings_buffer, bookings_path, report)
+        return report
+
+    def stage_file(self, path, columns, buffer, report, make_record):
+        # Потоковая проверка: в памяти только текущая строка, корректные строки - в буфер COPY
+        file_name = os.path.basename(path)
+        writer = csv.writer(buffer)
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            reader = csv.DictReader(file)
+            missing = [column for column in columns if column not in (reader.fieldnames or [])
+                       and column not in ("description", "amenities", "status")]
+            if missing:
+                raise ValueError(f"{file_name}: нет колонок {', '.join(missing)}")
+            for row in reader:
+                try:
+                    record = make_record({key: (value or "").strip() for key, value in row.items() if key})
+                except ValueError as e:
+                    report.add_error(file_name, reader.line_num, str(e))
+                    continue
+                writer.writerow((reader.line_num,) + record)
+
+    def property_record(self, row, refs, categories, amenities) -> tuple:
+        ref = row["ref"]
+        if not ref:
+            raise ValueError("не указан ref")
+        if ref in refs:
+            raise ValueError(f"повторяющийся ref {ref}")
+        title = row["title"]
+        if not title or len(title) > 100:
+            raise ValueError("название пустое или длиннее 100 символов")
+        address = row["address"]
+        if not address or len(address) > 200:
+            raise ValueError("адрес пустой или длиннее 200 символов")
+        try:
+            price = int(row["price_per_night"])
+        except ValueError:
+            raise ValueError(f"некорректная цена {row['price_per_night']!r}") from None
+        if price < 0:
+            raise ValueError("отрицательная цена")
+        # Значение вне integer прервало бы COPY всего файла - отклоняется только строка
+        if price > INT4_MAX:
+            raise ValueError(f"цена больше {INT4_MAX}")
+        if row["property_type"] not in categories:
+            raise ValueError(f"неизвестный тип размещения {row['property_type']!r}")
+        names = [name.strip() for name in row.get("amenities", "").split(AMENITY_SEPARATOR) if name.strip()]
+        unknown = [name for name in names if name not in amenities]
+        if unknown:
+            raise ValueError(f"неизвестные удобства: {', '.join(unknown)}")
+        refs.add(ref)
+        return (ref, title, row.get("description", ""), address, price, row["property_type"],
+                AMENITY_SEPARATOR.join(dict.fromkeys(names)))
+
+    def booking_record(self, row, refs) -> tuple:
+        if row["property_ref"] not in refs:
+            raise ValueError(f"объект {row['property_ref']!r} отсутствует среди импортированных")
+        email = row["user_email"]
+        if not validate_email(email):
+            raise ValueError(f"некорректный email {email!r}")
+        try:
+            start_date = datetime.date.fromisoformat(row["start_date"])
+            end_date = datetime.date.fromisoformat(row["end_date"])
+        except ValueError:
+            raise ValueError("даты должны быть в формате ГГГГ-ММ-ДД") from None
+        if end_date <= start_date:
+            raise ValueError("дата окончания не позже даты начала")
+        status = row.get("status") or ACTIVE_STATUS
+        if status not in BOOKING_STATUSES:
+            raise ValueError(f"неизвестный статус {status!r}")
+        return (row["property_ref"], email, start_date.isoformat(), end_date.isoformat(), status)
+
+    def merge(self, properties_buffer, bookings_buffer, bookings_path, report):
+        # Все шаги - одна транзакция: ошибка на любом из них отменяет импорт целиком
+        with self.db.transaction() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE import_property (
+                        line            integer,
+                        ref             text,
+                        title           varchar(100),
+                        description     text,
+                        address         varchar(200),
+                        price_per_night integer,
+                        property_type   property_category,
+                        amenities       text,
+                        property_id     integer
+                    ) ON COMMIT DROP
+                """)
+                cursor.copy_expert("""
+                    COPY import_property (line, ref, title, description, address, price_per_night, property_type, amenities)
+                    FROM STDIN WITH (FORMAT csv)
+                """, properties_buffer)
+                # Идентификаторы выделяются заранее, чтобы связать ref с property_id для удобств и броней
+                cursor.execute("""
+                    UPDATE import_property
+                    SET property_id = nextval(pg_get_serial_sequence('property', 'property_id'))
+                """)
+                cursor.execute("""
+                    INSERT INTO property (property_id, title, description, address, price_per_night, property_type)
+                    SELECT property_id, title, COALESCE(description, ''), address, price_per_night, property_type
+                    FROM import_property
+                    ORDER BY line
+                    RETURNING property_id
+                """)
+                report.property_ids = [row[0] for row in cursor.fetchall()]
+                # Названия удобств сопоставляются со справочником одним соединением
+                cursor.execute("""
+                    INSERT INTO property_amenity (property_id, amenity_id)
+                    SELECT DISTINCT ip.property_id, a.amenity_id
+                    FROM import_property ip
+                    CROSS JOIN LATERAL unnest(string_to_array(ip.amenities, %s)) AS n(name)
+                    JOIN amenity a ON a.name = n.name
+                """, (AMENITY_SEPARATOR,))
+
+                if bookings_path:
+                    self.merge_bookings(cursor, bookings_buffer, os.path.basename(bookings_path), report)
+
+    def merge_bookings(self, cursor, bookings_buffer, file_name, report):
+        cursor.execute("""
+            CREATE TEMP TABLE import_booking (
+                line         integer,
+                property_ref text,
+                user_email   varchar(50),
+                start_date   date,
+                end_date     date,
+                status       varchar(20)
+            ) ON COMMIT DROP
+        """)
+        cursor.copy_expert("""
+            COPY import_booking (line, property_ref, user_email, start_date, end_date, status)
+            FROM STDIN WITH (FORMAT csv)
+        """, bookings_buffer)
+        # Объекты новые, поэтому конфликтовать активные брони могут только между собой:
+        # такие строки отклоняются заранее, а не обрывают транзакцию ограничением booking_active_no_overlap
+        cursor.execute("""
+            SELECT b.line, min(o.line)
+            FROM import_booking b
+            JOIN import_booking o
+              ON o.property_ref = b.property_ref
+             AND o.line < b.line
+             AND o.status = %(active)s
+             AND daterange(o.start_date, o.end_date) && daterange(b.start_date, b.end_date)
+            WHERE b.status = %(active)s
+            GROUP BY b.line
+            ORDER BY b.line
+        """, {'active': ACTIVE_STATUS})
+        overlapping = cursor.fetchall()
+        for line, other_line in overlapping:
+            report.add_error(file_name, line, f"период пересекается с активной бронью в строке {other_line}")
+        if overlapping:
+            cursor.execute("DELETE FROM import_booking WHERE line = ANY(%s)", ([line for line, _ in overlapping],))
+        cursor.execute("""
+            INSERT INTO booking (property_id, user_email, start_date, end_date, status)
+            SELECT ip.property_id, b.user_email, b.start_date, b.end_date, b.status
+            FROM import_booking b
+            JOIN import_property ip ON ip.ref = b.property_ref
+            ORDER BY b.line
+        """)
+        report.bookings_imported = cursor.rowcount
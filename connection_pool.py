@@ -0,0 +1,110 @@
+import time
+import threading
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2 import extensions
+
+class ConnectionPool:
+    def __init__(self, config: dict, minconn: int = 1, maxconn: int = 10, connect_timeout: int = 5,
+                 retries: int = 3, backoff: float = 0.5, health_check_interval: float = 30.0,
+                 acquire_timeout: float = 30.0, connection_factory=None):
+        self.config = dict(config)
+        self.maxconn = maxconn
+        self.retries = retries
+        self.backoff = backoff
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        # ThreadedConnectionPool не ждет освобождения соединения, а сразу бросает PoolError,
+        # поэтому число одновременно выданных соединений ограничивается семафором
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        self._lock = threading.Lock()
+        connect_kwargs = dict(self.config, connect_timeout=connect_timeout)
+        if connection_factory is not None:
+            connect_kwargs['connection_factory'] = connection_factory
+        self._pool = self._with_retries(
+            lambda: pg_pool.ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+        )
+
+    def _with_retries(self, action):
+        # Ограниченное число попыток с экспоненциальной задержкой между ними
+        for attempt in range(self.retries):
+            try:
+                return action()
+            except psycopg2.OperationalError as e:
+                if attempt == self.retries - 1:
+                    raise
+                print(f"Ошибка подключения (попытка {attempt + 1} из {self.retries}): {e}")
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def _is_alive(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        # Долго простаивавшее соединение мог закрыть сервер - проверяем его запросом
+        with self._lock:
+            idle_since = self._last_used.get(id(conn))
+        if idle_since is None or time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise pg_pool.PoolError("Превышено время ожидания свободного соединения")
+        try:
+            for _ in range(self.retries):
+                conn = self._with_retries(self._pool.getconn)
+                if self._is_alive(conn):
+                    return conn
+                self._discard(conn)
+            raise psycopg2.OperationalError("Не удалось получить рабочее соединение с базой данных")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close: bool = False):
+        try:
+            if close or conn.closed:
+                self._discard(conn)
+            else:
+                with self._lock:
+                    self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+        try:
+            self._pool.putconn(conn, close=True)
+        except pg_pool.PoolError:
+            pass
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except BaseException:
+            # Откатываем незавершенную транзакцию; если соединение оборвано - выбрасываем его
+            try:
+                if not conn.closed:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken or conn.closed)
+
+    def close(self):
+        self._pool.closeall()
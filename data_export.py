@@ -0,0 +1,146 @@
+import os
+from psycopg2 import extensions
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from bulk_import import AMENITY_SEPARATOR
+
+# Число строк в группе строк Parquet (и в порции, забираемой серверным курсором)
+ROW_GROUP_SIZE = 50000
+# Прогресс сообщается не чаще, чем раз в указанное число строк
+PROGRESS_STEP = 5000
+
+EXPORT_PROPERTIES = "properties"
+EXPORT_BOOKINGS = "bookings"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+
+# Выгрузки отбирают объекты по тем же фильтрам, что и список главного окна
+EXPORT_QUERIES = {
+    # Порядок объектов - как в списке главного окна, по индексу (title COLLATE "C", property_id)
+    EXPORT_PROPERTIES: """
+        SELECT property_id, title, description, address, price_per_night, property_type, {amenities} AS amenities
+        FROM get_filtered_properties(%s, %s, %s, %s, %s, %s)
+        ORDER BY title COLLATE "C", property_id
+    """,
+    EXPORT_BOOKINGS: """
+        SELECT b.booking_id, b.property_id, p.title, b.user_email, b.start_date, b.end_date, b.status, b.created_at
+        FROM booking b
+        JOIN get_filtered_properties(%s, %s, %s, %s, %s, %s) p ON p.property_id = b.property_id
+        ORDER BY b.property_id, b.start_date
+    """,
+}
+
+EXPORT_COUNT_QUERIES = {
+    EXPORT_PROPERTIES: "SELECT count(*) AS total FROM get_filtered_properties(%s, %s, %s, %s, %s, %s)",
+    EXPORT_BOOKINGS: """
+        SELECT count(*) AS total
+        FROM booking b
+        JOIN get_filtered_properties(%s, %s, %s, %s, %s, %s) p ON p.property_id = b.property_id
+    """,
+}
+
+class CopyProgress:
+    # Файл-обертка для COPY TO: psycopg2 пишет каждую строку результата (в байтах) отдельным вызовом write
+    def __init__(self, file, total, progress):
+        self.file = file
+        self.total = total
+        self.progress = progress
+        self.rows = -1  # первая запись - заголовок
+
+    def write(self, data):
+        self.file.write(data)
+        self.rows += 1
+        if self.progress is not None and self.rows % PROGRESS_STEP == 0:
+            self.progress(self.rows, self.total)
+
+
+class DataExporter:
+    # Потоковая выгрузка: CSV формирует сервер (COPY ... TO STDOUT) прямо в файл,
+    # Parquet пишется группами строк из серверного курсора. В памяти - не больше одной группы
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def is_parquet_supported() -> bool:
+        return pa is not None
+
+    def export(self, dataset: str, file_format: str, path: str, filters: dict = None, progress=None) -> int:
+        # progress(выгружено, всего) вызывается из потока выгрузки; возвращает число строк
+        params = self.db.property_filter_params(**(filters or {}))
+        total = self.count(dataset, params)
+        try:
+            if file_format == FORMAT_PARQUET:
+                rows = self.export_parquet(dataset, path, params, total, progress)
+            else:
+                rows = self.export_csv(dataset, path, params, total, progress)
+        except BaseException:
+            # Недописанный файл не оставляем
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        if progress is not None:
+            progress(rows, total)
+        return rows
+
+    def count(self, dataset, params) -> int:
+        return self.db.execute_query(EXPORT_COUNT_QUERIES[dataset], params, fetch=True)[0]['total']
+
+    def export_csv(self, dataset, path, params, total, progress) -> int:
+        query = EXPORT_QUERIES[dataset].format(amenities=f"array_to_string(amenities, '{AMENITY_SEPARATOR}')")
+        with self.db.transaction() as connection:
+            with connection.cursor() as cursor:
+                # COPY не принимает параметры запроса - подставляем их на клиенте с экранированием
+                copy_query = "COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER, ENCODING 'UTF8')".format(
+                    cursor.mogrify(query, params).decode(extensions.encodings[connection.encoding])
+                )
+                with open(path, "wb") as file:
+                    writer = CopyProgress(file, total, progress)
+                    cursor.copy_expert(copy_query, writer)
+        return max(writer.rows, 0)
+
+    def export_parquet(self, dataset, path, params, total, progress) -> int:
+        query = EXPORT_QUERIES[dataset].format(amenities="amenities")
+        schema = self.parquet_schema(dataset)
+        rows = 0
+        batch = []
+        with pq.ParquetWriter(path, schema) as writer:
+            for row in self.db.stream_query(query, params, itersize=ROW_GROUP_SIZE):
+                batch.append(row)
+                if len(batch) == ROW_GROUP_SIZE:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    rows += len(batch)
+                    batch = []
+                    if progress is not None:
+                        progress(rows, total)
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                rows += len(batch)
+        return rows
+
+    @staticmethod
+    def parquet_schema(dataset):
+        if dataset == EXPORT_PROPERTIES:
+            return pa.schema([
+                ("property_id", pa.int32()),
+                ("title", pa.string()),
+                ("description", pa.string()),
+                ("address", pa.string()),
+                ("price_per_night", pa.int32()),
+                ("property_type", pa.string()),
+                ("amenities", pa.list_(pa.string())),
+            ])
+        return pa.schema([
+            ("booking_id", pa.int32()),
+            ("property_id", pa.int32()),
+            ("title", pa.string()),
+            ("user_email", pa.string()),
+            ("start_date", pa.date32()),
+            ("end_date", pa.date32()),
+            ("status", pa.string()),
+            ("created_at", pa.timestamp("us")),
+        ])
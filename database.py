@@ -1,9 +1,83 @@
+import os
+import sys
+import time
+import uuid
+import threading
+from contextlib import contextmanager
 import psycopg2
-from typing import Optional, Dict, List
+from psycopg2 import sql, errors
+from typing import Optional, Dict, List, Iterator
+
+from connection_pool import ConnectionPool
+from reference_cache import reference_cache
+from prepared_statements import PREPARED_STATEMENTS, BOOKING_VERSION, StatementConnection
+from query_metrics import query_metrics, fingerprint, result_size
+
+# Размер страницы при постраничной загрузке списка недвижимости
+PROPERTY_PAGE_SIZE = 50
+# Размер страницы таблицы броней объекта
+BOOKING_PAGE_SIZE = 100
+# Столбцы, по которым сортируется таблица броней; для каждого есть индекс (property_id, столбец, booking_id)
+BOOKING_SORT_COLUMNS = ('booking_id', 'user_email', 'start_date', 'end_date', 'status', 'created_at')
+# Текстовые столбцы сортируются в COLLATE "C" - в порядке сравнения строк Python,
+# по которому BookingTableModel ставит измененные брони на место
+BOOKING_TEXT_SORT_COLUMNS = ('user_email', 'status')
+# Количество строк, забираемых с сервера за один запрос при потоковом чтении
+STREAM_ITERSIZE = 2000
+# Параметры пула соединений
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+CONNECT_TIMEOUT = 5
+CONNECT_RETRIES = 3
+# Каталог миграций схемы: файлы NNNN_описание.sql применяются по порядку номеров
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# Ключ advisory-блокировки, исключающей одновременный запуск миграций
+MIGRATION_LOCK_ID = 4815162342
+
+class DatabaseError(Exception):
+    # Ошибка выполнения запроса; исходная ошибка psycopg2 доступна в __cause__
+    pass
+
+
+class ConnectionLostError(DatabaseError):
+    # Соединение с сервером потеряно или недоступно
+    pass
+
+
+class QueryCancelledError(DatabaseError):
+    # Запрос прерван (отмена фоновой задачи или statement_timeout)
+    pass
+
+
+class IntegrityViolationError(DatabaseError):
+    # Нарушено ограничение целостности: уникальность, внешний ключ, CHECK
+    pass
+
+
+class BookingOverlapError(IntegrityViolationError):
+    # Активная бронь пересекается с другой активной бронью того же объекта
+    pass
+
+
+def translate_error(error: psycopg2.Error) -> DatabaseError:
+    # Ошибка psycopg2 -> типизированное исключение приложения
+    if isinstance(error, errors.ExclusionViolation):
+        return BookingOverlapError(str(error))
+    if isinstance(error, psycopg2.IntegrityError):
+        return IntegrityViolationError(str(error))
+    if isinstance(error, errors.QueryCanceled):
+        return QueryCancelledError(str(error))
+    if isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+        return ConnectionLostError(str(error))
+    return DatabaseError(str(error))
+
 
 class DatabaseManager:
-    def __init__(self):
-        self.connection = None
+    def __init__(self, max_connections: int = POOL_MAX_SIZE):
+        self.pool = None
+        self.max_connections = max_connections
+        # Соединения, закрепленные за потоками (фоновые задачи)
+        self._local = threading.local()
         self.set_default_bg()
 
     def set_default_bg(self):
@@ -14,12 +88,13 @@ class DatabaseManager:
             "port": "5432",
             "database": "SmartBooking"
         }
-        self.connect()
+        return self.connect()
 
     def get_config(self):
         return self.config
     
     def set_config(self, user_bd, pass_bd, host_bd, port_bd, database):
+        previous_config = self.config
         self.config = {
             "user": user_bd,
             "password": pass_bd,
@@ -27,48 +102,323 @@ class DatabaseManager:
             "port": port_bd,
             "database": database
         }
-        return self.connect()
+        if self.connect():
+            return True
+        # Пул остался прежним - возвращаем соответствующие ему параметры
+        self.config = previous_config
+        return False
     
     def connect(self) -> bool:
-        # Установка соединения с базой данных
+        # Создание пула соединений; при ошибке текущий пул продолжает работать
         try:
-            self.connection = psycopg2.connect(**self.config)
-            return True
+            new_pool = ConnectionPool(
+                self.config,
+                minconn=POOL_MIN_SIZE,
+                maxconn=self.max_connections,
+                connect_timeout=CONNECT_TIMEOUT,
+                retries=CONNECT_RETRIES,
+                connection_factory=StatementConnection,
+            )
         except psycopg2.Error as e:
             print(f"Ошибка подключения: {e}")
-            self.set_default_bg()
             return False
-    
+        old_pool, self.pool = self.pool, new_pool
+        if old_pool:
+            old_pool.close()
+        # Справочники новой базы могут отличаться
+        self.invalidate_reference_data()
+        return True
+
+    def is_connected(self) -> bool:
+        return self.pool is not None
+
+    @contextmanager
+    def bind_connection(self):
+        # Закрепление соединения пула за текущим потоком: все запросы потока идут через него
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            yield bound
+            return
+        with self.pool.connection() as connection:
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+
+    @contextmanager
+    def connection_scope(self):
+        # Закрепленное за потоком соединение или временно взятое из пула
+        bound = getattr(self._local, 'connection', None)
+        if bound is not None:
+            try:
+                yield bound
+            except BaseException:
+                # Внутри transaction() откат выполняет сама транзакция (или ее точка сохранения)
+                if not self.in_transaction():
+                    self._rollback(bound)
+                raise
+            return
+        with self.pool.connection() as connection:
+            yield connection
+
+    @contextmanager
+    def query_label(self, label: str):
+        # Источник запросов потока для статистики (экран, канал фоновой задачи)
+        previous = getattr(self._local, 'label', None)
+        self._local.label = label
+        try:
+            yield
+        finally:
+            self._local.label = previous
+
+    def _caller_label(self) -> str:
+        label = getattr(self._local, 'label', None)
+        if label:
+            return label
+        # Без явной метки - первая функция стека вне этого модуля
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        if frame is None:
+            return "?"
+        return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+
+    def _record(self, query_fingerprint, started, rows=None, failed=False):
+        rows = rows or []
+        query_metrics.record(
+            self._caller_label(), query_fingerprint, time.perf_counter() - started,
+            len(rows), result_size(rows), failed
+        )
+
+    def in_transaction(self) -> bool:
+        return getattr(self._local, 'transaction_depth', 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        # Единица работы: все запросы блока выполняются в одной транзакции и фиксируются
+        # один раз при выходе; исключение откатывает блок целиком. Вложенный блок - точка
+        # сохранения: ошибка в нем откатывает только его, внешняя транзакция продолжается
+        with self.bind_connection() as connection:
+            depth = getattr(self._local, 'transaction_depth', 0)
+            self._local.transaction_depth = depth + 1
+            try:
+                if depth == 0:
+                    try:
+                        yield connection
+                        connection.commit()
+                    except BaseException:
+                        self._rollback(connection)
+                        raise
+                else:
+                    savepoint = sql.Identifier(f"savepoint_{depth}")
+                    self._run(connection, sql.SQL("SAVEPOINT {}").format(savepoint))
+                    try:
+                        yield connection
+                    except BaseException:
+                        self._run(connection, sql.SQL("ROLLBACK TO SAVEPOINT {}").format(savepoint))
+                        raise
+                    self._run(connection, sql.SQL("RELEASE SAVEPOINT {}").format(savepoint))
+            except psycopg2.Error as e:
+                raise translate_error(e) from e
+            finally:
+                self._local.transaction_depth = depth
+
+    @staticmethod
+    def _run(connection, statement):
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+
+    def _commit(self, connection):
+        # Вне transaction() каждый запрос фиксируется сразу
+        if not self.in_transaction():
+            connection.commit()
+
+    @staticmethod
+    def _rollback(connection):
+        try:
+            if not connection.closed:
+                connection.rollback()
+        except psycopg2.Error:
+            pass
+
     def execute_query(self, query: str, params: tuple = None, fetch: bool = False) -> Optional[List[Dict]]:
-        # Универсальный метод для выполнения запросов
+        # Универсальный метод для выполнения запросов; ошибки - исключения DatabaseError
+        started = time.perf_counter()
+        query_fingerprint = fingerprint(query) if isinstance(query, str) else None
         try:
-            with self.connection.cursor() as cursor:
-                #print("Параметры:", params)
-                cursor.execute(query, params)
-                if fetch:
-                    columns = [desc[0] for desc in cursor.description]
-                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
-                self.connection.commit()
-                return None
+            with self.connection_scope() as connection:
+                if query_fingerprint is None:
+                    # Составной запрос (psycopg2.sql) - отпечаток по его итоговому тексту
+                    query_fingerprint = fingerprint(query.as_string(connection))
+                result = None
+                with connection.cursor() as cursor:
+                    cursor.execute(query, params)
+                    if fetch:
+                        columns = [desc[0] for desc in cursor.description]
+                        result = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                # Фиксируем и чтение: соединение возвращается в пул без открытой транзакции,
+                # а INSERT ... RETURNING с fetch=True больше не остается незафиксированным
+                self._commit(connection)
         except psycopg2.Error as e:
-            print(f"Ошибка выполнения запроса: {e}")
-            self.connection.rollback()
-            return None
+            # Без соединения составной запрос не превратить в текст - отпечаток по его описанию
+            self._record(query_fingerprint or repr(query), started, failed=True)
+            raise translate_error(e) from e
+        self._record(query_fingerprint, started, result)
+        return result
     
+    def execute_prepared(self, name: str, params: tuple = (), fetch: bool = False) -> Optional[List[Dict]]:
+        # Выполнение запроса из реестра PREPARED_STATEMENTS: PREPARE один раз на соединение,
+        # далее только EXECUTE без повторного разбора и планирования на сервере
+        started = time.perf_counter()
+        query_fingerprint = f"EXECUTE {name}"
+        try:
+            with self.connection_scope() as connection:
+                try:
+                    result = self._execute_prepared(connection, name, params, fetch)
+                except errors.InvalidSqlStatementName:
+                    # Подготовленный запрос потерян сервером (например, DISCARD ALL) - готовим заново.
+                    # Внутри transaction() откат прервал бы всю транзакцию, поэтому ошибка пробрасывается,
+                    # а запрос будет подготовлен при следующем вызове
+                    connection.prepared.discard(name)
+                    if self.in_transaction():
+                        raise
+                    connection.rollback()
+                    result = self._execute_prepared(connection, name, params, fetch)
+                self._commit(connection)
+        except psycopg2.Error as e:
+            self._record(query_fingerprint, started, failed=True)
+            raise translate_error(e) from e
+        self._record(query_fingerprint, started, result)
+        return result
+
+    def _execute_prepared(self, connection, name, params, fetch):
+        with connection.cursor() as cursor:
+            if name not in connection.prepared:
+                cursor.execute(
+                    sql.SQL("PREPARE {} AS ").format(sql.Identifier(name)) + sql.SQL(PREPARED_STATEMENTS[name])
+                )
+                connection.prepared.add(name)
+            if params:
+                placeholders = sql.SQL(", ").join(sql.Placeholder() * len(params))
+                statement = sql.SQL("EXECUTE {} ({})").format(sql.Identifier(name), placeholders)
+            else:
+                statement = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+            cursor.execute(statement, params or None)
+            if fetch:
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return None
+
+    def stream_query(self, query: str, params: tuple = None, itersize: int = STREAM_ITERSIZE) -> Iterator[Dict]:
+        # Потоковое чтение через именованный (серверный) курсор: строки забираются
+        # порциями по itersize, в памяти одновременно находится только одна порция.
+        # Соединение занято до конца чтения; при ошибке или досрочном закрытии пул откатывает транзакцию.
+        # В статистику попадает время до конца чтения, включая обработку строк вызывающим
+        started = time.perf_counter()
+        query_fingerprint = fingerprint(query)
+        total_rows = total_bytes = 0
+        try:
+            with self.connection_scope() as connection:
+                with connection.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                    cursor.itersize = itersize
+                    cursor.execute(query, params)
+                    columns = None
+                    while True:
+                        rows = cursor.fetchmany(itersize)
+                        if not rows:
+                            break
+                        if columns is None:
+                            columns = [desc[0] for desc in cursor.description]
+                        batch = [dict(zip(columns, row)) for row in rows]
+                        total_rows += len(batch)
+                        total_bytes += result_size(batch)
+                        yield from batch
+                self._commit(connection)
+        except psycopg2.Error as e:
+            query_metrics.record(self._caller_label(), query_fingerprint, time.perf_counter() - started,
+                                 total_rows, total_bytes, failed=True)
+            raise translate_error(e) from e
+        query_metrics.record(self._caller_label(), query_fingerprint, time.perf_counter() - started,
+                             total_rows, total_bytes)
+
+    def listen(self, channels: list):
+        # Отдельное соединение вне пула для LISTEN: оно держится открытым все время работы
+        try:
+            connection = psycopg2.connect(connect_timeout=CONNECT_TIMEOUT, **self.config)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                for channel in channels:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+            return connection
+        except psycopg2.Error as e:
+            print(f"Ошибка подключения к каналам уведомлений: {e}")
+            return None
+
+    def migrate(self) -> list:
+        # Применение еще не выполненных миграций; каждая - в своей транзакции вместе с отметкой
+        # в schema_migrations. Ошибка прерывает процесс и пробрасывается вызывающему
+        file_names = sorted(name for name in os.listdir(MIGRATIONS_DIR) if name.endswith(".sql"))
+        applied = []
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+                try:
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS schema_migrations (
+                            version    text PRIMARY KEY,
+                            applied_at timestamptz NOT NULL DEFAULT now()
+                        )
+                    """)
+                    cursor.execute("SELECT version FROM schema_migrations")
+                    done = {row[0] for row in cursor.fetchall()}
+                    connection.commit()
+
+                    for file_name in file_names:
+                        version = os.path.splitext(file_name)[0]
+                        if version in done:
+                            continue
+                        with open(os.path.join(MIGRATIONS_DIR, file_name), encoding="utf-8") as file:
+                            cursor.execute(file.read())
+                        cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                        connection.commit()
+                        applied.append(version)
+                except psycopg2.Error:
+                    connection.rollback()
+                    raise
+                finally:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+                    connection.commit()
+        # Миграции могли изменить справочники (например, значения property_category)
+        self.invalidate_reference_data()
+        return applied
+
     def close(self):
-        # Закрытие соединения
-        if self.connection:
-            self.connection.close()
+        # Закрытие всех соединений пула
+        if self.pool:
+            self.pool.close()
+            self.pool = None
     
+    def invalidate_reference_data(self):
+        reference_cache.invalidate()
+
     def get_property_categories(self) -> list:
+        return reference_cache.get('property_categories', self.load_property_categories)
+
+    def load_property_categories(self) -> list:
         query = """
             SELECT enumlabel AS name 
             FROM pg_enum 
             WHERE enumtypid = 'property_category'::regtype
             ORDER BY enumsortorder
         """
-        result = self.execute_query(query, fetch=True)
-        return [row['name'] for row in result] if result else []
+        try:
+            result = self.execute_query(query, fetch=True)
+        except DatabaseError as e:
+            # Пустой справочник не кешируется - загрузка повторится при следующем обращении
+            print(f"Ошибка загрузки категорий: {e}")
+            return []
+        return [row['name'] for row in result]
     
     def get_properties_by_type(self, property_type: str):
         query = "SELECT * FROM property WHERE property_type = %s::property_category"
@@ -88,20 +438,160 @@ class DatabaseManager:
         return [dict(row) for row in result] if result else []
 
     def get_amenities(self) -> list:
-        # Получение списка удобств
-        query = "SELECT name FROM amenity ORDER BY name"
-        result = self.execute_query(query, fetch=True)
-        return [row['name'] for row in result] if result else []
+        # Получение списка удобств (из кеша справочников)
+        return reference_cache.get('amenities', self.load_amenities)
 
-    def get_properties(self, search_query=None, categories=None, amenities=None, has_active_booking=None):
-        query = "SELECT * FROM get_filtered_properties(%s, %s, %s, %s)"
-        return self.execute_query(
-            query,
+    def load_amenities(self) -> list:
+        try:
+            result = self.execute_prepared('amenity_names', fetch=True)
+        except DatabaseError as e:
+            print(f"Ошибка загрузки удобств: {e}")
+            return []
+        return [row['name'] for row in result]
+
+    def add_amenity(self, name: str):
+        with self.transaction():
+            self.execute_query("INSERT INTO amenity (name) VALUES (%s)", (name,))
+        # Кеш сбрасывается только после успешной фиксации
+        self.invalidate_reference_data()
+
+    def rename_amenity(self, old_name: str, new_name: str):
+        with self.transaction():
+            self.execute_query("UPDATE amenity SET name = %s WHERE name = %s", (new_name, old_name))
+        self.invalidate_reference_data()
+
+    def remove_amenity(self, name: str):
+        with self.transaction():
+            self.execute_query("DELETE FROM amenity WHERE name = %s", (name,))
+        self.invalidate_reference_data()
+
+    def upsert_property(self, property_id, data: dict):
+        # Добавление (property_id=None) или изменение объекта с удобствами одним вызовом
+        # upsert_property_with_amenities: один запрос и одна фиксация транзакции
+        result = self.execute_prepared(
+            'property_upsert',
             (
-                search_query,
-                categories or [],
-                amenities or [],
-                has_active_booking
+                property_id,
+                data['title'],
+                data['description'],
+                data['address'],
+                data['price'],
+                data['property_type'],
+                list(data['amenities']),
             ),
             fetch=True
-        )
\ No newline at end of file
+        )
+        return result[0]['property_id'] if result else None
+
+    def get_properties(self, search_query=None, categories=None, amenities=None, has_active_booking=None,
+                       available_from=None, available_to=None):
+        query = "SELECT * FROM get_filtered_properties(%s, %s, %s, %s, %s, %s)"
+        return self.execute_query(
+            query,
+            self.property_filter_params(search_query, categories, amenities, has_active_booking,
+                                        available_from, available_to),
+            fetch=True
+        )
+
+    @staticmethod
+    def property_filter_params(search_query=None, categories=None, amenities=None, has_active_booking=None,
+                               available_from=None, available_to=None) -> tuple:
+        # Параметры get_filtered_properties; available_from/available_to - объект свободен
+        # в период [available_from, available_to)
+        return (search_query, categories or [], amenities or [], has_active_booking, available_from, available_to)
+
+    def get_properties_page(self, after=None, limit=PROPERTY_PAGE_SIZE, **filters):
+        # Keyset-пагинация: after - ключ (title, property_id) последней загруженной строки
+        params = self.property_filter_params(**filters)
+        if after is None:
+            return self.execute_prepared('properties_first_page', params + (limit,), fetch=True)
+        return self.execute_prepared('properties_next_page', params + tuple(after) + (limit,), fetch=True)
+
+    def get_properties_by_ids(self, property_ids: list, **filters):
+        # Строки указанных объектов, прошедшие текущие фильтры (для точечного обновления списка)
+        return self.execute_prepared(
+            'properties_by_ids',
+            self.property_filter_params(**filters) + (list(property_ids),),
+            fetch=True
+        )
+
+    @staticmethod
+    def property_page_key(row: Dict) -> tuple:
+        # Строки Python сравниваются по кодам символов - так же, как title COLLATE "C" на сервере
+        return (row['title'], row['property_id'])
+
+    @staticmethod
+    def booking_filter_conditions(statuses=None, window_from=None, window_to=None, email_prefix=None) -> tuple:
+        # Условия фильтров таблицы броней и их параметры:
+        # statuses - список статусов, [window_from, window_to) - бронь пересекается с окном дат,
+        # email_prefix - начало email без учета регистра (индексы из migrations/0006_booking_filters.sql)
+        conditions = []
+        params = ()
+        if statuses is not None:
+            conditions.append(sql.SQL("status = ANY(%s)"))
+            params += (list(statuses),)
+        if window_from is not None or window_to is not None:
+            conditions.append(sql.SQL("stay && daterange(%s, %s, '[)')"))
+            params += (window_from, window_to)
+        if email_prefix:
+            escaped = email_prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(sql.SQL("lower(user_email) LIKE %s"))
+            params += (escaped + "%",)
+        return conditions, params
+
+    def get_bookings_in_window(self, property_ids: list, window_from=None, window_to=None) -> list:
+        # Брони объектов, пересекающиеся с окном [window_from, window_to) (None - без границы),
+        # для календаря; отбор по GiST-индексу (property_id, stay)
+        return self.execute_query(f"""
+            SELECT booking_id, property_id, user_email, start_date, end_date, status, {BOOKING_VERSION}
+            FROM booking
+            WHERE property_id = ANY(%s) AND stay && daterange(%s, %s, '[)')
+        """, (list(property_ids), window_from, window_to), fetch=True)
+
+    def count_bookings_by_status(self, property_id: int, window_from=None, window_to=None, email_prefix=None) -> dict:
+        # Число броней объекта по статусам одним агрегирующим запросом (с учетом окна дат и email,
+        # без фильтра по статусу - счетчики показываются у флажков статусов)
+        conditions, params = self.booking_filter_conditions(None, window_from, window_to, email_prefix)
+        query = sql.SQL("""
+            SELECT status, count(*) AS bookings
+            FROM booking
+            WHERE property_id = %s {}
+            GROUP BY status
+        """).format(sql.SQL("").join(sql.SQL(" AND ") + condition for condition in conditions))
+        rows = self.execute_query(query, (property_id,) + params, fetch=True)
+        return {row['status']: row['bookings'] for row in rows}
+
+    def get_bookings_page(self, property_id: int, sort_column: str = 'start_date', descending: bool = True,
+                          after=None, limit=BOOKING_PAGE_SIZE, statuses=None, window_from=None, window_to=None,
+                          email_prefix=None):
+        # Keyset-пагинация броней объекта в порядке (sort_column, booking_id); after - ключ последней
+        # загруженной строки. ORDER BY и условие по ключу обслуживает индекс (property_id, sort_column, booking_id)
+        if sort_column not in BOOKING_SORT_COLUMNS:
+            raise ValueError(f"Недопустимый столбец сортировки: {sort_column}")
+        column = sql.Identifier(sort_column)
+        if sort_column in BOOKING_TEXT_SORT_COLUMNS:
+            column = sql.SQL('{} COLLATE "C"').format(column)
+        direction = sql.SQL("DESC" if descending else "ASC")
+        if sort_column == 'booking_id':
+            order = sql.SQL("booking_id {}").format(direction)
+            key = sql.SQL("booking_id")
+            after_params = () if after is None else (after[1],)
+            placeholder = sql.SQL("%s")
+        else:
+            order = sql.SQL("{} {}, booking_id {}").format(column, direction, direction)
+            key = sql.SQL("({}, booking_id)").format(column)
+            after_params = () if after is None else tuple(after)
+            placeholder = sql.SQL("(%s, %s)")
+        conditions, params = self.booking_filter_conditions(statuses, window_from, window_to, email_prefix)
+        if after is not None:
+            conditions.append(sql.SQL("{} {} {}").format(key, sql.SQL("<" if descending else ">"), placeholder))
+            params += after_params
+        # Строки несут версию (xmin), чтобы изменение из таблицы не требовало повторного чтения брони
+        query = sql.SQL(f"""
+            SELECT booking_id, user_email, start_date, end_date, status, created_at, {BOOKING_VERSION}
+            FROM booking
+            WHERE property_id = %s {{}}
+            ORDER BY {{}}
+            LIMIT %s
+        """).format(sql.SQL("").join(sql.SQL(" AND ") + condition for condition in conditions), order)
+        return self.execute_query(query, (property_id,) + params + (limit,), fetch=True)
@@ -0,0 +1,103 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QMessageBox, QFileDialog, QComboBox,
+    QPushButton, QGroupBox, QFormLayout, QLabel, QProgressBar
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QIcon
+
+from data_export import DataExporter, EXPORT_PROPERTIES, EXPORT_BOOKINGS, FORMAT_CSV, FORMAT_PARQUET
+
+# Канал фоновой задачи выгрузки
+EXPORT_CHANNEL = "export"
+
+class ExportWindow(QWidget):
+    windowClosed = pyqtSignal()
+    # Прогресс выгрузки из фонового потока (доставляется в GUI-поток очередью сигналов)
+    exportProgress = pyqtSignal(int, int)
+
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.WindowCloseButtonHint | Qt.WindowType.WindowTitleHint)
+        self.main_window = main_window
+        self.main_window.runner.channelBusy.connect(self.set_channel_busy)
+        self.exportProgress.connect(self.show_progress)
+        self.initUI()
+        self.setMinimumSize(400, 250)
+
+    def initUI(self):
+        self.setWindowTitle("Экспорт данных")
+        self.setWindowIcon(QIcon(self.main_window.set_logo()))
+        self.set_ui()
+
+    def set_ui(self):
+        main_content = QVBoxLayout()
+        self.setLayout(main_content)
+
+        export_group = QGroupBox("Параметры выгрузки")
+        form_export_layout = QFormLayout()
+
+        self.dataset_combo = QComboBox()
+        self.dataset_combo.addItem("Объекты недвижимости", EXPORT_PROPERTIES)
+        self.dataset_combo.addItem("Брони", EXPORT_BOOKINGS)
+
+        self.format_combo = QComboBox()
+        self.format_combo.addItem("CSV", FORMAT_CSV)
+        # Parquet доступен при установленном pyarrow
+        if DataExporter.is_parquet_supported():
+            self.format_combo.addItem("Parquet", FORMAT_PARQUET)
+
+        form_export_layout.addRow("Данные:", self.dataset_combo)
+        form_export_layout.addRow("Формат:", self.format_combo)
+        form_export_layout.addRow(QLabel("Выгружаются объекты, отобранные текущими фильтрами главного окна"))
+        export_group.setLayout(form_export_layout)
+
+        self.btn_export = QPushButton("Экспортировать")
+        self.btn_export.clicked.connect(self.start_export)
+        self.btn_cancel = QPushButton("Отменить")
+        self.btn_cancel.clicked.connect(lambda: self.main_window.runner.cancel(EXPORT_CHANNEL))
+        self.btn_cancel.hide()
+
+        self.progress = QProgressBar()
+        self.progress.hide()
+
+        main_content.addWidget(export_group)
+        main_content.addWidget(self.progress)
+        main_content.addWidget(self.btn_export)
+        main_content.addWidget(self.btn_cancel)
+
+    def start_export(self):
+        file_format = self.format_combo.currentData()
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранение выгрузки", f"{self.dataset_combo.currentData()}.{file_format}",
+            "Parquet (*.parquet)" if file_format == FORMAT_PARQUET else "CSV (*.csv)"
+        )
+        if not path:
+            return
+        self.progress.setRange(0, 0)
+        self.main_window.runner.submit(
+            EXPORT_CHANNEL,
+            DataExporter(self.main_window.db).export,
+            self.dataset_combo.currentData(),
+            file_format,
+            path,
+            self.main_window.shown_filters,
+            self.exportProgress.emit,
+            on_result=lambda rows: QMessageBox.information(self, "Успех", f"Выгружено строк: {rows}"),
+            on_error=lambda error: QMessageBox.critical(self, "Ошибка", f"Ошибка выгрузки: {error}")
+        )
+
+    def show_progress(self, done, total):
+        if total > 0:
+            self.progress.setRange(0, total)
+            self.progress.setValue(min(done, total))
+
+    def set_channel_busy(self, channel, busy):
+        if channel == EXPORT_CHANNEL:
+            self.progress.setVisible(busy)
+            self.btn_cancel.setVisible(busy)
+            self.btn_export.setEnabled(not busy)
+
+    def closeEvent(self, event):
+        self.windowClosed.emit()
+        self.main_window.setEnabled(True)
+        event.accept()
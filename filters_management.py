@@ -5,6 +5,11 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon
 
+from database import IntegrityViolationError
+
+# Канал фоновых задач изменения справочника удобств
+AMENITY_CHANNEL = "amenities"
+
 class FiltersManagementWindow(QWidget):
     windowClosed = pyqtSignal()
     
@@ -14,6 +19,7 @@ class FiltersManagementWindow(QWidget):
         self.main_window = main_window
         self.initUI()
         self.setMinimumSize(400, 300)
+        self.main_window.referenceDataChanged.connect(self.update_amenities_ui)
 
     def initUI(self):
         self.setWindowTitle("Управление фильтрами")
@@ -69,13 +75,10 @@ class FiltersManagementWindow(QWidget):
         main_content.addWidget(amenities_group)
 
     def load_data_from_db(self):
-        try:
-            self.property_categories = self.main_window.db.get_property_categories()
-            self.amenities = self.main_window.db.get_amenities()
-        except Exception as e:
-            print(str(e))
-            QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки загрузки данных из базы данных")
-            self.close()
+        # Справочники уже загружены главным окном; после изменений они перезагружаются
+        # в фоне (reload_reference_data), и окно обновляется по referenceDataChanged
+        self.property_categories = list(self.main_window.property_categories)
+        self.amenities = list(self.main_window.amenities)
 
     # Методы только для удобств
     def add_amenity(self):
@@ -88,16 +91,12 @@ class FiltersManagementWindow(QWidget):
             QMessageBox.warning(self, "Ошибка", "Удобство уже существует")
             return
 
-        try:
-            self.main_window.db.execute_query(
-                "INSERT INTO amenity (name) VALUES (%s)", 
-                (title,)
-            )
-            QMessageBox.information(self, "Успех", "Удобство добавлено!")
-            self.update_amenities_ui()
-        except Exception as e:
-            print(str(e))
-            QMessageBox.critical(self, "Ошибка", "Ошибка при добавлении удобства")
+        self.run_amenity_query(
+            self.main_window.db.add_amenity,
+            (title,),
+            "Удобство добавлено!",
+            "Ошибка при добавлении удобства"
+        )
 
     def edit_amenity(self):
         old_title = self.amenities_combo.currentText()
@@ -107,16 +106,12 @@ class FiltersManagementWindow(QWidget):
             QMessageBox.warning(self, "Ошибка", "Введите новое название")
             return
 
-        try:
-            self.main_window.db.execute_query(
-                "UPDATE amenity SET name = %s WHERE name = %s",
-                (new_title, old_title)
-            )
-            QMessageBox.information(self, "Успех", "Удобство изменено!")
-            self.update_amenities_ui()
-        except Exception as e:
-            print(str(e))
-            QMessageBox.critical(self, "Ошибка", "Ошибка при редактировании удобства")
+        self.run_amenity_query(
+            self.main_window.db.rename_amenity,
+            (old_title, new_title),
+            "Удобство изменено!",
+            "Ошибка при редактировании удобства"
+        )
 
     def remove_amenity(self):
         title = self.amenities_combo.currentText()
@@ -136,27 +131,51 @@ class FiltersManagementWindow(QWidget):
         no_button.setText("Нет")
         
         if confirm.exec() == QMessageBox.StandardButton.Yes:
-            try:
-                self.main_window.db.execute_query(
-                    "DELETE FROM amenity WHERE name = %s",
-                    (title,))
-                QMessageBox.information(self, "Успех", "Удобство удалено!")
-                self.update_amenities_ui()
-            except Exception as e:
-                print(str(e))
-                QMessageBox.critical(self, "Ошибка", "Ошибка при удалении удобства")
+            self.run_amenity_query(
+                self.main_window.db.remove_amenity,
+                (title,),
+                "Удобство удалено!",
+                "Ошибка при удалении удобства"
+            )
+
+    def run_amenity_query(self, action, params, success_text, error_text):
+        # Запрос выполняется в фоне; кнопки заблокированы до его завершения.
+        # Методы DatabaseManager сами сбрасывают кеш справочников после изменения
+        self.set_buttons_enabled(False)
+        self.main_window.runner.submit(
+            AMENITY_CHANNEL,
+            action,
+            *params,
+            on_result=lambda result: self.amenity_query_done(success_text),
+            on_error=lambda error: self.amenity_query_failed(error, error_text)
+        )
+
+    def amenity_query_done(self, success_text):
+        self.set_buttons_enabled(True)
+        QMessageBox.information(self, "Успех", success_text)
+        self.title_amenities_edit.clear()
+        self.main_window.reload_reference_data()
+
+    def amenity_query_failed(self, error, error_text):
+        self.set_buttons_enabled(True)
+        if isinstance(error, IntegrityViolationError):
+            QMessageBox.warning(self, "Ошибка", "Удобство с таким названием уже существует")
+        else:
+            QMessageBox.critical(self, "Ошибка", error_text)
+
+    def set_buttons_enabled(self, enabled):
+        self.btn_add_amenity.setEnabled(enabled)
+        self.btn_edit_amenity.setEnabled(enabled)
+        self.btn_remove_amenity.setEnabled(enabled)
 
     def update_amenities_ui(self):
-        self.amenities = self.main_window.db.get_amenities()
+        self.load_data_from_db()
         self.amenities_combo.clear()
         self.amenities_combo.addItems(self.amenities)
-        self.title_amenities_edit.clear()
-        self.main_window.amenities_scroll_layout()
 
     def closeEvent(self, event):
         self.windowClosed.emit()
         self.main_window.setEnabled(True)
-        self.main_window.load_data_from_db()
-        self.main_window.amenities_scroll_layout()
+        self.main_window.reload_reference_data()
         self.main_window.search_property()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,32 @@
+# Массовый импорт объектов и броней из CSV в базу данных по умолчанию
+# Запуск: python import_data.py --properties properties.csv [--bookings bookings.csv]
+import sys
+import argparse
+import psycopg2
+
+from database import DatabaseManager, DatabaseError
+from bulk_import import BulkImporter, BOOKINGS_WITHOUT_PROPERTIES
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Импорт объектов недвижимости и броней из CSV")
+    parser.add_argument("--properties", help="CSV объектов: ref, title, description, address, "
+                                             "price_per_night, property_type, amenities (через ;)")
+    parser.add_argument("--bookings", help="CSV броней: property_ref, user_email, start_date, end_date, status")
+    args = parser.parse_args()
+    if not args.properties and not args.bookings:
+        parser.error("укажите хотя бы один файл")
+    if not args.properties:
+        parser.error(BOOKINGS_WITHOUT_PROPERTIES)
+
+    db = DatabaseManager()
+    if not db.is_connected():
+        sys.exit("Не удалось подключиться к базе данных")
+    try:
+        report = BulkImporter(db).run(args.properties, args.bookings)
+    # Ошибки слияния внутри db.transaction() приходят как DatabaseError (в том числе
+    # BookingOverlapError при пересечении броней), ошибки загрузки COPY - как psycopg2.Error
+    except (OSError, ValueError, DatabaseError, psycopg2.Error) as e:
+        sys.exit(f"Ошибка импорта: {e}")
+    finally:
+        db.close()
+    print(report.summary())
@@ -0,0 +1,114 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QFileDialog,
+    QPushButton, QGroupBox, QFormLayout, QLineEdit, QPlainTextEdit, QProgressBar
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QIcon
+
+from bulk_import import BulkImporter, BOOKINGS_WITHOUT_PROPERTIES
+
+# Канал фоновой задачи импорта
+IMPORT_CHANNEL = "import"
+
+class ImportWindow(QWidget):
+    windowClosed = pyqtSignal()
+
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.WindowCloseButtonHint | Qt.WindowType.WindowTitleHint)
+        self.main_window = main_window
+        self.main_window.runner.channelBusy.connect(self.set_channel_busy)
+        self.initUI()
+        self.setMinimumSize(600, 450)
+
+    def initUI(self):
+        self.setWindowTitle("Импорт из CSV")
+        self.setWindowIcon(QIcon(self.main_window.set_logo()))
+        self.set_ui()
+
+    def set_ui(self):
+        main_content = QVBoxLayout()
+        self.setLayout(main_content)
+
+        files_group = QGroupBox("Файлы импорта")
+        form_files_layout = QFormLayout()
+
+        self.properties_path = QLineEdit()
+        self.properties_path.setPlaceholderText("ref, title, description, address, price_per_night, property_type, amenities")
+        self.bookings_path = QLineEdit()
+        self.bookings_path.setPlaceholderText("property_ref, user_email, start_date, end_date, status")
+
+        form_files_layout.addRow("Объекты:", self.file_row(self.properties_path))
+        form_files_layout.addRow("Брони:", self.file_row(self.bookings_path))
+        files_group.setLayout(form_files_layout)
+
+        self.btn_import = QPushButton("Импортировать")
+        self.btn_import.clicked.connect(self.start_import)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setTextVisible(False)
+        self.progress.hide()
+
+        report_group = QGroupBox("Результат")
+        report_layout = QVBoxLayout()
+        self.report_text = QPlainTextEdit()
+        self.report_text.setReadOnly(True)
+        report_layout.addWidget(self.report_text)
+        report_group.setLayout(report_layout)
+
+        main_content.addWidget(files_group)
+        main_content.addWidget(self.btn_import)
+        main_content.addWidget(self.progress)
+        main_content.addWidget(report_group)
+
+    def file_row(self, path_edit):
+        row = QHBoxLayout()
+        btn_browse = QPushButton("Обзор...")
+        btn_browse.clicked.connect(lambda: self.choose_file(path_edit))
+        row.addWidget(path_edit)
+        row.addWidget(btn_browse)
+        return row
+
+    def choose_file(self, path_edit):
+        path, _ = QFileDialog.getOpenFileName(self, "Выбор файла", "", "CSV (*.csv)")
+        if path:
+            path_edit.setText(path)
+
+    def start_import(self):
+        properties_path = self.properties_path.text().strip() or None
+        bookings_path = self.bookings_path.text().strip() or None
+        if not properties_path and not bookings_path:
+            QMessageBox.warning(self, "Ошибка", "Выберите хотя бы один файл")
+            return
+        if not properties_path:
+            QMessageBox.warning(self, "Ошибка", BOOKINGS_WITHOUT_PROPERTIES)
+            return
+        self.report_text.clear()
+        self.main_window.runner.submit(
+            IMPORT_CHANNEL,
+            BulkImporter(self.main_window.db).run,
+            properties_path,
+            bookings_path,
+            on_result=self.import_finished,
+            on_error=self.import_failed
+        )
+
+    def import_finished(self, report):
+        self.report_text.setPlainText(report.summary())
+        # Новые объекты попадают в список так же, как изменения с других рабочих мест
+        self.main_window.properties_changed(report.property_ids)
+
+    def import_failed(self, error):
+        self.report_text.setPlainText(str(error))
+        QMessageBox.critical(self, "Ошибка", "Импорт не выполнен, изменения отменены")
+
+    def set_channel_busy(self, channel, busy):
+        if channel == IMPORT_CHANNEL:
+            self.progress.setVisible(busy)
+            self.btn_import.setEnabled(not busy)
+
+    def closeEvent(self, event):
+        self.windowClosed.emit()
+        self.main_window.setEnabled(True)
+        event.accept()
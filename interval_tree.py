@@ -0,0 +1,131 @@
+import random
+
+class _Node:
+    __slots__ = ('start', 'end', 'key', 'value', 'priority', 'max_end', 'left', 'right')
+
+    def __init__(self, start, end, key, value, priority):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+
+class IntervalTree:
+    # Дерево полуоткрытых интервалов [start, end) в памяти: декартово дерево (treap) по (start, key),
+    # в каждом узле - наибольший конец интервала в поддереве. Добавление и удаление - O(log n),
+    # поиск пересечений с периодом - O(log n + k): поддеревья, целиком лежащие до периода
+    # (max_end <= start) или после него (start >= end), не обходятся.
+    # key - уникальный идентификатор интервала (booking_id), value - связанные данные
+    def __init__(self, seed: int = 0):
+        self.root = None
+        self.spans = {}
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, key):
+        return key in self.spans
+
+    def clear(self):
+        self.root = None
+        self.spans.clear()
+
+    def add(self, start, end, key, value=None):
+        # Интервал с тем же key заменяется
+        if key in self.spans:
+            self.remove(key)
+        node = _Node(start, end, key, value, self._random.random())
+        self.root = self._insert(self.root, node)
+        self.spans[key] = (start, end)
+
+    def remove(self, key) -> bool:
+        span = self.spans.pop(key, None)
+        if span is None:
+            return False
+        self.root = self._delete(self.root, span[0], key)
+        return True
+
+    def overlapping(self, start, end) -> list:
+        # Значения интервалов, пересекающихся с [start, end), в порядке начала
+        result = []
+        stack = []
+        node = self.root
+        # Симметричный обход с отсечением поддеревьев
+        while stack or node is not None:
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start >= end:
+                break
+            if node.end > start:
+                result.append(node.value)
+            node = node.right
+        return result
+
+    @staticmethod
+    def _update(node):
+        node.max_end = node.end
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    def _rotate_right(self, node):
+        left = node.left
+        node.left = left.right
+        left.right = node
+        self._update(node)
+        self._update(left)
+        return left
+
+    def _rotate_left(self, node):
+        right = node.right
+        node.right = right.left
+        right.left = node
+        self._update(node)
+        self._update(right)
+        return right
+
+    def _insert(self, node, new):
+        if node is None:
+            return new
+        if (new.start, new.key) < (node.start, node.key):
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                return self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                return self._rotate_left(node)
+        self._update(node)
+        return node
+
+    def _delete(self, node, start, key):
+        if node is None:
+            return None
+        if (start, key) < (node.start, node.key):
+            node.left = self._delete(node.left, start, key)
+        elif (start, key) > (node.start, node.key):
+            node.right = self._delete(node.right, start, key)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Узел опускается вращениями, пока у него не останется одного потомка
+            if node.left.priority > node.right.priority:
+                node = self._rotate_right(node)
+                node.right = self._delete(node.right, start, key)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._delete(node.left, start, key)
+        self._update(node)
+        return node
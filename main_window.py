@@ -1,24 +1,69 @@
 import sys
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QSizePolicy, QGridLayout,
-    QPushButton, QLabel, QGroupBox, QScrollArea, QFormLayout, QLineEdit, QCheckBox
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QGridLayout,
+    QPushButton, QLabel, QGroupBox, QScrollArea, QLineEdit, QCheckBox, QProgressBar, QDateEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QDate, pyqtSignal
 from PyQt6.QtGui import QIcon, QPixmap
 
-from database import DatabaseManager
+from database import DatabaseManager, PROPERTY_PAGE_SIZE, POOL_MAX_SIZE
 from settings_bd import SettingsWindow
 from property_management import PropertyManagementWindow
 from booking_management import BookingManagementWindow
 from filters_management import FiltersManagementWindow
+from import_window import ImportWindow
+from export_window import ExportWindow
+from booking_calendar import CalendarWindow
+from property_list import PropertyListModel, PropertyCardDelegate, PropertyListView
+from task_runner import TaskRunner
+from notify_listener import NotifyListener
+from occupancy_index import OccupancyIndex
+from booking_service import BookingService, ValidationError, validate_period, ACTIVE_STATUS
+
+# Канал фоновых задач поиска недвижимости
+PROPERTY_CHANNEL = "properties"
+# Задержка поиска при вводе текста, мс
+SEARCH_DEBOUNCE_MS = 200
+# Каналы уведомлений PostgreSQL (см. migrations/0002_notify_triggers.sql)
+PROPERTY_NOTIFY_CHANNEL = "property_changed"
+REFERENCE_NOTIFY_CHANNEL = "reference_changed"
+# Интервал, за который уведомления собираются в один запрос, мс
+NOTIFY_COALESCE_MS = 100
+# Канал фоновой загрузки индекса занятости
+OCCUPANCY_CHANNEL = "occupancy"
+# Канал фоновой перезагрузки справочников (категории, удобства)
+REFERENCE_CHANNEL = "reference"
+# Символы шаблона ILIKE в поисковом запросе (см. narrow_properties)
+LIKE_SPECIAL_CHARS = "%_\\"
+# Ключи фильтра по периоду доступности
+AVAILABILITY_KEYS = ('available_from', 'available_to')
 
 class MainWindow(QWidget):
+    # Справочники перезагружены (reload_reference_data); окна со списками удобств обновляются по нему
+    referenceDataChanged = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.db = DatabaseManager()
-        if not self.db.connect():
+        if not self.db.is_connected():
             QMessageBox.critical(self, "Ошибка", "Не удалось подключиться к базе данных")
             sys.exit(1)
+        # Логика поиска и бронирования, общая с HTTP API
+        self.service = BookingService(self.db)
+        # Фоновое выполнение запросов: GUI-поток не блокируется на время работы с БД
+        self.runner = TaskRunner(self.db, max_threads=POOL_MAX_SIZE - 2, parent=self)
+        self.runner.channelBusy.connect(self.set_channel_busy)
+        # Изменения в БД (в том числе с других рабочих мест) применяются к списку точечно
+        self.pending_property_ids = set()
+        self.notify_timer = QTimer(self)
+        self.notify_timer.setSingleShot(True)
+        self.notify_timer.setInterval(NOTIFY_COALESCE_MS)
+        self.notify_timer.timeout.connect(self.apply_pending_notifications)
+        self.notify_listener = NotifyListener(self.db, [PROPERTY_NOTIFY_CHANNEL, REFERENCE_NOTIFY_CHANNEL], self)
+        self.notify_listener.notified.connect(self.handle_notification)
+        # Необязательный индекс занятости (нужен NumPy) для фильтра по периоду без запросов к БД
+        self.occupancy = OccupancyIndex() if OccupancyIndex.is_supported() else None
+        self.undated_result = None
         self.user_data = None
         self.load_data_from_db()
         self.initUI()
@@ -26,6 +71,9 @@ class MainWindow(QWidget):
         
         self.settings_bd = SettingsWindow(main_window=self)
         self.filters_management = FiltersManagementWindow(main_window=self)
+        self.import_window = ImportWindow(main_window=self)
+        self.export_window = ExportWindow(main_window=self)
+        self.calendar_window = CalendarWindow(main_window=self)
 
     def activate_window(self):
         self.setEnabled(True)
@@ -60,9 +108,18 @@ class MainWindow(QWidget):
         self.about_button.setFixedSize(70, 30)
         self.btn_admin_settings_bd = QPushButton("Настройки БД")
         self.btn_admin_settings_bd.setFixedSize(100, 30)
+        self.btn_import = QPushButton("Импорт CSV")
+        self.btn_import.setFixedSize(100, 30)
+        self.btn_export = QPushButton("Экспорт")
+        self.btn_export.setFixedSize(100, 30)
+        self.btn_calendar = QPushButton("Календарь")
+        self.btn_calendar.setFixedSize(100, 30)
         
         header_layout_name.addWidget(self.logo)
         header_layout_name.addWidget(self.name_label, alignment=Qt.AlignmentFlag.AlignLeft)
+        header_layout_btn.addWidget(self.btn_import, alignment=Qt.AlignmentFlag.AlignRight)
+        header_layout_btn.addWidget(self.btn_export, alignment=Qt.AlignmentFlag.AlignRight)
+        header_layout_btn.addWidget(self.btn_calendar, alignment=Qt.AlignmentFlag.AlignRight)
         header_layout_btn.addWidget(self.btn_admin_settings_bd, alignment=Qt.AlignmentFlag.AlignRight)
         header_layout_btn.addWidget(self.about_button, alignment=Qt.AlignmentFlag.AlignRight)
         
@@ -88,6 +145,22 @@ class MainWindow(QWidget):
         property_searchbar_layout = QHBoxLayout()
         self.property_list_layout = QVBoxLayout()
 
+        # Список недвижимости (model/view: отрисовываются только видимые карточки)
+        self.property_model = PropertyListModel(self)
+        self.property_delegate = PropertyCardDelegate(self)
+        self.property_list_view = PropertyListView()
+        self.property_list_view.setModel(self.property_model)
+        self.property_list_view.setItemDelegate(self.property_delegate)
+        self.property_list_view.set_empty_text(
+            "К сожалению, ничего не найдено по вашему запросу. \nПопробуйте изменить параметры поиска."
+        )
+        self.property_list_layout.addWidget(self.property_list_view)
+
+        self.property_delegate.rentClicked.connect(self.rent_property)
+        self.property_delegate.editClicked.connect(self.edit_property)
+        self.property_delegate.removeClicked.connect(self.remove_property)
+        self.property_delegate.descriptionClicked.connect(self.show_description)
+
         property_content_in_group.addLayout(property_searchbar_layout)
         property_content_in_group.addLayout(property_host_btn_layout)
         property_content_in_group.addLayout(self.property_list_layout)
@@ -98,7 +171,21 @@ class MainWindow(QWidget):
         self.property_searchbar.setMaxLength(100)
         self.btn_search = QPushButton("Найти")
 
+        # Поиск по мере ввода: запрос отправляется после паузы в наборе
+        self.shown_filters = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_search)
+
+        self.loading_indicator = QProgressBar()
+        self.loading_indicator.setRange(0, 0)
+        self.loading_indicator.setFixedWidth(80)
+        self.loading_indicator.setTextVisible(False)
+        self.loading_indicator.hide()
+
         property_searchbar_layout.addWidget(self.property_searchbar, 80)
+        property_searchbar_layout.addWidget(self.loading_indicator)
         property_searchbar_layout.addWidget(self.btn_search, 20)
 
         self.btn_add_property = QPushButton("Добавить недвижимость")
@@ -116,9 +203,13 @@ class MainWindow(QWidget):
         
         self.about_button.clicked.connect(self.show_about)
         self.btn_admin_settings_bd.clicked.connect(self.show_settings_bd)
+        self.btn_import.clicked.connect(self.show_import)
+        self.btn_export.clicked.connect(self.show_export)
+        self.btn_calendar.clicked.connect(self.show_calendar)
         self.btn_add_property.clicked.connect(self.add_property)
         self.btn_search.clicked.connect(self.filter_search)
         self.property_searchbar.returnPressed.connect(self.filter_search)
+        self.property_searchbar.textChanged.connect(lambda text: self.search_timer.start())
 
     def show_about(self):
         about_text = """SmartBooking - информационная система онлайн бронирования недвижимости
@@ -132,6 +223,19 @@ class MainWindow(QWidget):
         self.settings_bd.show()
         self.setEnabled(False)
 
+    def show_import(self):
+        self.import_window.show()
+        self.setEnabled(False)
+
+    def show_export(self):
+        self.export_window.show()
+        self.setEnabled(False)
+
+    def show_calendar(self):
+        # Календарь строится по объектам, уже загруженным в список (текущие фильтры)
+        self.calendar_window.show()
+        self.setEnabled(False)
+
     def management_property(self, property_data=None):
         self.property_management = PropertyManagementWindow(
             main_window=self,
@@ -169,15 +273,14 @@ class MainWindow(QWidget):
         no_button.setText("Нет")
     
         if confirm.exec() == QMessageBox.StandardButton.Yes:
-            try:
-                self.db.execute_query(
-                    "DELETE FROM property WHERE property_id = %s",
-                    (property_data['property_id'],)
-                )
-                self.search_property()
-            except Exception as e:
-                print(str(e))
-                QMessageBox.critical(self, "Ошибка", f"Ошибка удаления недвижимости")
+            self.runner.submit(
+                None,
+                self.db.execute_query,
+                "DELETE FROM property WHERE property_id = %s",
+                (property_data['property_id'],),
+                on_result=lambda result: self.refresh_property_rows([property_data['property_id']]),
+                on_error=lambda error: QMessageBox.critical(self, "Ошибка", f"Ошибка удаления недвижимости")
+            )
 
 
     def rent_property(self, property_data):
@@ -189,6 +292,15 @@ class MainWindow(QWidget):
         self.setEnabled(False)
 
     def amenities_scroll_layout(self):
+        # Отмеченные фильтры сохраняются при перестроении панели
+        checked = {
+            name
+            for checkboxes in ('categories_checkboxes', 'booking_status_checkboxes', 'amenity_checkboxes')
+            for name, cb in getattr(self, checkboxes, {}).items()
+            if cb.isChecked()
+        }
+        availability = self.availability_state() if hasattr(self, 'availability_checkbox') else None
+
         if not self.filter_group.layout():
             self.filter_group.setLayout(QVBoxLayout())
         else:
@@ -200,17 +312,20 @@ class MainWindow(QWidget):
         main_container = QWidget()
         main_layout = QVBoxLayout(main_container)
 
-        self.load_data_from_db()
-        
         btn_management = QPushButton("Управление фильтрами")
         btn_management.clicked.connect(self.management_filters)
         main_layout.addWidget(btn_management)
 
         main_layout.addLayout(self.create_category_filters())
         main_layout.addLayout(self.create_status_filters())
+        main_layout.addLayout(self.create_availability_filters(availability))
         main_layout.addWidget(self.create_amenities_filters())
         main_layout.addLayout(self.create_filter_buttons())
 
+        for checkboxes in (self.categories_checkboxes, self.booking_status_checkboxes, self.amenity_checkboxes):
+            for name, cb in checkboxes.items():
+                cb.setChecked(name in checked)
+
         self.filter_group.layout().addWidget(main_container)
 
     def create_category_filters(self):
@@ -278,6 +393,39 @@ class MainWindow(QWidget):
         
         return layout
 
+    def create_availability_filters(self, state=None):
+        layout = QVBoxLayout()
+        head = QLabel("Свободно в период")
+        head.setStyleSheet("font-weight: bold; font-size: 12px;")
+        layout.addWidget(head)
+
+        today = QDate.currentDate()
+        self.availability_checkbox = QCheckBox("Только свободные")
+        self.available_from_edit = QDateEdit(calendarPopup=True, date=today)
+        self.available_to_edit = QDateEdit(calendarPopup=True, date=today.addDays(1))
+        if state is not None:
+            checked, date_from, date_to = state
+            self.availability_checkbox.setChecked(checked)
+            self.available_from_edit.setDate(date_from)
+            self.available_to_edit.setDate(date_to)
+
+        dates_layout = QHBoxLayout()
+        dates_layout.addWidget(QLabel("с"))
+        dates_layout.addWidget(self.available_from_edit)
+        dates_layout.addWidget(QLabel("по"))
+        dates_layout.addWidget(self.available_to_edit)
+
+        layout.addWidget(self.availability_checkbox)
+        layout.addLayout(dates_layout)
+        return layout
+
+    def availability_state(self):
+        return (
+            self.availability_checkbox.isChecked(),
+            self.available_from_edit.date(),
+            self.available_to_edit.date(),
+        )
+
     def create_filter_buttons(self):
         layout = QVBoxLayout()
         btn_apply = QPushButton("Применить")
@@ -291,135 +439,40 @@ class MainWindow(QWidget):
         return layout
 
     def scroll_list_property(self, properties: list):
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        
-        content = QWidget()
-        content_layout = QVBoxLayout()
-        content.setLayout(content_layout)
+        self.property_model.set_properties(properties)
 
-        if not properties:
-            no_results = QLabel("К сожалению, ничего не найдено по вашему запросу. \nПопробуйте изменить параметры поиска.")
-            no_results.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-            content_layout.addWidget(no_results)
-        else:
-            for prop in properties:
-                group = QGroupBox()
-                layout = QFormLayout()
-                
-                title = QLabel(prop['title'])
-                address = QLabel(prop['address'])
-                description = QLabel(prop['description'])
-                description.setWordWrap(True)
-                description.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-                description.setSizePolicy(
-                    QSizePolicy.Policy.Expanding,
-                    QSizePolicy.Policy.Preferred
-                )
-                description.setMaximumHeight(100)
-
-                amenities_container = QWidget()
-                amenities_layout = QHBoxLayout(amenities_container)
-                amenities = QLabel(", ".join(prop['amenities']) if prop['amenities'][0] else "Нет удобств")
-                amenities.setWordWrap(True)
-                amenities.setAlignment(Qt.AlignmentFlag.AlignJustify)
-                amenities_layout.addWidget(amenities)
-                
-                price = QLabel(f"{int(prop['price_per_night'])} ₽/ночь")
-                
-                layout.addRow("Название:", title)
-                layout.addRow("Адрес:", address)
-                description_widget = self.create_description_widget(prop['description'])
-                layout.addRow("Описание:", description_widget)
-                layout.addRow("Удобства:", amenities_container)
-                layout.addRow("Цена:", price)
-
-                group.setStyleSheet("""
-                    QGroupBox {
-                        border: 1px solid #ccc;
-                        border-radius: 5px;
-                        margin: 10px;
-                        padding: 15px;
-                    }
-                    QLabel {
-                        font-size: 12px;
-                    }
-                """)
-                title.setStyleSheet("font-weight: bold; font-size: 14px;")
-                description.setStyleSheet("""
-                    QLabel {
-                        padding: 5px;
-                        line-height: 1.4;
-                        border: 1px solid #eee;
-                        border-radius: 3px;
-                        margin: 5px 0;
-                    }
-                """)
-                price.setStyleSheet("font-weight: bold;")
-
-                btn_rent = QPushButton("Управление бронированием")
-                btn_edit_property = QPushButton("Изменить недвижимость")
-                btn_remove_property = QPushButton("Удалить недвижимость")
-
-                layout.addWidget(btn_rent)
-                layout.addWidget(btn_remove_property)
-                layout.addWidget(btn_edit_property)
-
-                group.setLayout(layout)
-                content_layout.addWidget(group)
-
-                btn_rent.clicked.connect(
-                    lambda checked, p=prop: self.rent_property(p)
-                )
-                btn_edit_property.clicked.connect(
-                    lambda checked, p=prop: self.edit_property(p)
-                )
-                btn_remove_property.clicked.connect(
-                    lambda checked, p=prop: self.remove_property(p)
-                )
-
-        scroll_area.setWidget(content)
-
-        # Очищаем предыдущие результаты
-        if self.property_list_layout.count() > 0:
-            old_widget = self.property_list_layout.takeAt(0).widget()
-            old_widget.deleteLater()
-            
-        self.property_list_layout.addWidget(scroll_area)
-
-    def create_description_widget(self, text):
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        
-        label = QLabel(text)
-        label.setWordWrap(True)
-        label.setAlignment(Qt.AlignmentFlag.AlignJustify)
-        
-        btn = QPushButton("Показать полностью")
-        btn.setCheckable(True)
-        label.setMaximumHeight(80)
-        btn.clicked.connect(lambda: self.toggle_description(label, btn))
-        
-        layout.addWidget(label)
-        layout.addWidget(btn, alignment=Qt.AlignmentFlag.AlignRight)
-        
-        return container
-
-    def toggle_description(self, label, btn):
-        if btn.isChecked():
-            label.setMaximumHeight(16777215)
-            btn.setText("Свернуть")
-        else:
-            label.setMaximumHeight(80)
-            btn.setText("Показать полностью")
+    def show_description(self, property_data):
+        QMessageBox.information(self, property_data['title'], property_data['description'] or "")
 
     def load_data_from_db(self):
-        self.property_categories = self.db.get_property_categories()
+        # Синхронная загрузка - только при запуске, до построения панели фильтров
+        self.set_reference_data(*self.load_reference_data())
+
+    def reload_reference_data(self):
+        # Перезагрузка справочников после их изменения в фоне; панель фильтров перестраивается по результату
+        self.runner.submit(
+            REFERENCE_CHANNEL,
+            self.load_reference_data,
+            on_result=self.reference_data_loaded,
+            on_error=lambda error: QMessageBox.warning(self, "Ошибка", "Не удалось загрузить справочники")
+        )
+
+    def load_reference_data(self) -> tuple:
+        # Выполняется и в фоновом потоке: только запросы, без обращения к виджетам
+        return self.db.get_property_categories(), self.db.get_amenities()
+
+    def reference_data_loaded(self, data):
+        self.set_reference_data(*data)
+        self.amenities_scroll_layout()
+        self.referenceDataChanged.emit()
+
+    def set_reference_data(self, property_categories, amenities):
+        self.property_categories = property_categories
         if not self.property_categories:
             QMessageBox.critical(self, "Ошибка", "Не удалось загрузить категории")
             self.close()
 
-        self.amenities = self.db.get_amenities()
+        self.amenities = amenities
         if not self.amenities:
             QMessageBox.warning(self, "Ошибка", "Не удалось загрузить список удобств")
             return
@@ -438,14 +491,111 @@ class MainWindow(QWidget):
         
         categories = selected_categories if selected_categories else None
         amenities = selected_amenities if selected_amenities else None
+
+        available_from = available_to = None
+        if self.availability_checkbox.isChecked():
+            available_from = self.available_from_edit.date().toPyDate()
+            available_to = self.available_to_edit.date().toPyDate()
+            try:
+                validate_period(available_from, available_to)
+            except ValidationError as e:
+                QMessageBox.warning(self, "Ошибка", str(e))
+                return
         
-        properties = self.db.get_properties(
-            search_query=search_text or None,
-            categories=categories,
-            amenities=amenities,
-            has_active_booking=has_active_booking
+        filters = {
+            'search_query': search_text or None,
+            'categories': categories,
+            'amenities': amenities,
+            'has_active_booking': has_active_booking,
+            'available_from': available_from,
+            'available_to': available_to,
+        }
+        self.search_timer.stop()
+        if available_from is not None:
+            self.load_occupancy_index()
+        if self.filter_by_occupancy(filters) or self.narrow_properties(filters):
+            return
+        self.show_properties(**filters)
+
+    def load_occupancy_index(self):
+        # Индекс занятости строится в фоне при первом использовании фильтра по периоду
+        # и перестраивается, когда окно сдвинулось за горизонт загруженных броней
+        if self.occupancy is None or self.runner.is_busy(OCCUPANCY_CHANNEL):
+            return
+        if self.occupancy.ready and not self.occupancy.stale:
+            return
+        self.occupancy.begin_load()
+        self.runner.submit(
+            OCCUPANCY_CHANNEL,
+            self.occupancy.load,
+            self.db,
+            on_result=self.occupancy.set_state,
+            on_error=self.occupancy.load_failed
+        )
+
+    def filter_by_occupancy(self, filters) -> bool:
+        # Если изменился только период доступности, а результат с теми же остальными фильтрами
+        # без периода загружен целиком, свободные объекты отбираются по индексу занятости без запроса к БД
+        if self.occupancy is None or not self.occupancy.ready or self.undated_result is None:
+            return False
+        base_filters, rows = self.undated_result
+        if any(base_filters[key] != filters[key] for key in filters if key not in AVAILABILITY_KEYS):
+            return False
+
+        if filters['available_from'] is None:
+            shown_rows = rows
+        else:
+            free = self.occupancy.free_property_ids(
+                [prop['property_id'] for prop in rows], filters['available_from'], filters['available_to']
+            )
+            if free is None:
+                return False
+            shown_rows = [prop for prop in rows if prop['property_id'] in free]
+
+        self.runner.cancel(PROPERTY_CHANNEL)
+        self.property_model.set_properties(shown_rows)
+        self.shown_filters = filters
+        return True
+
+    def remember_undated_result(self):
+        # Полностью загруженный результат без фильтра по периоду - основа для filter_by_occupancy
+        filters = self.shown_filters
+        if filters is not None and filters['available_from'] is None and self.property_model.is_complete():
+            self.undated_result = (filters, list(self.property_model.properties))
+
+    def occupancy_booking_changed(self, property_id, old=None, new=None):
+        # old/new - (start_date, end_date, status) брони до и после изменения
+        if self.occupancy is None:
+            return
+        if old is not None and old[2] == ACTIVE_STATUS:
+            self.occupancy.apply_booking(property_id, old[0], old[1], False)
+        if new is not None and new[2] == ACTIVE_STATUS:
+            self.occupancy.apply_booking(property_id, new[0], new[1], True)
+
+    def narrow_properties(self, filters) -> bool:
+        # Если запрос только уточнился (дописаны символы), а прошлый результат загружен целиком,
+        # новый результат - его подмножество: фильтруем уже загруженные строки без обращения к БД
+        shown = self.shown_filters
+        if shown is None or not self.property_model.is_complete():
+            return False
+        if any(shown[key] != filters[key] for key in filters if key != 'search_query'):
+            return False
+        old_text = (shown['search_query'] or "").lower()
+        new_text = (filters['search_query'] or "").lower()
+        if new_text == old_text or old_text not in new_text:
+            return False
+        # В ILIKE '%' и '_' - шаблоны, обратная косая черта - экранирование: проверка подстроки в Python дала бы
+        # другой результат, такой запрос выполняет сервер
+        if any(char in new_text for char in LIKE_SPECIAL_CHARS):
+            return False
+
+        self.runner.cancel(PROPERTY_CHANNEL)
+        self.property_model.set_properties(
+            [prop for prop in self.property_model.properties if new_text in (prop['title'] or "").lower()]
         )
-        self.scroll_list_property(properties if properties else [])
+        self.shown_filters = filters
+        self.remember_undated_result()
+        return True
 
     def reset_filters(self):
         for cb in self.amenity_checkboxes.values():
@@ -454,19 +604,102 @@ class MainWindow(QWidget):
             cb.setChecked(False)
         for cb in self.booking_status_checkboxes.values():
             cb.setChecked(False)
+        self.availability_checkbox.setChecked(False)
         self.search_property()
 
     def search_property(self):
-        try:
-            search_text = self.property_searchbar.text().strip()
-            properties = self.db.get_properties(search_text if search_text else None)
-            if properties is None:
-                QMessageBox.critical(self, "Ошибка", "Не удалось загрузить данные")
-                return
-            self.scroll_list_property(properties)
-        except Exception as e:
-            print(str(e))
-            QMessageBox.critical(self, "Ошибка", f"Произошла ошибка при выполнении поиска")
+        search_text = self.property_searchbar.text().strip()
+        self.show_properties(search_query=search_text if search_text else None)
+
+    def show_properties(self, search_query=None, categories=None, amenities=None, has_active_booking=None,
+                        available_from=None, available_to=None):
+        # Первая страница загружается сразу, следующие - по мере прокрутки списка.
+        # Запросы выполняются в фоне; новый поиск отменяет незавершенный предыдущий
+        filters = {
+            'search_query': search_query,
+            'categories': categories,
+            'amenities': amenities,
+            'has_active_booking': has_active_booking,
+            'available_from': available_from,
+            'available_to': available_to,
+        }
+        self.shown_filters = filters
+
+        def fetch_page(after, generation):
+            self.runner.submit(
+                PROPERTY_CHANNEL,
+                self.service.search,
+                after=after,
+                on_result=lambda properties: self.property_page_loaded(properties, generation),
+                on_error=lambda error: self.property_page_failed(generation),
+                **filters
+            )
+
+        self.property_model.set_fetcher(fetch_page, self.db.property_page_key, PROPERTY_PAGE_SIZE)
+
+    def property_page_loaded(self, properties, generation):
+        self.property_model.append_page(properties, generation)
+        self.remember_undated_result()
+
+    def property_page_failed(self, generation):
+        self.property_model.page_failed(generation)
+        QMessageBox.critical(self, "Ошибка", "Не удалось загрузить данные")
+
+    def set_channel_busy(self, channel, busy):
+        if channel == PROPERTY_CHANNEL:
+            self.loading_indicator.setVisible(busy)
+
+    def handle_notification(self, channel, payload):
+        if channel == PROPERTY_NOTIFY_CHANNEL:
+            self.pending_property_ids.add(int(payload))
+            self.notify_timer.start()
+        elif channel == REFERENCE_NOTIFY_CHANNEL:
+            self.db.invalidate_reference_data()
+            self.reload_reference_data()
+
+    def properties_changed(self, property_ids):
+        # Изменения, сделанные этим клиентом пакетно, обрабатываются вместе с уведомлениями
+        self.pending_property_ids.update(property_ids)
+        self.notify_timer.start()
+
+    def apply_pending_notifications(self):
+        property_ids, self.pending_property_ids = list(self.pending_property_ids), set()
+        self.refresh_property_rows(property_ids)
+        if self.occupancy is not None and (self.occupancy.ready or self.occupancy.loading):
+            self.runner.submit(
+                None,
+                self.occupancy.load_property_bookings,
+                self.db,
+                property_ids,
+                on_result=lambda bookings: self.occupancy.replace_property_bookings(property_ids, bookings)
+            )
+
+    def refresh_property_rows(self, property_ids):
+        # Перезапрос только затронутых объектов с текущими фильтрами вместо полного поиска
+        filters = self.shown_filters
+        if filters is None or not property_ids:
+            return
+        self.runner.submit(
+            None,
+            self.db.get_properties_by_ids,
+            property_ids,
+            on_result=lambda rows: self.patch_property_rows(property_ids, rows, filters),
+            **filters
+        )
+
+    def patch_property_rows(self, property_ids, rows, filters):
+        # Если за время запроса сменился поиск, новый результат и так актуален
+        if filters is not self.shown_filters:
+            return
+        self.property_model.patch_rows(property_ids, rows)
+        self.undated_result = None
+        self.remember_undated_result()
+
+    def closeEvent(self, event):
+        self.notify_listener.stop()
+        self.runner.shutdown()
+        self.db.close()
+        event.accept()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,21 @@
+# Применение миграций схемы к базе данных по умолчанию
+# Запуск: python migrate.py
+import sys
+import psycopg2
+
+from database import DatabaseManager
+
+if __name__ == '__main__':
+    db = DatabaseManager()
+    if not db.is_connected():
+        sys.exit("Не удалось подключиться к базе данных")
+    try:
+        applied = db.migrate()
+    except psycopg2.Error as e:
+        sys.exit(f"Ошибка применения миграции: {e}")
+    finally:
+        db.close()
+    if applied:
+        print("Применены миграции: " + ", ".join(applied))
+    else:
+        print("Схема базы данных актуальна")
@@ -0,0 +1,111 @@
+-- Базовая схема SmartBooking: справочники, объекты недвижимости, бронирования
+-- и функция поиска get_filtered_properties с поддерживающими индексами.
+-- Все объекты создаются только при отсутствии, поэтому миграция применима и к существующей базе.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'property_category') THEN
+        CREATE TYPE property_category AS ENUM (
+            'квартира', 'апартаменты', 'комната', 'дом', 'гостиница', 'хостел'
+        );
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS property (
+    property_id     serial PRIMARY KEY,
+    title           varchar(100) NOT NULL,
+    description     text NOT NULL DEFAULT '',
+    address         varchar(200) NOT NULL,
+    price_per_night integer NOT NULL CHECK (price_per_night >= 0),
+    property_type   property_category NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS amenity (
+    amenity_id serial PRIMARY KEY,
+    name       varchar(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS property_amenity (
+    property_id integer NOT NULL REFERENCES property ON DELETE CASCADE,
+    amenity_id  integer NOT NULL REFERENCES amenity ON DELETE CASCADE,
+    PRIMARY KEY (property_id, amenity_id)
+);
+
+CREATE TABLE IF NOT EXISTS booking (
+    booking_id  serial PRIMARY KEY,
+    property_id integer NOT NULL REFERENCES property ON DELETE CASCADE,
+    user_email  varchar(50) NOT NULL,
+    start_date  date NOT NULL,
+    end_date    date NOT NULL,
+    status      varchar(20) NOT NULL DEFAULT 'активен'
+                CHECK (status IN ('активен', 'отменен', 'завершен')),
+    created_at  timestamp NOT NULL DEFAULT now(),
+    CHECK (end_date > start_date)
+);
+
+-- Поиск по подстроке названия (ILIKE '%...%')
+CREATE INDEX IF NOT EXISTS property_title_trgm_idx ON property USING gin (title gin_trgm_ops);
+-- Порядок выдачи и keyset-пагинация по (title, property_id)
+CREATE INDEX IF NOT EXISTS property_title_id_idx ON property (title, property_id);
+CREATE INDEX IF NOT EXISTS property_type_idx ON property (property_type);
+-- Фильтр "с активными бронями / без": поиск активной брони, не закончившейся на сегодня
+CREATE INDEX IF NOT EXISTS booking_property_status_end_idx ON booking (property_id, status, end_date);
+-- Фильтр по удобствам: от удобства к объектам
+CREATE INDEX IF NOT EXISTS property_amenity_amenity_property_idx ON property_amenity (amenity_id, property_id);
+
+-- Функция на языке SQL из одного SELECT встраивается планировщиком в вызывающий запрос,
+-- поэтому внешние WHERE / ORDER BY / LIMIT (пагинация, выборка по id) используют индексы таблицы property
+DROP FUNCTION IF EXISTS get_filtered_properties(text, text[], text[], boolean);
+CREATE FUNCTION get_filtered_properties(
+    p_search text,
+    p_categories text[],
+    p_amenities text[],
+    p_has_active_booking boolean
+)
+RETURNS TABLE (
+    property_id integer,
+    title varchar,
+    description text,
+    address varchar,
+    price_per_night integer,
+    property_type property_category,
+    amenities text[]
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        p.property_id,
+        p.title,
+        p.description,
+        p.address,
+        p.price_per_night,
+        p.property_type,
+        COALESCE(am.names, '{}') AS amenities
+    FROM property p
+    LEFT JOIN LATERAL (
+        SELECT array_agg(a.name::text ORDER BY a.name) AS names
+        FROM property_amenity pa
+        JOIN amenity a ON a.amenity_id = pa.amenity_id
+        WHERE pa.property_id = p.property_id
+    ) am ON true
+    WHERE (p_search IS NULL OR p.title ILIKE '%' || p_search || '%')
+      AND (COALESCE(cardinality(p_categories), 0) = 0 OR p.property_type::text = ANY (p_categories))
+      AND (COALESCE(cardinality(p_amenities), 0) = 0 OR p.property_id IN (
+            SELECT pa.property_id
+            FROM property_amenity pa
+            JOIN amenity a ON a.amenity_id = pa.amenity_id
+            WHERE a.name = ANY (p_amenities)
+            GROUP BY pa.property_id
+            HAVING count(*) = cardinality(p_amenities)
+      ))
+      AND (p_has_active_booking IS NULL OR p_has_active_booking = EXISTS (
+            SELECT 1
+            FROM booking b
+            WHERE b.property_id = p.property_id
+              AND b.status = 'активен'
+              AND b.end_date >= CURRENT_DATE
+      ))
+$$;
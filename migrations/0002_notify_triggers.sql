@@ -0,0 +1,43 @@
+-- Уведомления об изменениях для обновления списка недвижимости без полного перезапроса.
+-- Канал property_changed: payload - property_id затронутого объекта
+-- (одинаковые уведомления внутри транзакции PostgreSQL объединяет сам).
+-- Канал reference_changed: изменился справочник удобств, payload - имя таблицы.
+
+CREATE OR REPLACE FUNCTION notify_property_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('property_changed', OLD.property_id::text);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.property_id IS DISTINCT FROM OLD.property_id) THEN
+        PERFORM pg_notify('property_changed', NEW.property_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_reference_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('reference_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS property_notify ON property;
+CREATE TRIGGER property_notify
+    AFTER INSERT OR UPDATE OR DELETE ON property
+    FOR EACH ROW EXECUTE FUNCTION notify_property_changed();
+
+DROP TRIGGER IF EXISTS property_amenity_notify ON property_amenity;
+CREATE TRIGGER property_amenity_notify
+    AFTER INSERT OR UPDATE OR DELETE ON property_amenity
+    FOR EACH ROW EXECUTE FUNCTION notify_property_changed();
+
+DROP TRIGGER IF EXISTS booking_notify ON booking;
+CREATE TRIGGER booking_notify
+    AFTER INSERT OR UPDATE OR DELETE ON booking
+    FOR EACH ROW EXECUTE FUNCTION notify_property_changed();
+
+DROP TRIGGER IF EXISTS amenity_notify ON amenity;
+CREATE TRIGGER amenity_notify
+    AFTER INSERT OR UPDATE OR DELETE ON amenity
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_changed();
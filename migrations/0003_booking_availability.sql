@@ -0,0 +1,82 @@
+-- Период брони как daterange [start_date, end_date) с GiST-индексом.
+-- Ограничение-исключение запрещает пересечение активных броней одного объекта при вставке/изменении,
+-- а его индекс обслуживает поиск объектов, свободных в заданный период.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE booking ADD COLUMN IF NOT EXISTS stay daterange
+    GENERATED ALWAYS AS (daterange(start_date, end_date, '[)')) STORED;
+
+-- Создание завершится ошибкой, если в базе уже есть пересекающиеся активные брони:
+-- их нужно отменить или исправить перед применением миграции
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'booking_active_no_overlap') THEN
+        ALTER TABLE booking ADD CONSTRAINT booking_active_no_overlap
+            EXCLUDE USING gist (property_id WITH =, stay WITH &&)
+            WHERE (status = 'активен');
+    END IF;
+END
+$$;
+
+DROP FUNCTION IF EXISTS get_filtered_properties(text, text[], text[], boolean);
+DROP FUNCTION IF EXISTS get_filtered_properties(text, text[], text[], boolean, date, date);
+CREATE FUNCTION get_filtered_properties(
+    p_search text,
+    p_categories text[],
+    p_amenities text[],
+    p_has_active_booking boolean,
+    p_available_from date DEFAULT NULL,
+    p_available_to date DEFAULT NULL
+)
+RETURNS TABLE (
+    property_id integer,
+    title varchar,
+    description text,
+    address varchar,
+    price_per_night integer,
+    property_type property_category,
+    amenities text[]
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        p.property_id,
+        p.title,
+        p.description,
+        p.address,
+        p.price_per_night,
+        p.property_type,
+        COALESCE(am.names, '{}') AS amenities
+    FROM property p
+    LEFT JOIN LATERAL (
+        SELECT array_agg(a.name::text ORDER BY a.name) AS names
+        FROM property_amenity pa
+        JOIN amenity a ON a.amenity_id = pa.amenity_id
+        WHERE pa.property_id = p.property_id
+    ) am ON true
+    WHERE (p_search IS NULL OR p.title ILIKE '%' || p_search || '%')
+      AND (COALESCE(cardinality(p_categories), 0) = 0 OR p.property_type::text = ANY (p_categories))
+      AND (COALESCE(cardinality(p_amenities), 0) = 0 OR p.property_id IN (
+            SELECT pa.property_id
+            FROM property_amenity pa
+            JOIN amenity a ON a.amenity_id = pa.amenity_id
+            WHERE a.name = ANY (p_amenities)
+            GROUP BY pa.property_id
+            HAVING count(*) = cardinality(p_amenities)
+      ))
+      AND (p_has_active_booking IS NULL OR p_has_active_booking = EXISTS (
+            SELECT 1
+            FROM booking b
+            WHERE b.property_id = p.property_id
+              AND b.status = 'активен'
+              AND b.end_date >= CURRENT_DATE
+      ))
+      AND (p_available_from IS NULL OR p_available_to IS NULL OR NOT EXISTS (
+            SELECT 1
+            FROM booking b
+            WHERE b.property_id = p.property_id
+              AND b.status = 'активен'
+              AND b.stay && daterange(p_available_from, p_available_to, '[)')
+      ))
+$$;
@@ -0,0 +1,56 @@
+-- Сохранение объекта вместе с удобствами за один вызов и одну транзакцию.
+-- p_property_id IS NULL - добавление, иначе изменение существующего объекта.
+-- Связи с удобствами изменяются по разнице: удаляются только снятые, добавляются только новые,
+-- поэтому читатели не видят объект без удобств, а неизмененные строки не порождают уведомлений.
+-- Возвращает property_id или NULL, если изменяемого объекта нет.
+
+CREATE OR REPLACE FUNCTION upsert_property_with_amenities(
+    p_property_id integer,
+    p_title varchar,
+    p_description text,
+    p_address varchar,
+    p_price_per_night integer,
+    p_property_type property_category,
+    p_amenities text[]
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_property_id integer := p_property_id;
+BEGIN
+    IF v_property_id IS NULL THEN
+        INSERT INTO property (title, description, address, price_per_night, property_type)
+        VALUES (p_title, p_description, p_address, p_price_per_night, p_property_type)
+        RETURNING property_id INTO v_property_id;
+    ELSE
+        PERFORM 1 FROM property WHERE property_id = v_property_id FOR UPDATE;
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+        UPDATE property SET
+            title = p_title,
+            description = p_description,
+            address = p_address,
+            price_per_night = p_price_per_night,
+            property_type = p_property_type
+        WHERE property_id = v_property_id
+          AND (title, description, address, price_per_night, property_type)
+              IS DISTINCT FROM (p_title, p_description, p_address, p_price_per_night, p_property_type);
+
+        DELETE FROM property_amenity pa
+        USING amenity a
+        WHERE pa.property_id = v_property_id
+          AND a.amenity_id = pa.amenity_id
+          AND a.name <> ALL (coalesce(p_amenities, '{}'));
+    END IF;
+
+    INSERT INTO property_amenity (property_id, amenity_id)
+    SELECT v_property_id, a.amenity_id
+    FROM amenity a
+    WHERE a.name = ANY (coalesce(p_amenities, '{}'))
+    ON CONFLICT (property_id, amenity_id) DO NOTHING;
+
+    RETURN v_property_id;
+END;
+$$;
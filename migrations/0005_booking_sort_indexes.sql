@@ -0,0 +1,10 @@
+-- Индексы таблицы броней объекта (BookingManagementWindow): постраничная выдача с сортировкой
+-- по любому столбцу - ORDER BY столбец, booking_id с условием keyset-пагинации идет по индексу
+-- в прямом или обратном направлении и читает только одну страницу даже у объекта с десятками тысяч броней
+
+CREATE INDEX IF NOT EXISTS booking_property_id_idx ON booking (property_id, booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_email_idx ON booking (property_id, user_email, booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_start_idx ON booking (property_id, start_date, booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_end_idx ON booking (property_id, end_date, booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_status_idx ON booking (property_id, status, booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_created_idx ON booking (property_id, created_at, booking_id);
@@ -0,0 +1,9 @@
+-- Индексы фильтров таблицы броней объекта (BookingManagementWindow):
+-- окно дат - пересечение периода брони stay с окном по GiST-индексу (property_id, stay) для всех статусов
+-- (индекс ограничения booking_active_no_overlap частичный и покрывает только активные брони);
+-- поиск по началу email без учета регистра - lower(user_email) LIKE 'префикс%' по индексу с text_pattern_ops,
+-- который работает при любой сортировке (collation) базы. Фильтр по статусу использует
+-- booking_property_status_idx из 0005, счетчики по статусам - те же индексы.
+
+CREATE INDEX IF NOT EXISTS booking_property_stay_idx ON booking USING gist (property_id, stay);
+CREATE INDEX IF NOT EXISTS booking_property_email_prefix_idx ON booking (property_id, lower(user_email) text_pattern_ops);
@@ -0,0 +1,19 @@
+-- Групповой сдвиг дат броней одного объекта: при построчной проверке соседние брони временно
+-- пересекаются (первая уже сдвинута, следующая еще нет), и команда отклоняется, хотя итог корректен.
+-- Ограничение становится откладываемым: по умолчанию проверка по-прежнему немедленная,
+-- а групповой сдвиг выполняет SET CONSTRAINTS ... DEFERRED и проверяется при фиксации транзакции
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'booking_active_no_overlap' AND NOT condeferrable
+    ) THEN
+        ALTER TABLE booking DROP CONSTRAINT booking_active_no_overlap;
+        ALTER TABLE booking ADD CONSTRAINT booking_active_no_overlap
+            EXCLUDE USING gist (property_id WITH =, stay WITH &&)
+            WHERE (status = 'активен')
+            DEFERRABLE INITIALLY IMMEDIATE;
+    END IF;
+END
+$$;
@@ -0,0 +1,7 @@
+-- Порядок списка объектов: title COLLATE "C" (по кодам символов) вместо сортировки базы.
+-- Клиент сравнивает ключи (title, property_id) строками Python и при точечном обновлении
+-- ставит строку на место без перезапроса; при лингвистической сортировке базы (ru_RU, en_US)
+-- его порядок расходился бы с ORDER BY страниц. Индекс обслуживает новый ORDER BY и keyset-условие
+
+CREATE INDEX IF NOT EXISTS property_title_c_id_idx ON property (title COLLATE "C", property_id);
+DROP INDEX IF EXISTS property_title_id_idx;
@@ -0,0 +1,9 @@
+-- Сортировка таблицы броней по email и статусу: COLLATE "C" (по кодам символов), как сравнение
+-- ключей страниц в BookingTableModel; иначе при лингвистической сортировке базы измененная бронь
+-- вставлялась бы не на свое место или повторялась в следующей странице.
+-- Индекс по email из 0005 нужен был только для сортировки и заменяется; индекс по статусу
+-- остается для фильтра status = ANY(...) (0006), для сортировки добавляется отдельный
+
+CREATE INDEX IF NOT EXISTS booking_property_email_c_idx ON booking (property_id, user_email COLLATE "C", booking_id);
+CREATE INDEX IF NOT EXISTS booking_property_status_c_idx ON booking (property_id, status COLLATE "C", booking_id);
+DROP INDEX IF EXISTS booking_property_email_idx;
@@ -0,0 +1,59 @@
+import psycopg2
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+# Пауза перед повторным подключением после обрыва, мс
+RECONNECT_INTERVAL_MS = 5000
+
+class NotifyListener(QObject):
+    notified = pyqtSignal(str, str)
+
+    def __init__(self, db, channels: list, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.channels = channels
+        self.connection = None
+        self.notifier = None
+        # Отложенное переподключение; stop() его отменяет
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(RECONNECT_INTERVAL_MS)
+        self.reconnect_timer.timeout.connect(self.start)
+        self.start()
+
+    def start(self):
+        # Отдельное долгоживущее соединение; его сокет отслеживается циклом событий Qt,
+        # поэтому уведомления обрабатываются в GUI-потоке без опроса по таймеру
+        self.connection = self.db.listen(self.channels)
+        if self.connection is None:
+            self.reconnect_timer.start()
+            return
+        self.notifier = QSocketNotifier(self.connection.fileno(), QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self.read_notifications)
+
+    def read_notifications(self):
+        try:
+            self.connection.poll()
+        except psycopg2.Error as e:
+            print(f"Соединение для уведомлений потеряно: {e}")
+            self.stop()
+            self.reconnect_timer.start()
+            return
+        while self.connection.notifies:
+            notify = self.connection.notifies.pop(0)
+            self.notified.emit(notify.channel, notify.payload)
+
+    def restart(self):
+        # Переподключение к текущей базе DatabaseManager (после смены настроек подключения)
+        self.stop()
+        self.start()
+
+    def stop(self):
+        self.reconnect_timer.stop()
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier.deleteLater()
+            self.notifier = None
+        if self.connection is not None:
+            if not self.connection.closed:
+                self.connection.close()
+            self.connection = None
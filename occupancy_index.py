@@ -0,0 +1,152 @@
+import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Глубина окна занятости в днях, начиная с сегодняшнего
+WINDOW_DAYS = 365
+
+class OccupancyIndex:
+    # Матрица занятости "объект x день" в памяти клиента: вопрос "свободен ли объект с X по Y"
+    # решается одной векторной операцией по срезу матрицы, без обращения к БД.
+    # Активные брони одного объекта не пересекаются (ограничение booking_active_no_overlap),
+    # поэтому снятие брони - просто очистка ее дней
+    def __init__(self, window_days: int = WINDOW_DAYS):
+        self.window_days = window_days
+        self.start = None
+        # Последний день загруженных броней (не включая): после сдвига окна дни за ним не заполнены
+        self.horizon = None
+        self.rows = {}
+        self.occupied = None
+        # Изменения броней, пришедшие во время построения индекса; применяются после set_state
+        self.loading = False
+        self.pending = []
+
+    @staticmethod
+    def is_supported() -> bool:
+        return np is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.occupied is not None
+
+    @property
+    def stale(self) -> bool:
+        # Окно сдвинулось после загрузки - индекс стоит перестроить
+        return self.ready and self.horizon < datetime.date.today() + datetime.timedelta(days=self.window_days)
+
+    def begin_load(self):
+        # Вызывается в потоке интерфейса перед запуском load в фоне
+        self.loading = True
+        self.pending = []
+
+    def load_failed(self, error=None):
+        self.loading = False
+        self.pending = []
+
+    def load(self, db) -> tuple:
+        # Построение индекса (выполняется в фоновом потоке); результат передается в set_state
+        start = datetime.date.today()
+        end = start + datetime.timedelta(days=self.window_days)
+        property_ids = [row['property_id'] for row in db.stream_query(
+            "SELECT property_id FROM property ORDER BY property_id"
+        )]
+        rows = {property_id: row for row, property_id in enumerate(property_ids)}
+        occupied = np.zeros((len(property_ids), self.window_days), dtype=bool)
+        for booking in db.stream_query("""
+            SELECT property_id, start_date, end_date
+            FROM booking
+            WHERE status = 'активен' AND end_date > %s AND start_date < %s
+        """, (start, end)):
+            row = rows.get(booking['property_id'])
+            if row is not None:
+                self._fill(occupied, start, row, booking['start_date'], booking['end_date'], True)
+        return start, rows, occupied
+
+    def set_state(self, state: tuple):
+        self.start, self.rows, self.occupied = state
+        self.horizon = self.start + datetime.timedelta(days=self.window_days)
+        self.loading = False
+        # Изменения во время загрузки могли попасть в снимок или нет; повторное применение
+        # безопасно - каждое из них только присваивает значения дням
+        pending, self.pending = self.pending, []
+        for method, args in pending:
+            method(*args)
+
+    def load_property_bookings(self, db, property_ids: list) -> list:
+        # Активные брони отдельных объектов - для обновления после изменений с других рабочих мест
+        return db.execute_query("""
+            SELECT property_id, start_date, end_date
+            FROM booking
+            WHERE status = 'активен' AND property_id = ANY(%s) AND end_date > CURRENT_DATE
+        """, (list(property_ids),), fetch=True)
+
+    def replace_property_bookings(self, property_ids: list, bookings: list):
+        if self.loading:
+            self.pending.append((self.replace_property_bookings, (property_ids, bookings)))
+        if not self.ready:
+            return
+        self._roll()
+        for property_id in property_ids:
+            self.occupied[self._row(property_id)] = False
+        for booking in bookings:
+            self.apply_booking(booking['property_id'], booking['start_date'], booking['end_date'], True)
+
+    def apply_booking(self, property_id, start_date, end_date, active: bool):
+        # Отметка (active=True) или снятие дней брони [start_date, end_date)
+        if self.loading:
+            self.pending.append((self.apply_booking, (property_id, start_date, end_date, active)))
+        if not self.ready:
+            return
+        self._roll()
+        self._fill(self.occupied, self.start, self._row(property_id), start_date, end_date, active)
+
+    def free_property_ids(self, property_ids: list, date_from, date_to):
+        # Объекты из property_ids, свободные в период [date_from, date_to);
+        # None - период выходит за окно индекса или за горизонт загруженных броней
+        # и на вопрос должна ответить БД
+        if not self.ready:
+            return None
+        self._roll()
+        first = (date_from - self.start).days
+        last = (date_to - self.start).days
+        if first < 0 or last > self.window_days or first >= last or date_to > self.horizon:
+            return None
+        # Объекты, появившиеся после загрузки и без известных броней, свободны
+        known = [property_id for property_id in property_ids if property_id in self.rows]
+        unknown = {property_id for property_id in property_ids if property_id not in self.rows}
+        if not known:
+            return unknown
+        rows = np.fromiter((self.rows[property_id] for property_id in known), dtype=np.intp, count=len(known))
+        busy = self.occupied[rows, first:last].any(axis=1)
+        return unknown | {property_id for property_id, is_busy in zip(known, busy) if not is_busy}
+
+    def _row(self, property_id) -> int:
+        row = self.rows.get(property_id)
+        if row is None:
+            row = len(self.rows)
+            self.rows[property_id] = row
+            self.occupied = np.vstack([self.occupied, np.zeros((1, self.window_days), dtype=bool)])
+        return row
+
+    def _roll(self):
+        # Сдвиг окна на сегодняшний день: прошедшие дни отбрасываются, новые не заполнены -
+        # они лежат за горизонтом (horizon), и free_property_ids отвечает по ним None до перезагрузки
+        today = datetime.date.today()
+        shift = (today - self.start).days
+        if shift <= 0:
+            return
+        if shift >= self.window_days:
+            self.occupied[:] = False
+        else:
+            self.occupied[:, :-shift] = self.occupied[:, shift:]
+            self.occupied[:, -shift:] = False
+        self.start = today
+
+    def _fill(self, occupied, window_start, row, start_date, end_date, value: bool):
+        first = max((start_date - window_start).days, 0)
+        last = min((end_date - window_start).days, self.window_days)
+        if first < last:
+            occupied[row, first:last] = value
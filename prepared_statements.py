@@ -0,0 +1,110 @@
+from psycopg2 import extensions
+
+# Версия строки брони для оптимистической блокировки: xmin - номер транзакции, записавшей
+# текущую версию строки; меняется при каждом UPDATE, отдельный столбец не нужен
+BOOKING_VERSION = "xmin::text::bigint AS version"
+# Столбцы брони, возвращаемые запросами (без вычисляемого stay)
+BOOKING_COLUMNS = f"booking_id, property_id, user_email, start_date, end_date, status, created_at, {BOOKING_VERSION}"
+BOOKING_COLUMNS_B = ", ".join(f"b.{column}" for column in BOOKING_COLUMNS.split(", "))
+
+# Реестр часто выполняемых запросов: имя -> текст с параметрами $1..$n.
+# Типы параметров не указываются - сервер выводит их из контекста при PREPARE
+PREPARED_STATEMENTS = {
+    # Страницы списка объектов упорядочены по title в сортировке "C" (по кодам символов), как и
+    # сравнение ключей (title, property_id) в Python: PropertyListModel ставит измененные строки
+    # на место без перезапроса, и порядок не должен зависеть от сортировки (collation) базы
+    'properties_first_page': """
+        SELECT * FROM get_filtered_properties($1, $2, $3, $4, $5, $6) AS p
+        ORDER BY p.title COLLATE "C", p.property_id
+        LIMIT $7
+    """,
+    'properties_next_page': """
+        SELECT * FROM get_filtered_properties($1, $2, $3, $4, $5, $6) AS p
+        WHERE (p.title COLLATE "C", p.property_id) > ($7, $8)
+        ORDER BY p.title COLLATE "C", p.property_id
+        LIMIT $9
+    """,
+    'properties_by_ids': """
+        SELECT * FROM get_filtered_properties($1, $2, $3, $4, $5, $6) AS p
+        WHERE p.property_id = ANY($7)
+    """,
+    'property_bookings': """
+        SELECT booking_id, user_email, start_date, end_date, status, created_at
+        FROM booking
+        WHERE property_id = $1
+        ORDER BY start_date DESC
+    """,
+    'booking_by_id': f"SELECT {BOOKING_COLUMNS} FROM booking WHERE booking_id = $1",
+    # Активные брони объекта, пересекающиеся с периодом [$2, $3) (индекс booking_active_no_overlap)
+    'booking_conflicts': f"""
+        SELECT {BOOKING_COLUMNS}
+        FROM booking
+        WHERE property_id = $1
+          AND status = 'активен'
+          AND stay && daterange($2, $3, '[)')
+        ORDER BY start_date
+    """,
+    'booking_insert': f"""
+        INSERT INTO booking
+        (property_id, user_email, start_date, end_date, status)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING {BOOKING_COLUMNS}
+    """,
+    # Условное изменение: строка обновляется, только если ее версия ($6) не изменилась
+    # с момента чтения; пустой результат - бронь удалена или изменена другим пользователем
+    'booking_update': f"""
+        UPDATE booking SET
+            user_email = $1,
+            start_date = $2,
+            end_date = $3,
+            status = $4
+        WHERE booking_id = $5 AND xmin = $6::text::xid
+        RETURNING {BOOKING_COLUMNS}
+    """,
+    'booking_delete': f"DELETE FROM booking WHERE booking_id = $1 RETURNING {BOOKING_COLUMNS}",
+    # Групповые операции над выбранными бронями объекта: одна команда на все строки.
+    # Возвращаются новые значения и прежние период и статус (для индекса занятости и календаря)
+    'bookings_set_status': f"""
+        WITH old AS (
+            SELECT booking_id, start_date, end_date, status
+            FROM booking
+            WHERE booking_id = ANY($2) AND property_id = $3
+            FOR UPDATE
+        )
+        UPDATE booking b SET status = $1
+        FROM old
+        WHERE b.booking_id = old.booking_id
+        RETURNING {BOOKING_COLUMNS_B}, old.start_date AS old_start_date, old.end_date AS old_end_date,
+                  old.status AS old_status
+    """,
+    'bookings_shift_dates': f"""
+        WITH old AS (
+            SELECT booking_id, start_date, end_date, status
+            FROM booking
+            WHERE booking_id = ANY($2) AND property_id = $3
+            FOR UPDATE
+        )
+        UPDATE booking b SET start_date = b.start_date + $1::integer, end_date = b.end_date + $1::integer
+        FROM old
+        WHERE b.booking_id = old.booking_id
+        RETURNING {BOOKING_COLUMNS_B}, old.start_date AS old_start_date, old.end_date AS old_end_date,
+                  old.status AS old_status
+    """,
+    'bookings_delete': f"""
+        DELETE FROM booking
+        WHERE booking_id = ANY($1) AND property_id = $2
+        RETURNING {BOOKING_COLUMNS}
+    """,
+    'amenity_names': "SELECT name FROM amenity ORDER BY name",
+    'property_upsert': """
+        SELECT upsert_property_with_amenities($1, $2, $3, $4, $5, $6, $7) AS property_id
+    """,
+}
+
+
+class StatementConnection(extensions.connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Имена запросов, уже подготовленных в этой сессии; новое соединение
+        # (в том числе после переподключения) начинает с пустого набора
+        self.prepared = set()
@@ -0,0 +1,381 @@
+import bisect
+from PyQt6.QtWidgets import QApplication, QListView, QStyle, QStyledItemDelegate, QStyleOptionButton
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QEvent, QPoint, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QTextLayout
+
+# Геометрия карточки недвижимости (в пикселях)
+CARD_HEIGHT = 270
+CARD_MARGIN = 10
+CARD_PADDING = 15
+LABEL_WIDTH = 90
+ROW_SPACING = 4
+BUTTON_HEIGHT = 28
+DESCRIPTION_LINES = 3
+AMENITIES_LINES = 2
+
+ROW_LABELS = {
+    'title': "Название:",
+    'address': "Адрес:",
+    'description': "Описание:",
+    'amenities': "Удобства:",
+    'price': "Цена:",
+}
+
+BUTTON_TEXTS = {
+    'more': "Показать полностью",
+    'rent': "Управление бронированием",
+    'remove': "Удалить недвижимость",
+    'edit': "Изменить недвижимость",
+}
+
+
+class PropertyListModel(QAbstractListModel):
+    PropertyRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.properties = []
+        self.fetch_page = None
+        self.page_key = None
+        self.page_after = None
+        self.page_size = 0
+        self.has_more = False
+        self.loading = False
+        # Страница не загрузилась: догрузка останавливается, но результат остается неполным
+        self.failed = False
+        self.generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.properties)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.properties):
+            return None
+        prop = self.properties[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return prop['title']
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return prop['description']
+        if role == self.PropertyRole:
+            return prop
+        return None
+
+    def set_properties(self, properties: list):
+        # Полная замена списка: виджеты не создаются, перерисовываются только видимые карточки
+        self.beginResetModel()
+        self.properties = list(properties)
+        self.fetch_page = None
+        self.has_more = False
+        self.loading = False
+        self.failed = False
+        self.generation += 1
+        self.endResetModel()
+
+    def set_fetcher(self, fetch_page, page_key, page_size):
+        # Постраничный режим: fetch_page(after, generation) запрашивает следующую страницу
+        # (в фоне) и передает ее в append_page; page_key(row) - ключ строки, после которой
+        # запрашивается следующая страница
+        self.beginResetModel()
+        self.properties = []
+        self.fetch_page = fetch_page
+        self.page_key = page_key
+        self.page_size = page_size
+        self.page_after = None
+        self.has_more = True
+        self.loading = False
+        self.failed = False
+        self.generation += 1
+        self.endResetModel()
+        self.fetchMore()
+
+    def is_complete(self) -> bool:
+        # Все строки текущего результата уже загружены
+        return not self.loading and not self.has_more
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self.fetch_page is not None and self.has_more
+                and not self.loading and not self.failed)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self.loading = True
+        self.fetch_page(self.page_after, self.generation)
+
+    def append_page(self, rows: list, generation: int):
+        # Страница от предыдущего поиска отбрасывается
+        if generation != self.generation:
+            return
+        self.loading = False
+        # Неполная страница означает, что результат загружен целиком
+        self.has_more = len(rows) >= self.page_size
+        if not rows:
+            return
+        first = len(self.properties)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.properties.extend(rows)
+        self.endInsertRows()
+        self.page_after = self.page_key(rows[-1])
+
+    def row_of(self, property_id):
+        for row, prop in enumerate(self.properties):
+            if prop['property_id'] == property_id:
+                return row
+        return None
+
+    def patch_rows(self, property_ids: list, rows: list):
+        # Точечное обновление: строки объектов property_ids заменяются на rows
+        # (отсутствующий в rows объект больше не проходит фильтры или удален)
+        for property_id in property_ids:
+            row = self.row_of(property_id)
+            if row is not None:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.properties[row]
+                self.endRemoveRows()
+
+        for prop in rows:
+            position = self.insert_position(prop)
+            if position is None:
+                continue
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.properties.insert(position, prop)
+            self.endInsertRows()
+
+    def insert_position(self, prop):
+        if self.page_key is None:
+            return len(self.properties)
+        key = self.page_key(prop)
+        # Строка за пределами загруженной части придет со следующей страницей
+        if self.has_more and (self.page_after is None or key > self.page_after):
+            return None
+        keys = [self.page_key(p) for p in self.properties]
+        return bisect.bisect_left(keys, key)
+
+    def page_failed(self, generation: int):
+        # has_more не сбрасывается: усеченный список не должен считаться полным результатом
+        # (narrow_properties и remember_undated_result фильтруют только полный)
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.failed = True
+
+
+class PropertyCardDelegate(QStyledItemDelegate):
+    rentClicked = pyqtSignal(object)
+    editClicked = pyqtSignal(object)
+    removeClicked = pyqtSignal(object)
+    descriptionClicked = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hovered = None
+        self._pressed = None
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), CARD_HEIGHT)
+
+    def body_font(self, option):
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        return font
+
+    def title_font(self, option):
+        font = QFont(option.font)
+        font.setPixelSize(14)
+        font.setBold(True)
+        return font
+
+    def card_layout(self, option):
+        # Расчет прямоугольников всех элементов карточки; используется и при отрисовке, и при обработке кликов
+        line = QFontMetrics(self.body_font(option)).lineSpacing()
+        card = option.rect.adjusted(CARD_MARGIN, CARD_MARGIN // 2, -CARD_MARGIN, -CARD_MARGIN // 2)
+        inner = card.adjusted(CARD_PADDING, CARD_PADDING, -CARD_PADDING, -CARD_PADDING)
+        value_left = inner.left() + LABEL_WIDTH
+        value_width = inner.right() - value_left
+
+        rects = {'card': card, 'labels': {}}
+        y = inner.top()
+        heights = [
+            ('title', QFontMetrics(self.title_font(option)).lineSpacing() + 4),
+            ('address', line),
+            ('description', line * DESCRIPTION_LINES + 10),
+            ('more', 24),
+            ('amenities', line * AMENITIES_LINES),
+            ('price', line),
+        ]
+        for name, height in heights:
+            if name == 'more':
+                width = QFontMetrics(self.body_font(option)).horizontalAdvance(BUTTON_TEXTS['more']) + 20
+                rects['more'] = QRect(inner.right() - width, y, width, height)
+            else:
+                rects[name] = QRect(value_left, y, value_width, height)
+                rects['labels'][name] = QRect(inner.left(), y, LABEL_WIDTH, line)
+            y += height + ROW_SPACING
+
+        button_width = (inner.width() - 2 * ROW_SPACING) // 3
+        for i, name in enumerate(['rent', 'remove', 'edit']):
+            rects[name] = QRect(inner.left() + i * (button_width + ROW_SPACING), y, button_width, BUTTON_HEIGHT)
+        return rects
+
+    def paint(self, painter, option, index):
+        prop = index.data(PropertyListModel.PropertyRole)
+        if prop is None:
+            return
+        rects = self.card_layout(option)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor("#ccc"))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(rects['card'], 5, 5)
+
+        painter.setFont(self.body_font(option))
+        painter.setPen(option.palette.text().color())
+        for name, rect in rects['labels'].items():
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, ROW_LABELS[name])
+
+        painter.setFont(self.title_font(option))
+        self.draw_elided_text(painter, rects['title'], prop['title'] or "", 1)
+
+        painter.setFont(self.body_font(option))
+        self.draw_elided_text(painter, rects['address'], prop['address'] or "", 1)
+
+        painter.setPen(QColor("#eee"))
+        painter.drawRoundedRect(rects['description'], 3, 3)
+        painter.setPen(option.palette.text().color())
+        self.draw_elided_text(painter, rects['description'].adjusted(5, 5, -5, -5),
+                              prop['description'] or "", DESCRIPTION_LINES)
+
+        amenities = [a for a in (prop['amenities'] or []) if a]
+        self.draw_elided_text(painter, rects['amenities'],
+                              ", ".join(amenities) if amenities else "Нет удобств", AMENITIES_LINES)
+
+        price_font = self.body_font(option)
+        price_font.setBold(True)
+        painter.setFont(price_font)
+        painter.drawText(rects['price'], Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                         f"{int(prop['price_per_night'])} ₽/ночь")
+
+        painter.setFont(self.body_font(option))
+        for name in ['more', 'rent', 'remove', 'edit']:
+            self.draw_button(painter, option, index, name, rects[name])
+        painter.restore()
+
+    def draw_elided_text(self, painter, rect, text, max_lines):
+        # Перенос по словам с многоточием на последней видимой строке
+        fm = painter.fontMetrics()
+        layout = QTextLayout(text.replace("\n", " "), painter.font())
+        layout.beginLayout()
+        y = rect.top()
+        for line_number in range(max_lines):
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(rect.width())
+            start = line.textStart()
+            if line_number == max_lines - 1:
+                rest = text[start:].replace("\n", " ")
+                chunk = fm.elidedText(rest, Qt.TextElideMode.ElideRight, rect.width())
+            else:
+                chunk = text[start:start + line.textLength()].replace("\n", " ").rstrip()
+            painter.drawText(QPoint(rect.left(), y + fm.ascent()), chunk)
+            y += fm.lineSpacing()
+        layout.endLayout()
+
+    def draw_button(self, painter, option, index, name, rect):
+        button = QStyleOptionButton()
+        button.rect = rect
+        button.text = BUTTON_TEXTS[name]
+        button.palette = option.palette
+        button.fontMetrics = painter.fontMetrics()
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        if self._hovered == (index.row(), name):
+            button.state |= QStyle.StateFlag.State_MouseOver
+        if self._pressed == (index.row(), name):
+            button.state |= QStyle.StateFlag.State_Sunken
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def button_at(self, option, pos):
+        rects = self.card_layout(option)
+        for name in ['more', 'rent', 'remove', 'edit']:
+            if rects[name].contains(pos):
+                return name
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+
+        name = self.button_at(option, event.position().toPoint())
+        target = (index.row(), name) if name else None
+
+        if event_type == QEvent.Type.MouseMove:
+            if target != self._hovered:
+                self._hovered = target
+                self.repaint_view(option)
+            return False
+
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        if event_type == QEvent.Type.MouseButtonPress:
+            self._pressed = target
+            self.repaint_view(option)
+            return target is not None
+
+        pressed, self._pressed = self._pressed, None
+        self.repaint_view(option)
+        if target is None or target != pressed:
+            return False
+
+        prop = index.data(PropertyListModel.PropertyRole)
+        signals = {
+            'more': self.descriptionClicked,
+            'rent': self.rentClicked,
+            'remove': self.removeClicked,
+            'edit': self.editClicked,
+        }
+        signals[name].emit(prop)
+        return True
+
+    def repaint_view(self, option):
+        if option.widget:
+            option.widget.viewport().update()
+
+
+class PropertyListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.empty_text = ""
+        # Все карточки одинаковой высоты: раскладка не зависит от количества строк
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.verticalScrollBar().valueChanged.connect(self.fetch_if_near_bottom)
+
+    def fetch_if_near_bottom(self, value):
+        # Подгрузка следующей страницы заранее, когда до конца списка осталось меньше двух карточек
+        model = self.model()
+        if model is None or not model.canFetchMore(QModelIndex()):
+            return
+        if value >= self.verticalScrollBar().maximum() - 2 * CARD_HEIGHT:
+            model.fetchMore(QModelIndex())
+
+    def set_empty_text(self, text: str):
+        self.empty_text = text
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model() is not None and self.model().rowCount() == 0 and self.empty_text:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().text().color())
+            painter.drawText(self.viewport().rect().adjusted(0, CARD_MARGIN, 0, 0),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, self.empty_text)
+            painter.end()
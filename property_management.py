@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon
 
+from database import DatabaseError
+
 class PropertyManagementWindow(QWidget):
     windowClosed = pyqtSignal()
     
@@ -154,57 +156,33 @@ class PropertyManagementWindow(QWidget):
         if self.property_data:
             self.update_property()
         else:
-            if self.save_property(property_data):
-                QMessageBox.information(self, "Успех", "Недвижимость добавлена!")
-            else:
-                QMessageBox.warning(self, "Неудача", "Не удалось добавить недвижимость")
+            self.set_buttons_enabled(False)
+            self.main_window.runner.submit(
+                None,
+                self.save_property,
+                property_data,
+                on_result=self.property_published,
+                on_error=lambda error: self.property_published(False)
+            )
+
+    def property_published(self, property_id):
+        if property_id:
+            QMessageBox.information(self, "Успех", "Недвижимость добавлена!")
+            self.main_window.refresh_property_rows([property_id])
+        else:
+            QMessageBox.warning(self, "Неудача", "Не удалось добавить недвижимость")
             
-        self.main_window.search_property()
         self.close()
 
+    def set_buttons_enabled(self, enabled):
+        self.append_property.setEnabled(enabled)
+        self.save_changes_property.setEnabled(enabled)
+        self.btn_cancellation.setEnabled(enabled)
 
-    def save_property(self, data: dict) -> bool:
-        try:
-            query = """
-                INSERT INTO property 
-                (title, description, address, price_per_night, property_type)
-                VALUES (%s, %s, %s, %s, %s::property_category)
-                RETURNING property_id
-            """
-            result = self.main_window.db.execute_query(
-                query,
-                (
-                    data['title'],
-                    data['description'],
-                    data['address'],
-                    data['price'],
-                    data['property_type'],
-                ),
-                fetch=True
-            )
-            
-            if not result:
-                return False
-
-            property_id = result[0]['property_id']
-
-            # Вставляем удобства
-            if data['amenities']:
-                amenity_query = """
-                    INSERT INTO property_amenity (property_id, amenity_id)
-                    SELECT %s, amenity_id FROM amenity WHERE name = ANY(%s)
-                """
-                self.main_window.db.execute_query(
-                    amenity_query,
-                    (property_id, data['amenities'])
-                )
-
-            return True
-        
-        except Exception as e:
-            print(f"Ошибка при сохранении недвижимости: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении недвижимости")
-            return False
+    def save_property(self, data: dict):
+        # Объект и его удобства сохраняются одним вызовом в одной транзакции;
+        # ошибка (DatabaseError) приходит в on_error фоновой задачи
+        return self.main_window.db.upsert_property(None, data)
         
     def clear_fields(self):
         self.title.clear()
@@ -257,62 +235,39 @@ class PropertyManagementWindow(QWidget):
                 QMessageBox.critical(self, "Ошибка", f"Ошибка удаления недвижимости")
 
     def update_property(self):
-        try:
-            self.selected_amenities = [name for name, cb in self.amenity_checkboxes.items() if cb.isChecked()]
-            # Получаем данные из полей
-            new_data = {
-                'title': self.title.text(),
-                'property_type': self.property_type.currentText(),
-                'address': self.address.text(),
-                'description': self.description.toPlainText(),
-                'price': self.price_per_night.value(),
-                'amenities': self.selected_amenities,
-            }
-            
-            # SQL-запрос для обновления
-            query = """
-                UPDATE property SET
-                    title = %s,
-                    address = %s,
-                    description = %s,
-                    price_per_night = %s,
-                    property_type = %s::property_category
-                WHERE property_id = %s
-            """
-            self.main_window.db.execute_query(
-                query,
-                (
-                    new_data['title'],
-                    new_data['address'],
-                    new_data['description'],
-                    new_data['price'],
-                    new_data['property_type'],
-                    self.property_data['property_id']
-                )
-            )
+        self.selected_amenities = [name for name, cb in self.amenity_checkboxes.items() if cb.isChecked()]
+        # Получаем данные из полей
+        new_data = {
+            'title': self.title.text(),
+            'property_type': self.property_type.currentText(),
+            'address': self.address.text(),
+            'description': self.description.toPlainText(),
+            'price': self.price_per_night.value(),
+            'amenities': self.selected_amenities,
+        }
+        self.set_buttons_enabled(False)
+        self.main_window.runner.submit(
+            None,
+            self.update_property_data,
+            self.property_data['property_id'],
+            new_data,
+            on_result=lambda result: self.property_updated(),
+            on_error=lambda error: self.property_update_failed()
+        )
 
-            delete_query = "DELETE FROM property_amenity WHERE property_id = %s"
-            self.main_window.db.execute_query(
-                delete_query, 
-                (self.property_data['property_id'],)
-            )
+    def update_property_data(self, property_id, new_data):
+        # Изменяются только отличающиеся поля и связи с удобствами; фиксация одна
+        if self.main_window.db.upsert_property(property_id, new_data) is None:
+            raise DatabaseError("Недвижимость не найдена")
 
-            if new_data['amenities']:
-                insert_query = """
-                    INSERT INTO property_amenity (property_id, amenity_id)
-                    SELECT %s, amenity_id FROM amenity WHERE name = ANY(%s::text[])
-                """
-                self.main_window.db.execute_query(
-                    insert_query,
-                    (self.property_data['property_id'], new_data['amenities'])
-                )
-                
-            QMessageBox.information(self, "Успех", "Изменения недвижимости успешно применены!")
-            self.main_window.search_property()
-            self.close()
+    def property_updated(self):
+        QMessageBox.information(self, "Успех", "Изменения недвижимости успешно применены!")
+        self.main_window.refresh_property_rows([self.property_data['property_id']])
+        self.close()
 
-        except Exception as e:
-            QMessageBox.warning(self, "Ошибка", f"Ошибка обновления недвижимости")
+    def property_update_failed(self):
+        self.set_buttons_enabled(True)
+        QMessageBox.warning(self, "Ошибка", f"Ошибка обновления недвижимости")
 
     def update_property_list(self):
         self.main_window.search_property()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import os
+import re
+import time
+import threading
+from collections import deque
+from functools import lru_cache
+
+# Число последних замеров на отпечаток запроса, по которым считаются перцентили
+METRICS_WINDOW = 1000
+# Порог медленного запроса, мс (меняется в настройках)
+SLOW_QUERY_MS = 200
+SLOW_QUERY_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_queries.log")
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    # Отпечаток запроса: литералы заменены на ?, пробелы схлопнуты - одинаковые по форме
+    # запросы с разными значениями попадают в одну строку статистики
+    return _SPACES.sub(" ", _LITERALS.sub("?", query)).strip()
+
+
+def result_size(rows) -> int:
+    # Приблизительный объем результата в байтах по текстовому представлению значений
+    size = 0
+    for row in rows:
+        for value in row.values():
+            if value is None:
+                continue
+            if isinstance(value, (str, bytes)):
+                size += len(value)
+            elif isinstance(value, (list, tuple)):
+                size += sum(len(str(item)) for item in value)
+            else:
+                size += 8
+    return size
+
+
+def percentile(ordered: list, p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class QueryStats:
+    def __init__(self, window: int):
+        self.durations = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+
+
+class QueryMetrics:
+    # Статистика запросов по парам (метка вызова, отпечаток): один запрос из разных мест
+    # учитывается отдельно; запись идет из рабочих потоков, чтение - из GUI
+    def __init__(self, window: int = METRICS_WINDOW, slow_query_ms: float = SLOW_QUERY_MS,
+                 slow_log_path: str = SLOW_QUERY_LOG):
+        self.window = window
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def record(self, label: str, query_fingerprint: str, seconds: float, rows: int = 0,
+               nbytes: int = 0, failed: bool = False):
+        with self._lock:
+            key = (label, query_fingerprint)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = QueryStats(self.window)
+            stats.durations.append(seconds * 1000)
+            stats.calls += 1
+            stats.errors += failed
+            stats.rows += rows
+            stats.bytes += nbytes
+        if seconds * 1000 >= self.slow_query_ms:
+            self.log_slow_query(label, query_fingerprint, seconds, rows, nbytes)
+
+    def log_slow_query(self, label, query_fingerprint, seconds, rows, nbytes):
+        line = (f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{seconds * 1000:.1f} мс\t{label}\t"
+                f"строк: {rows}\tбайт: {nbytes}\t{query_fingerprint}\n")
+        try:
+            with self._log_lock, open(self.slow_log_path, "a", encoding="utf-8") as file:
+                file.write(line)
+        except OSError as e:
+            print(f"Ошибка записи журнала медленных запросов: {e}")
+
+    def snapshot(self) -> list:
+        # Сводка для отображения, самые медленные по p95 - первыми
+        result = []
+        with self._lock:
+            for (label, query_fingerprint), stats in self.stats.items():
+                ordered = sorted(stats.durations)
+                result.append({
+                    'fingerprint': query_fingerprint,
+                    'label': label,
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'bytes': stats.bytes,
+                    'p50': percentile(ordered, 50),
+                    'p95': percentile(ordered, 95),
+                    'p99': percentile(ordered, 99),
+                })
+        result.sort(key=lambda item: item['p95'], reverse=True)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+
+# Общая статистика процесса
+query_metrics = QueryMetrics()
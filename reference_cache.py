@@ -0,0 +1,30 @@
+import threading
+
+class ReferenceCache:
+    def __init__(self):
+        # Номер версии увеличивается при каждой инвалидации; загрузка, начатая до нее, в кеш не попадет
+        self.version = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader) -> list:
+        with self._lock:
+            if key in self._data:
+                return list(self._data[key])
+            version = self.version
+        value = loader()
+        # Пустой результат (в том числе ошибка загрузки) не кешируется
+        if value:
+            with self._lock:
+                if version == self.version:
+                    self._data[key] = list(value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+
+
+# Общий для всего процесса кеш справочных данных (категории, удобства)
+reference_cache = ReferenceCache()
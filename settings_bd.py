@@ -1,10 +1,16 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QMessageBox, QLabel,
     QPushButton, QGroupBox, QFormLayout, QLineEdit,
+    QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QIcon
 
+from query_metrics import query_metrics
+
+# Период обновления вкладки "Производительность", мс
+METRICS_REFRESH_MS = 1000
+
 class SettingsWindow(QWidget):
     windowClosed = pyqtSignal()
     
@@ -21,8 +27,16 @@ class SettingsWindow(QWidget):
         self.set_ui()
 
     def set_ui(self):
-        settings_main_content = QVBoxLayout() 
-        self.setLayout(settings_main_content)
+        main_content = QVBoxLayout()
+        self.setLayout(main_content)
+        self.tabs = QTabWidget()
+        main_content.addWidget(self.tabs)
+
+        connection_tab = QWidget()
+        settings_main_content = QVBoxLayout()
+        connection_tab.setLayout(settings_main_content)
+        self.tabs.addTab(connection_tab, "Подключение")
+        self.tabs.addTab(self.create_performance_tab(), "Производительность")
 
         self.btn_show_pass = QPushButton("Показать пароли")
         self.btn_show_pass.setCheckable(True)
@@ -98,6 +112,78 @@ class SettingsWindow(QWidget):
 
         self.btn_show_pass.clicked.connect(self.show_pass)
 
+    def create_performance_tab(self):
+        performance_tab = QWidget()
+        performance_layout = QVBoxLayout()
+        performance_tab.setLayout(performance_layout)
+
+        slow_log_group = QGroupBox("Журнал медленных запросов")
+        form_slow_log_layout = QFormLayout()
+        self.slow_query_ms = QSpinBox()
+        self.slow_query_ms.setRange(1, 600000)
+        self.slow_query_ms.setSuffix(" мс")
+        self.slow_query_ms.setValue(int(query_metrics.slow_query_ms))
+        self.slow_query_ms.valueChanged.connect(self.set_slow_query_threshold)
+        slow_log_path = QLabel(query_metrics.slow_log_path)
+        slow_log_path.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        form_slow_log_layout.addRow("Порог:", self.slow_query_ms)
+        form_slow_log_layout.addRow("Файл:", slow_log_path)
+        slow_log_group.setLayout(form_slow_log_layout)
+
+        # Перцентили времени выполнения по отпечаткам запросов (последние замеры каждого запроса)
+        self.metrics_table = QTableWidget()
+        self.metrics_table.setColumnCount(9)
+        self.metrics_table.setHorizontalHeaderLabels(
+            ["Запрос", "Источник", "Вызовов", "Ошибок", "p50, мс", "p95, мс", "p99, мс", "Строк", "Байт"]
+        )
+        self.metrics_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        self.btn_reset_metrics = QPushButton("Сбросить статистику")
+        self.btn_reset_metrics.clicked.connect(self.reset_metrics)
+
+        performance_layout.addWidget(slow_log_group)
+        performance_layout.addWidget(self.metrics_table)
+        performance_layout.addWidget(self.btn_reset_metrics)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(METRICS_REFRESH_MS)
+        self.metrics_timer.timeout.connect(self.update_metrics)
+        return performance_tab
+
+    def set_slow_query_threshold(self, value):
+        query_metrics.slow_query_ms = value
+
+    def reset_metrics(self):
+        query_metrics.reset()
+        self.update_metrics()
+
+    def update_metrics(self):
+        snapshot = query_metrics.snapshot()
+        self.metrics_table.setRowCount(len(snapshot))
+        for row_idx, item in enumerate(snapshot):
+            values = [
+                item['fingerprint'],
+                item['label'],
+                item['calls'],
+                item['errors'],
+                f"{item['p50']:.1f}",
+                f"{item['p95']:.1f}",
+                f"{item['p99']:.1f}",
+                item['rows'],
+                item['bytes'],
+            ]
+            for col_idx, value in enumerate(values):
+                cell = QTableWidgetItem(str(value))
+                if col_idx == 0:
+                    cell.setToolTip(str(value))
+                self.metrics_table.setItem(row_idx, col_idx, cell)
+
+    def showEvent(self, event):
+        self.update_metrics()
+        self.metrics_timer.start()
+        super().showEvent(event)
+
     def show_pass(self):
         if self.btn_show_pass.isChecked():
             self.ch_password_bd.setEchoMode(QLineEdit.EchoMode.Normal)
@@ -159,7 +245,7 @@ class SettingsWindow(QWidget):
             QMessageBox.information(self, "Успех", "Подключение к базе данных прошло успешно!")
             try:
                 self.main_window.update_property_list()
-                self.main_window.load_data_from_db()
+                self.main_window.reload_reference_data()
             except:
                 QMessageBox.critical(self, "Ошибка", "Ошибка при загрузки данных из базы!\nИспользуется база данных по умолчанию.")
                 self.main_window.db.set_default_bg()
@@ -167,6 +253,8 @@ class SettingsWindow(QWidget):
             QMessageBox.critical(self, "Ошибка", "Не удалось подключиться к базе данных!\nИспользуется база данных по умолчанию.")
             self.main_window.db.set_default_bg()
 
+        # Пул мог переключиться на другую базу - уведомления слушаются уже на ней
+        self.main_window.notify_listener.restart()
         self.clear_qlineedit()
         self.set_info_config()
 
@@ -184,7 +272,7 @@ class SettingsWindow(QWidget):
             QMessageBox.information(self, "Успех", "Подключение к базе данных прошло успешно!")
             try:
                 self.main_window.update_property_list()
-                self.main_window.load_data_from_db()
+                self.main_window.reload_reference_data()
             except:
                 QMessageBox.critical(self, "Ошибка", "Ошибка при загрузки данных из базы!\nИспользуется база данных по умолчанию.")
                 self.main_window.db.set_default_bg()
@@ -192,10 +280,13 @@ class SettingsWindow(QWidget):
             QMessageBox.critical(self, "Ошибка", "Не удалось подключиться к базе данных!\nИспользуется база данных по умолчанию.")
             self.main_window.db.set_default_bg()
 
+        # Пул мог переключиться на другую базу - уведомления слушаются уже на ней
+        self.main_window.notify_listener.restart()
         self.clear_qlineedit()
         self.set_info_config()
 
     def closeEvent(self, event):
+        self.metrics_timer.stop()
         self.windowClosed.emit()
         self.main_window.setEnabled(True)
         self.clear_qlineedit()
@@ -0,0 +1,113 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, object)
+
+
+class DatabaseTask(QRunnable):
+    def __init__(self, db, channel, fn, args, kwargs, on_result=None, on_error=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.db = db
+        self.channel = channel
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        # Источник запросов задачи в статистике: канал или имя функции
+        self.label = channel or getattr(fn, '__qualname__', repr(fn))
+        self.cancelled = False
+        self.connection = None
+        self.signals = TaskSignals()
+        self._lock = threading.Lock()
+
+    def run(self):
+        if self.cancelled:
+            self.signals.finished.emit(self, None)
+            return
+        try:
+            # Все запросы задачи идут через одно соединение пула, чтобы его можно было отменить
+            with self.db.bind_connection() as connection:
+                with self._lock:
+                    self.connection = connection
+                try:
+                    with self.db.query_label(self.label):
+                        result = self.fn(*self.args, **self.kwargs)
+                finally:
+                    with self._lock:
+                        self.connection = None
+        except Exception as e:
+            self.signals.failed.emit(self, e)
+        else:
+            self.signals.finished.emit(self, result)
+
+    def cancel(self):
+        # Прерывание выполняющегося на сервере запроса; результат задачи будет отброшен
+        with self._lock:
+            self.cancelled = True
+            if self.connection is not None and not self.connection.closed:
+                self.connection.cancel()
+
+
+class TaskRunner(QObject):
+    channelBusy = pyqtSignal(str, bool)
+
+    def __init__(self, db, max_threads: int, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self.channels = {}
+        self.tasks = set()
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, **kwargs):
+        # Новая задача в канале отменяет предыдущую: устаревший результат не перезапишет новый
+        if channel is not None:
+            self.cancel(channel)
+        task = DatabaseTask(self.db, channel, fn, args, kwargs, on_result, on_error)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.tasks.add(task)
+        if channel is not None:
+            self.channels[channel] = task
+            self.channelBusy.emit(channel, True)
+        self.thread_pool.start(task)
+        return task
+
+    def cancel(self, channel):
+        task = self.channels.pop(channel, None)
+        if task is not None:
+            task.cancel()
+            self.channelBusy.emit(channel, False)
+
+    def is_busy(self, channel) -> bool:
+        return channel in self.channels
+
+    def shutdown(self):
+        for channel in list(self.channels):
+            self.cancel(channel)
+        self.thread_pool.waitForDone()
+
+    def _release(self, task):
+        self.tasks.discard(task)
+        if task.channel is not None and self.channels.get(task.channel) is task:
+            del self.channels[task.channel]
+            self.channelBusy.emit(task.channel, False)
+
+    @pyqtSlot(object, object)
+    def _on_finished(self, task, result):
+        self._release(task)
+        if not task.cancelled and task.on_result is not None:
+            task.on_result(result)
+
+    @pyqtSlot(object, object)
+    def _on_failed(self, task, error):
+        self._release(task)
+        if task.cancelled:
+            return
+        print(f"Ошибка фоновой задачи: {error}")
+        if task.on_error is not None:
+            task.on_error(error)